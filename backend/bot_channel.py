@@ -0,0 +1,120 @@
+import asyncio
+import itertools
+import json
+import logging
+import os
+import socket
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class BotChannelServer(asyncio.DatagramProtocol):
+    """
+    API-server end of the bot IPC channel.
+
+    Listens on run_dir/api.sock for state datagrams published by the bot
+    (heartbeat, positions, risk, latency, ...) and keeps the latest message
+    of each type in memory, so status reads never touch disk. Commands are
+    sent to run_dir/bot.sock and resolved when the bot acks them.
+    """
+
+    def __init__(self, run_dir, heartbeat_timeout=3.0, on_message=None):
+        self.server_path = str(run_dir / 'api.sock')
+        self.bot_path = str(run_dir / 'bot.sock')
+        self.run_dir = run_dir
+        self.heartbeat_timeout = heartbeat_timeout
+        self.on_message = on_message
+        self.state = {}
+        self.last_seen = None
+        self._transport = None
+        self._pending = {}
+        self._ids = itertools.count(1)
+
+    async def start(self):
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        if os.path.exists(self.server_path):
+            os.unlink(self.server_path)
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(self.server_path)
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(lambda: self, sock=sock)
+        logger.info(f"Bot channel listening on {self.server_path}")
+
+    def close(self):
+        if self._transport:
+            self._transport.close()
+            self._transport = None
+        if os.path.exists(self.server_path):
+            os.unlink(self.server_path)
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
+    @property
+    def connected(self):
+        """True while heartbeats keep arriving"""
+        return self.last_seen is not None and time.time() - self.last_seen < self.heartbeat_timeout
+
+    def summary(self):
+        """Latest bot-published state, as served to the dashboard"""
+        return {
+            "connected": self.connected,
+            "last_seen": self.last_seen,
+            **{kind: message.get("data") for kind, message in self.state.items()}
+        }
+
+    def datagram_received(self, data, addr):
+        try:
+            message = json.loads(data)
+        except ValueError:
+            logger.warning("Ignoring malformed datagram from bot")
+            return
+
+        kind = message.get("type")
+        self.last_seen = time.time()
+
+        if kind == "ack":
+            ack = message.get("data") or {}
+            future = self._pending.pop(ack.get("id"), None)
+            if future and not future.done():
+                future.set_result(ack)
+            return
+
+        self.state[kind] = message
+        if self.on_message:
+            self.on_message(kind, message.get("data"))
+
+    async def send_command(self, command, args=None, timeout=1.0):
+        """Send a command to the bot and wait for its ack"""
+        if self._transport is None or not os.path.exists(self.bot_path):
+            return {"ok": False, "command": command, "error": "Bot channel not connected"}
+
+        command_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[command_id] = future
+
+        started = time.perf_counter()
+        payload = {"id": command_id, "command": command, "args": args or {}, "ts": time.time()}
+        self._transport.sendto(json.dumps(payload).encode(), self.bot_path)
+
+        try:
+            ack = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return {"ok": False, "command": command, "error": "Timed out waiting for bot"}
+        finally:
+            self._pending.pop(command_id, None)
+
+        ack["latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return ack
+
+    def error_received(self, exc):
+        logger.warning(f"Bot channel error: {str(exc)}")
+
+    # LiveHub source interface: updates are pushed from datagram_received
+    def poll(self):
+        return []
+
+    def snapshot(self):
+        return [("bot", self.summary())]
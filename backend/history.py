@@ -0,0 +1,318 @@
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import re
+from datetime import datetime, timezone
+
+from pymongo import ASCENDING, DESCENDING, ReplaceOne
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY = 11000
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _read_csv_rows(path, offset, header):
+    """
+    Parse complete CSV lines appended after offset.
+
+    Returns (rows, new_offset, header); each row carries the byte offset
+    it started at so ingestion can derive a stable document id.
+    """
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+
+    data = data[:data.rfind(b'\n') + 1]
+    rows = []
+    position = offset
+    for raw in data.splitlines(keepends=True):
+        start = position
+        position += len(raw)
+        line = raw.decode('utf-8', errors='replace').strip()
+        if not line:
+            continue
+        values = next(csv.reader(io.StringIO(line)))
+        if header is None:
+            header = values
+            continue
+        rows.append((start, dict(zip(header, values))))
+    return rows, offset + len(data), header
+
+
+class HistoryStore:
+    """
+    Trade history in MongoDB, fed from the bot's flat files and IPC events.
+
+    Ingestion is incremental: per-file progress (offset or record count,
+    plus the file's inode/size/mtime) is kept in the ingest_state
+    collection and mirrored in memory, so each run costs one stat() per
+    unchanged file and only reads bytes appended since the last one
+    and writes them with batched insert_many. Document ids are derived
+    from the file position, which makes re-ingestion idempotent.
+    Analytics run as aggregation pipelines over indexed collections and
+    never read files.
+    """
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, db, bot_dir):
+        self.db = db
+        self.bot_dir = bot_dir
+        self.trades = db.trades
+        self.orders = db.orders
+        self.signals = db.signals
+        self.daily_summaries = db.daily_summaries
+        self.ingest_state = db.ingest_state
+        self._pending_signals = []
+        self._states = None
+
+    async def ensure_indexes(self):
+        await self.trades.create_index([("date", ASCENDING), ("symbol", ASCENDING)])
+        await self.trades.create_index([("exit_reason", ASCENDING)])
+        await self.orders.create_index([("date", ASCENDING), ("symbol", ASCENDING)])
+        await self.signals.create_index([("date", ASCENDING), ("symbol", ASCENDING)])
+
+    # Ingestion
+
+    def add_signal(self, signal):
+        """Buffer a signal published by the bot; written on the next flush"""
+        if not isinstance(signal, dict):
+            return
+        timestamp = str(signal.get('timestamp') or datetime.now(timezone.utc).isoformat())
+        self._pending_signals.append({**signal, 'timestamp': timestamp, 'date': timestamp[:10]})
+
+    async def flush_signals(self):
+        pending, self._pending_signals = self._pending_signals, []
+        return await self._insert_many(self.signals, pending)
+
+    async def ingest(self):
+        """Import everything new in the bot's files; returns counts per collection"""
+        counts = {
+            "trades": await self._ingest_trades_csv(),
+            "orders": await self._ingest_order_files(),
+            "daily_summaries": await self._ingest_daily_pnl(),
+            "signals": await self.flush_signals(),
+        }
+        if any(counts.values()):
+            logger.info(f"History ingested: {counts}")
+        return counts
+
+    async def _file_state(self, path):
+        """Return (stat, saved state) or (None, None) when the file is missing or unchanged"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None, None
+
+        if self._states is None:
+            self._states = {doc.pop("_id"): doc async for doc in self.ingest_state.find()}
+
+        state = self._states.get(str(path), {})
+        if state.get("size") == st.st_size and state.get("mtime") == st.st_mtime_ns and state.get("ino") == st.st_ino:
+            return None, None
+        if state.get("ino") != st.st_ino or st.st_size < state.get("size", 0):
+            state = {}
+        return st, state
+
+    async def _save_state(self, path, st, **fields):
+        state = {"ino": st.st_ino, "size": st.st_size, "mtime": st.st_mtime_ns, **fields}
+        await self.ingest_state.replace_one({"_id": str(path)}, state, upsert=True)
+        self._states[str(path)] = state
+
+    async def _ingest_trades_csv(self):
+        path = self.bot_dir / "logs" / "trades.csv"
+        st, state = await self._file_state(path)
+        if st is None:
+            return 0
+
+        rows, offset, header = await asyncio.to_thread(
+            _read_csv_rows, path, state.get("offset", 0), state.get("header")
+        )
+        docs = []
+        for start, row in rows:
+            docs.append({
+                "_id": f"trades.csv:{st.st_ino}:{start}",
+                "date": row.get("date"),
+                "time": row.get("time"),
+                "symbol": row.get("symbol"),
+                "qty": _to_float(row.get("qty")),
+                "entry_price": _to_float(row.get("entry_price")),
+                "exit_price": _to_float(row.get("exit_price")),
+                "pnl": _to_float(row.get("pnl")) or 0.0,
+                "exit_reason": row.get("exit_reason"),
+            })
+
+        inserted = await self._insert_many(self.trades, docs)
+        await self._save_state(path, st, offset=offset, header=header)
+        return inserted
+
+    async def _ingest_order_files(self):
+        inserted = 0
+        trades_dir = self.bot_dir / "data" / "trades"
+        if not trades_dir.exists():
+            return 0
+
+        for path in sorted(trades_dir.glob("trades_*.json")):
+            st, state = await self._file_state(path)
+            if st is None:
+                continue
+            try:
+                records = await asyncio.to_thread(self._load_json, path)
+            except ValueError:
+                # Bot is mid-write; pick it up on the next run
+                continue
+
+            date = path.stem[len("trades_"):]
+            seen = state.get("count", 0)
+            docs = [
+                {**record, "_id": f"{path.stem}:{index}", "date": date}
+                for index, record in enumerate(records[seen:], start=seen)
+            ]
+            inserted += await self._insert_many(self.orders, docs)
+            await self._save_state(path, st, count=len(records))
+        return inserted
+
+    async def _ingest_daily_pnl(self):
+        path = self.bot_dir / "logs" / "daily_pnl.csv"
+        st, state = await self._file_state(path)
+        if st is None:
+            return 0
+
+        # Rows are updated in place, so the whole (small) file is upserted
+        rows, _, _ = await asyncio.to_thread(_read_csv_rows, path, 0, None)
+        ops = [
+            ReplaceOne(
+                {"_id": row["date"]},
+                {"date": row["date"], "realized_pnl": _to_float(row.get("realized_pnl")) or 0.0},
+                upsert=True
+            )
+            for _, row in rows if row.get("date")
+        ]
+        for start in range(0, len(ops), self.BATCH_SIZE):
+            await self.daily_summaries.bulk_write(ops[start:start + self.BATCH_SIZE], ordered=False)
+        await self._save_state(path, st)
+        return len(ops)
+
+    @staticmethod
+    def _load_json(path):
+        with open(path, 'r') as f:
+            records = json.load(f)
+        if not isinstance(records, list):
+            raise ValueError(f"{path} does not contain a JSON array")
+        return records
+
+    async def _insert_many(self, collection, docs):
+        inserted = 0
+        for start in range(0, len(docs), self.BATCH_SIZE):
+            batch = docs[start:start + self.BATCH_SIZE]
+            try:
+                result = await collection.insert_many(batch, ordered=False)
+                inserted += len(result.inserted_ids)
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors", [])
+                if any(err.get("code") != DUPLICATE_KEY for err in errors):
+                    raise
+                inserted += e.details.get("nInserted", 0)
+        return inserted
+
+    # Analytics
+
+    @staticmethod
+    def _date_match(from_date=None, to_date=None, symbol=None, **filters):
+        """
+        Match on a date range and exact filters. symbol matches a full
+        trading symbol or an underlying: "NIFTY" selects "NIFTY 23000 CE"
+        and "NIFTY-Jan2026-23000-CE", not BANKNIFTY or NIFTYNXT50. The
+        anchored prefix keeps the (date, symbol) index usable.
+        """
+        match = {key: value for key, value in filters.items() if value is not None}
+        if symbol:
+            match["symbol"] = {"$regex": f"^{re.escape(symbol)}(?:$|[ -])"}
+        date_range = {}
+        if from_date:
+            date_range["$gte"] = from_date
+        if to_date:
+            date_range["$lte"] = to_date
+        if date_range:
+            match["date"] = date_range
+        return match
+
+    async def performance(self, from_date=None, to_date=None, symbol=None):
+        """Win/loss metrics over a date range, computed by the server"""
+        pipeline = [
+            {"$match": self._date_match(from_date, to_date, symbol=symbol)},
+            {"$group": {
+                "_id": None,
+                "total_trades": {"$sum": 1},
+                "wins": {"$sum": {"$cond": [{"$gt": ["$pnl", 0]}, 1, 0]}},
+                "losses": {"$sum": {"$cond": [{"$lt": ["$pnl", 0]}, 1, 0]}},
+                "total_pnl": {"$sum": "$pnl"},
+                "win_sum": {"$sum": {"$cond": [{"$gt": ["$pnl", 0]}, "$pnl", 0]}},
+                "loss_sum": {"$sum": {"$cond": [{"$lt": ["$pnl", 0]}, "$pnl", 0]}},
+            }},
+        ]
+        result = await self.trades.aggregate(pipeline).to_list(1)
+        stats = result[0] if result else {}
+
+        total = stats.get("total_trades", 0)
+        wins = stats.get("wins", 0)
+        losses = stats.get("losses", 0)
+        return {
+            "total_trades": total,
+            "wins": wins,
+            "losses": losses,
+            "win_rate": round(wins / total * 100, 2) if total else 0,
+            "total_pnl": round(stats.get("total_pnl", 0), 2),
+            "avg_win": round(stats["win_sum"] / wins, 2) if wins else 0,
+            "avg_loss": round(stats["loss_sum"] / losses, 2) if losses else 0
+        }
+
+    async def daily(self, from_date=None, to_date=None, symbol=None):
+        """Per-day trade count and PnL"""
+        pipeline = [
+            {"$match": self._date_match(from_date, to_date, symbol=symbol)},
+            {"$group": {
+                "_id": "$date",
+                "trades": {"$sum": 1},
+                "pnl": {"$sum": "$pnl"},
+                "wins": {"$sum": {"$cond": [{"$gt": ["$pnl", 0]}, 1, 0]}},
+            }},
+            {"$sort": {"_id": 1}},
+        ]
+        days = await self.trades.aggregate(pipeline).to_list(None)
+        return [
+            {"date": d["_id"], "trades": d["trades"], "wins": d["wins"], "pnl": round(d["pnl"], 2)}
+            for d in days
+        ]
+
+    async def exit_reasons(self, from_date=None, to_date=None):
+        """Trade count and PnL grouped by exit reason"""
+        pipeline = [
+            {"$match": self._date_match(from_date, to_date)},
+            {"$group": {"_id": "$exit_reason", "trades": {"$sum": 1}, "pnl": {"$sum": "$pnl"}}},
+            {"$sort": {"trades": -1}},
+        ]
+        reasons = await self.trades.aggregate(pipeline).to_list(None)
+        return [
+            {"exit_reason": r["_id"], "trades": r["trades"], "pnl": round(r["pnl"], 2)}
+            for r in reasons
+        ]
+
+    async def find_trades(self, from_date=None, to_date=None, symbol=None, limit=500):
+        """Most recent round-trip trades in a date range"""
+        cursor = self.trades.find(
+            self._date_match(from_date, to_date, symbol=symbol),
+            {"_id": 0}
+        ).sort([("date", DESCENDING), ("time", DESCENDING)]).limit(limit)
+        return await cursor.to_list(limit)
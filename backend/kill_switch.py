@@ -0,0 +1,52 @@
+import importlib.util
+from pathlib import Path
+
+# The file layout is defined once, by the bots' side of the switch. That
+# module is stdlib-only, so it is loaded by path rather than putting the
+# bot's packages on the server's import path.
+_SOURCE = Path(__file__).resolve().parent.parent / "index_options_bot" / "execution" / "kill_switch.py"
+_spec = importlib.util.spec_from_file_location("bot_kill_switch", _SOURCE)
+_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_module)
+KillSwitch = _module.KillSwitch
+
+
+class KillSwitchFile:
+    """
+    API-server end of the bots' shared kill switch (run_dir/kill_switch).
+
+    Engaging it is one store into the mapping; every bot process sees it
+    on its next order and within one watcher interval cancels its open
+    orders and flattens. The switch stays engaged until released. The
+    file is created and mapped on first use.
+    """
+
+    def __init__(self, run_dir):
+        self.path = str(run_dir / 'kill_switch')
+        self.run_dir = run_dir
+        self._switch = None
+
+    def _mapping(self):
+        if self._switch is None:
+            self.run_dir.mkdir(parents=True, exist_ok=True)
+            self._switch = KillSwitch(self.path)
+        return self._switch
+
+    @property
+    def engaged(self):
+        return self._mapping().engaged
+
+    def engage(self, reason='api'):
+        """Trip the switch; returns False if it was already engaged"""
+        return self._mapping().engage(reason)
+
+    def release(self):
+        self._mapping().release()
+
+    def state(self):
+        return self._mapping().state()
+
+    def close(self):
+        if self._switch is not None:
+            self._switch.close()
+            self._switch = None
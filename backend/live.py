@@ -0,0 +1,175 @@
+import asyncio
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class StatusWatcher:
+    """Emits a status event whenever the bot status payload changes"""
+
+    def __init__(self, status_fn):
+        self.status_fn = status_fn
+        self.last = None
+
+    def poll(self):
+        status = self.status_fn()
+        if status != self.last:
+            self.last = status
+            return [("status", status)]
+        return []
+
+    def snapshot(self):
+        return [("status", self.last)]
+
+
+class TradeWatcher:
+    """Emits new trades and PnL updates when the trades file changes"""
+
+    def __init__(self, cache, path_fn):
+        self.cache = cache
+        self.path_fn = path_fn
+        self.path = None
+        self.version = None
+        self.trades = []
+        self.performance = None
+
+    def poll(self):
+        path = self.path_fn()
+        trades = self.cache.get(path)
+        if path == self.path and self.cache.version == self.version:
+            return []
+
+        events = []
+        sent = len(self.trades)
+        if path != self.path or len(trades) < sent:
+            # New day or rewritten file: clients replace their list
+            events.append(("trades", {"trades": trades, "reset": True}))
+        elif len(trades) > sent:
+            events.append(("trades", {"trades": trades[sent:], "reset": False}))
+
+        self.path = path
+        self.version = self.cache.version
+        self.trades = trades
+        self.performance = self.cache.performance(path)
+        events.append(("pnl", self.performance))
+        return events
+
+    def snapshot(self):
+        return [
+            ("trades", {"trades": self.trades, "reset": True}),
+            ("pnl", self.performance),
+        ]
+
+
+class LogWatcher:
+    """Emits log lines appended since the last poll"""
+
+    def __init__(self, tail, path_fn, lines=200):
+        self.tail = tail
+        self.path_fn = path_fn
+        self.lines = lines
+        self.path = None
+        self.offset = None
+        self.recent = deque(maxlen=lines)
+
+    def poll(self):
+        path = self.path_fn()
+        after = self.offset if path == self.path else None
+        lines, offset = self.tail.tail(path, self.lines, after)
+        reset = after is None or offset < after
+        self.path = path
+        self.offset = offset
+
+        if reset:
+            self.recent.clear()
+        self.recent.extend(lines)
+        if lines or reset:
+            return [("logs", {"logs": lines, "offset": offset, "reset": reset})]
+        return []
+
+    def snapshot(self):
+        return [("logs", {"logs": list(self.recent), "offset": self.offset, "reset": True})]
+
+
+class LiveHub:
+    """
+    Fans out live dashboard updates to every connected client.
+
+    A single watcher task polls the registered sources and publishes each
+    change once; clients only receive messages from their own queue, so
+    the work done per interval is the same for one tab or fifty. The
+    watcher runs only while at least one client is connected.
+    """
+
+    def __init__(self, poll_interval=1.0, queue_size=256):
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.sources = []
+        self._clients = set()
+        self._task = None
+
+    def add_source(self, source):
+        self.sources.append(source)
+
+    @property
+    def client_count(self):
+        return len(self._clients)
+
+    def subscribe(self):
+        """Register a client and return its message queue, primed with a snapshot"""
+        # Bring sources up to date first so the snapshot and the next
+        # published diff line up without gaps or duplicates
+        self.poll()
+
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        for source in self.sources:
+            for event, data in source.snapshot():
+                queue.put_nowait({"type": event, "data": data})
+
+        self._clients.add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, queue):
+        self._clients.discard(queue)
+
+    def publish(self, event, data):
+        """Queue an event for every client, dropping clients that have fallen behind"""
+        message = {"type": event, "data": data}
+        for queue in list(self._clients):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.warning("Dropping live client that stopped reading")
+                self._clients.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def poll(self):
+        """Poll every source once and publish what changed"""
+        for source in self.sources:
+            try:
+                events = source.poll()
+            except Exception as e:
+                logger.error(f"Live source {type(source).__name__} failed: {str(e)}")
+                continue
+            for event, data in events:
+                self.publish(event, data)
+
+    async def _run(self):
+        while self._clients:
+            self.poll()
+            await asyncio.sleep(self.poll_interval)
+
+    async def stop(self):
+        self._clients.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
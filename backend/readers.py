@@ -0,0 +1,265 @@
+import json
+import os
+import threading
+
+
+def _stat_key(st):
+    """Identity of a file version: device, inode, size and mtime"""
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _records_end(data):
+    """Offset just past the last record of a JSON array, before the closing bracket"""
+    return len(data[:data.rindex(b']')].rstrip())
+
+
+class TradeStats:
+    """Running aggregates over a list of trades"""
+
+    def __init__(self):
+        self.total_pnl = 0.0
+        self.buy_count = 0
+        self.win_count = 0
+        self.win_sum = 0.0
+        self.loss_count = 0
+        self.loss_sum = 0.0
+
+    def add(self, trade):
+        pnl = trade.get('pnl') or 0
+        self.total_pnl += pnl
+        if trade.get('order_type') == 'BUY':
+            self.buy_count += 1
+        if pnl > 0:
+            self.win_count += 1
+            self.win_sum += pnl
+        elif pnl < 0:
+            self.loss_count += 1
+            self.loss_sum += pnl
+
+    def performance(self):
+        """Performance metrics in the shape served by /bot/performance"""
+        avg_win = self.win_sum / self.win_count if self.win_count else 0
+        avg_loss = self.loss_sum / self.loss_count if self.loss_count else 0
+        win_rate = self.win_count / self.buy_count * 100 if self.buy_count else 0
+
+        return {
+            "total_trades": self.buy_count,
+            "wins": self.win_count,
+            "losses": self.loss_count,
+            "win_rate": round(win_rate, 2),
+            "total_pnl": round(self.total_pnl, 2),
+            "avg_win": round(avg_win, 2),
+            "avg_loss": round(avg_loss, 2)
+        }
+
+
+class TradeFileCache:
+    """
+    Caches the parsed contents of a daily trades JSON file.
+
+    The cache is keyed on (device, inode, size, mtime). An unchanged file
+    costs one stat() per call. When the file grows in place and the old
+    records are still intact, only the appended bytes are parsed and the
+    aggregates are updated incrementally.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._path = None
+        self._key = None
+        self._offset = 0
+        self._trades = []
+        self._stats = TradeStats()
+        self._performance = None
+        self.version = 0
+
+    def get(self, path):
+        """Return the trades in path, re-parsing only what changed"""
+        with self._lock:
+            self._refresh(path)
+            return self._trades
+
+    def stats(self, path):
+        """Return running aggregates for the trades in path"""
+        with self._lock:
+            self._refresh(path)
+            return self._stats
+
+    def performance(self, path):
+        """Return memoized performance metrics for the trades in path"""
+        with self._lock:
+            self._refresh(path)
+            if self._performance is None:
+                self._performance = self._stats.performance()
+            return self._performance
+
+    def _refresh(self, path):
+        path = str(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            if self._path != path or self._key is not None:
+                self._reset(path)
+            return
+
+        key = _stat_key(st)
+        if path == self._path and key == self._key:
+            return
+
+        old = self._key if path == self._path else None
+        try:
+            grew_in_place = old is not None and key[:2] == old[:2] and key[2] > old[2]
+            if not (grew_in_place and self._read_appended(path)):
+                self._read_full(path)
+        except (OSError, ValueError):
+            # Writer may be mid-rewrite; keep serving the last good parse
+            return
+
+        self._path = path
+        self._key = key
+        self._performance = None
+        self.version += 1
+
+    def _reset(self, path):
+        self._path = path
+        self._key = None
+        self._offset = 0
+        self._trades = []
+        self._stats = TradeStats()
+        self._performance = None
+        self.version += 1
+
+    def _read_full(self, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        trades = json.loads(data) if data.strip() else []
+        if not isinstance(trades, list):
+            raise ValueError("Trades file does not contain a JSON array")
+
+        stats = TradeStats()
+        for trade in trades:
+            stats.add(trade)
+
+        self._trades = trades
+        self._stats = stats
+        self._offset = _records_end(data) if trades else 0
+
+    def _read_appended(self, path):
+        """Parse records appended after the last known one; False if not an append"""
+        if not self._trades:
+            return False
+
+        with open(path, 'rb') as f:
+            f.seek(self._offset - 1)
+            chunk = f.read()
+
+        # The byte before the offset must still close the last parsed record
+        if not chunk.startswith(b'}'):
+            return False
+
+        chunk = chunk[1:]
+        head = chunk.lstrip()
+        if not head.startswith(b','):
+            return False
+
+        new_trades = json.loads(b'[' + head[1:])
+        for trade in new_trades:
+            self._stats.add(trade)
+        self._trades = self._trades + new_trades
+        self._offset += _records_end(chunk)
+        return True
+
+
+def _read_last_lines(f, start, end, n, block_size):
+    """
+    Read the last n complete lines between byte offsets start and end.
+
+    Seeks backwards from end one block at a time until n + 1 newlines
+    (or start) have been seen, so cost scales with n rather than file size.
+    Returns (lines, offset) where offset is the byte just past the last
+    complete line returned.
+    """
+    blocks = []
+    pos = end
+    newlines = 0
+    while pos > start and newlines <= n:
+        step = min(block_size, pos - start)
+        pos -= step
+        f.seek(pos)
+        block = f.read(step)
+        newlines += block.count(b'\n')
+        blocks.append(block)
+    data = b''.join(reversed(blocks))
+
+    # A trailing partial line is still being written; leave it for the next read
+    data = data[:data.rfind(b'\n') + 1]
+    lines = data.split(b'\n')[:-1]
+    if pos > start:
+        lines = lines[1:]
+
+    lines = [line.decode('utf-8', errors='replace') + '\n' for line in lines[-n:]] if n > 0 else []
+    return lines, pos + len(data)
+
+
+def _read_lines_after(f, start, end):
+    """Every complete line between byte offsets start and end, and the offset just past the last"""
+    f.seek(start)
+    data = f.read(end - start)
+    data = data[:data.rfind(b'\n') + 1]
+    lines = [line.decode('utf-8', errors='replace') + '\n' for line in data.split(b'\n')[:-1]]
+    return lines, start + len(data)
+
+
+class LogTail:
+    """
+    Tails log files by seeking backwards from the end in blocks.
+
+    Results are remembered per (file version, lines, cursor), so repeated
+    polls of an unchanged file cost one stat(). Callers pass back the
+    returned offset as after_offset to receive every line written since,
+    however many (lines only caps the initial tail). A cursor belongs to
+    one file: callers must drop it when the path changes.
+    """
+
+    BLOCK_SIZE = 64 * 1024
+
+    def __init__(self, block_size=BLOCK_SIZE):
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._path = None
+        self._key = None
+        self._results = {}
+
+    def tail(self, path, lines=100, after_offset=None):
+        """Return (lines, offset): the last lines of path, or all complete lines after a cursor"""
+        path = str(path)
+        try:
+            key = _stat_key(os.stat(path))
+        except OSError:
+            return [], 0
+
+        size = key[2]
+        # A cursor past the end means the file was truncated or replaced
+        if after_offset is not None and (after_offset < 0 or after_offset > size):
+            after_offset = None
+
+        with self._lock:
+            if path != self._path or key != self._key:
+                self._path = path
+                self._key = key
+                self._results = {}
+            cached = self._results.get((lines, after_offset))
+            if cached is not None:
+                return cached
+
+        with open(path, 'rb') as f:
+            if after_offset is None:
+                result = _read_last_lines(f, 0, size, lines, self.block_size)
+            else:
+                result = _read_lines_after(f, after_offset, size)
+
+        with self._lock:
+            if self._key == key:
+                self._results[(lines, after_offset)] = result
+        return result
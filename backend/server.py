@@ -1,11 +1,11 @@
-from fastapi import FastAPI, APIRouter, HTTPException, BackgroundTasks
+from fastapi import FastAPI, APIRouter, HTTPException, BackgroundTasks, WebSocket, WebSocketDisconnect
 from fastapi.responses import FileResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import asyncio
 import logging
-import json
 import subprocess
 import signal
 from pathlib import Path
@@ -14,6 +14,12 @@ from typing import List, Optional, Dict, Any
 import uuid
 from datetime import datetime, timezone
 
+from readers import TradeFileCache, LogTail
+from live import LiveHub, StatusWatcher, TradeWatcher, LogWatcher
+from bot_channel import BotChannelServer
+from kill_switch import KillSwitchFile
+from history import HistoryStore
+
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
@@ -36,6 +42,18 @@ bot_status = {
 }
 
 BOT_DIR = Path("/app/index_options_bot")
+RUN_DIR = BOT_DIR / "run"
+# One feed.py process polls Dhan and serves prices to every bot via shared memory
+SHARED_FEED = os.environ.get('SHARED_FEED', 'false').lower() == 'true'
+feed_process = None
+HISTORY_INGEST_INTERVAL = float(os.environ.get('HISTORY_INGEST_INTERVAL', 5))
+# How long /bot/stop waits for the bot to flatten before terminating it
+KILL_FLATTEN_TIMEOUT = float(os.environ.get('KILL_FLATTEN_TIMEOUT', 30))
+STOP_REASON = "api stop"
+
+# Trade history: flat files and bot signals ingested into MongoDB
+history = HistoryStore(db, BOT_DIR)
+history_task = None
 
 # Models
 class BotConfig(BaseModel):
@@ -60,6 +78,14 @@ class BotStatus(BaseModel):
     started_at: Optional[str]
     error: Optional[str]
 
+class BotCommand(BaseModel):
+    command: str
+    args: Dict[str, Any] = Field(default_factory=dict)
+
+class KillSwitchRequest(BaseModel):
+    engaged: bool
+    reason: str = "api"
+
 class Trade(BaseModel):
     order_id: str
     security_id: int
@@ -137,34 +163,90 @@ STRIKE_INTERVAL={config.strike_interval}
     with open(env_file, 'w') as f:
         f.write(env_content)
 
+trade_cache = TradeFileCache()
+log_tail = LogTail()
+
+def get_today_trades_file():
+    """Path of today's trades JSON file"""
+    today = datetime.now().strftime('%Y-%m-%d')
+    return BOT_DIR / "data" / "trades" / f"trades_{today}.json"
+
 def get_today_trades():
     """Get today's trades from file"""
-    today = datetime.now().strftime('%Y-%m-%d')
-    trades_file = BOT_DIR / "data" / "trades" / f"trades_{today}.json"
-    
-    if not trades_file.exists():
-        return []
-    
+    return trade_cache.get(get_today_trades_file())
+
+def get_today_log_file():
+    """Path of today's bot log file"""
+    today = datetime.now().strftime('%Y%m%d')
+    return BOT_DIR / "logs" / f"bot_{today}.log"
+
+def get_bot_logs(lines=100, after_offset=None, log_file=None):
+    """
+    Get bot logs, the offset to resume from, the file they came from and
+    whether this is a fresh tail rather than lines after the cursor. A
+    cursor from another file (yesterday's log) is not applied to today's.
+    """
+    path = get_today_log_file()
+    if log_file != path.name:
+        after_offset = None
     try:
-        with open(trades_file, 'r') as f:
-            return json.load(f)
+        logs, offset = log_tail.tail(path, lines, after_offset)
     except:
-        return []
+        logs, offset = [], 0
+    return logs, offset, path.name, after_offset is None or offset < after_offset
 
-def get_bot_logs(lines=100):
-    """Get bot logs"""
-    today = datetime.now().strftime('%Y%m%d')
-    log_file = BOT_DIR / "logs" / f"bot_{today}.log"
+def current_status():
+    """Bot process status merged with today's trade stats"""
+    global bot_status
     
-    if not log_file.exists():
-        return []
+    # Check if process is still running
+    if bot_status["running"] and bot_status["pid"]:
+        try:
+            os.kill(bot_status["pid"], 0)
+        except OSError:
+            bot_status["running"] = False
+            bot_status["pid"] = None
     
-    try:
-        with open(log_file, 'r') as f:
-            all_lines = f.readlines()
-            return all_lines[-lines:] if len(all_lines) > lines else all_lines
-    except:
-        return []
+    # Get today's stats
+    stats = trade_cache.stats(get_today_trades_file())
+    
+    return {
+        **bot_status,
+        "ipc_connected": bot_channel.connected,
+        "total_trades_today": stats.buy_count,
+        "pnl_today": stats.total_pnl
+    }
+
+# Live updates: one watcher shared by every connected dashboard
+live_hub = LiveHub()
+live_hub.add_source(StatusWatcher(current_status))
+live_hub.add_source(TradeWatcher(trade_cache, get_today_trades_file))
+live_hub.add_source(LogWatcher(log_tail, get_today_log_file))
+
+# Bot IPC: state pushed by the bot process, commands sent back to it
+def handle_bot_message(kind, data):
+    """Route state published by the bot over IPC"""
+    if kind == "signal":
+        history.add_signal(data)
+    live_hub.publish("bot", bot_channel.summary())
+
+bot_channel = BotChannelServer(RUN_DIR, on_message=handle_bot_message)
+live_hub.add_source(bot_channel)
+
+# Shared with every bot process: engaging it makes them cancel orders and flatten
+kill_switch = KillSwitchFile(RUN_DIR)
+
+async def wait_until_flat(timeout):
+    """The bot's kill report once it has flattened, or None if it did not in time"""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while asyncio.get_running_loop().time() < deadline:
+        report = bot_channel.state.get("kill")
+        if report is not None:
+            return report.get("data")
+        if bot_process is not None and bot_process.poll() is not None:
+            return None
+        await asyncio.sleep(0.05)
+    return None
 
 # API Routes
 @api_router.get("/")
@@ -197,26 +279,7 @@ async def update_config(config: BotConfig):
 @api_router.get("/bot/status")
 async def get_status():
     """Get bot status"""
-    global bot_status
-    
-    # Check if process is still running
-    if bot_status["running"] and bot_status["pid"]:
-        try:
-            os.kill(bot_status["pid"], 0)
-        except OSError:
-            bot_status["running"] = False
-            bot_status["pid"] = None
-    
-    # Get today's stats
-    trades = get_today_trades()
-    total_pnl = sum(t.get('pnl', 0) for t in trades)
-    total_trades = len([t for t in trades if t.get('order_type') == 'BUY'])
-    
-    return {
-        **bot_status,
-        "total_trades_today": total_trades,
-        "pnl_today": total_pnl
-    }
+    return current_status()
 
 @api_router.post("/bot/start")
 async def start_bot(background_tasks: BackgroundTasks):
@@ -226,15 +289,28 @@ async def start_bot(background_tasks: BackgroundTasks):
     if bot_status["running"]:
         return {"status": "already_running", "message": "Bot is already running"}
     
+    # A stop leaves the switch engaged; any other kill must be released explicitly
+    switch = kill_switch.state()
+    if switch["engaged"]:
+        if switch["reason"] != STOP_REASON:
+            raise HTTPException(status_code=409, detail=f"Kill switch engaged ({switch['reason']}); release it first")
+        kill_switch.release()
+    
     try:
-        # Start bot process
-        bot_process = subprocess.Popen(
-            ["python", "main.py"],
-            cwd=str(BOT_DIR),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            preexec_fn=os.setsid
-        )
+        # Start bot process; its output goes to the daily log instead of
+        # unread pipes that would eventually block it
+        log_file = get_today_log_file()
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(log_file, 'ab') as log_output:
+            if SHARED_FEED:
+                start_feed_process(log_output)
+            bot_process = subprocess.Popen(
+                ["python", "main.py"],
+                cwd=str(BOT_DIR),
+                stdout=log_output,
+                stderr=subprocess.STDOUT,
+                preexec_fn=os.setsid
+            )
         
         bot_status = {
             "running": True,
@@ -243,11 +319,26 @@ async def start_bot(background_tasks: BackgroundTasks):
             "error": None
         }
         
+        live_hub.poll()
         return {"status": "success", "message": "Bot started successfully", "pid": bot_process.pid}
     except Exception as e:
         bot_status["error"] = str(e)
         raise HTTPException(status_code=500, detail=str(e))
 
+def start_feed_process(log_output):
+    """Start the shared price feed unless it is already running"""
+    global feed_process
+    if feed_process is not None and feed_process.poll() is None:
+        return
+    feed_process = subprocess.Popen(
+        ["python", "feed.py"],
+        cwd=str(BOT_DIR),
+        stdout=log_output,
+        stderr=subprocess.STDOUT,
+        preexec_fn=os.setsid
+    )
+    logger.info(f"Shared feed started (pid {feed_process.pid})")
+
 @api_router.post("/bot/stop")
 async def stop_bot():
     """Stop the trading bot"""
@@ -257,8 +348,18 @@ async def stop_bot():
         return {"status": "not_running", "message": "Bot is not running"}
     
     try:
+        # Flatten through the kill switch first; SIGTERM only ends the process
+        bot_channel.state.pop("kill", None)
+        kill_switch.engage(STOP_REASON)
+        report = await wait_until_flat(KILL_FLATTEN_TIMEOUT) if bot_channel.connected else None
+        if report is None:
+            logger.warning("Bot did not confirm it was flat; terminating it anyway")
+        
         if bot_status["pid"]:
-            os.killpg(os.getpgid(bot_status["pid"]), signal.SIGTERM)
+            try:
+                os.killpg(os.getpgid(bot_status["pid"]), signal.SIGTERM)
+            except ProcessLookupError:
+                pass  # already exited after flattening
         
         bot_status = {
             "running": False,
@@ -267,7 +368,8 @@ async def stop_bot():
             "error": None
         }
         
-        return {"status": "success", "message": "Bot stopped successfully"}
+        live_hub.poll()
+        return {"status": "success", "message": "Bot stopped successfully", "kill": report}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -278,45 +380,98 @@ async def get_trades():
     return {"trades": trades, "count": len(trades)}
 
 @api_router.get("/bot/logs")
-async def get_logs(lines: int = 100):
-    """Get bot logs"""
-    logs = get_bot_logs(lines)
-    return {"logs": logs, "count": len(logs)}
+async def get_logs(lines: int = 100, after_offset: Optional[int] = None, file: Optional[str] = None):
+    """Get bot logs; pass the returned offset and file back to fetch only new lines"""
+    logs, offset, log_file, reset = get_bot_logs(lines, after_offset, file)
+    return {"logs": logs, "count": len(logs), "offset": offset, "file": log_file, "reset": reset}
 
 @api_router.get("/bot/performance")
-async def get_performance():
-    """Get performance metrics"""
-    trades = get_today_trades()
-    
-    if not trades:
-        return {
-            "total_trades": 0,
-            "wins": 0,
-            "losses": 0,
-            "win_rate": 0,
-            "total_pnl": 0,
-            "avg_win": 0,
-            "avg_loss": 0
-        }
-    
-    buy_trades = [t for t in trades if t.get('order_type') == 'BUY']
-    wins = [t for t in trades if t.get('pnl', 0) > 0]
-    losses = [t for t in trades if t.get('pnl', 0) < 0]
-    
-    total_pnl = sum(t.get('pnl', 0) for t in trades)
-    avg_win = sum(t['pnl'] for t in wins) / len(wins) if wins else 0
-    avg_loss = sum(t['pnl'] for t in losses) / len(losses) if losses else 0
-    win_rate = len(wins) / len(buy_trades) * 100 if buy_trades else 0
-    
-    return {
-        "total_trades": len(buy_trades),
-        "wins": len(wins),
-        "losses": len(losses),
-        "win_rate": round(win_rate, 2),
-        "total_pnl": round(total_pnl, 2),
-        "avg_win": round(avg_win, 2),
-        "avg_loss": round(avg_loss, 2)
-    }
+async def get_performance(from_date: Optional[str] = None, to_date: Optional[str] = None, symbol: Optional[str] = None):
+    """Get performance metrics; today's live file by default, or a date range from history"""
+    if from_date or to_date or symbol:
+        return await history.performance(from_date, to_date, symbol)
+    return trade_cache.performance(get_today_trades_file())
+
+@api_router.get("/bot/history/trades")
+async def get_history_trades(from_date: Optional[str] = None, to_date: Optional[str] = None, symbol: Optional[str] = None, limit: int = 500):
+    """Completed trades across dates; symbol is a trading symbol or an underlying (NIFTY)"""
+    trades = await history.find_trades(from_date, to_date, symbol, limit)
+    return {"trades": trades, "count": len(trades)}
+
+@api_router.get("/bot/history/daily")
+async def get_history_daily(from_date: Optional[str] = None, to_date: Optional[str] = None, symbol: Optional[str] = None):
+    """Per-day trade count and PnL"""
+    return {"days": await history.daily(from_date, to_date, symbol)}
+
+@api_router.get("/bot/history/exit-reasons")
+async def get_history_exit_reasons(from_date: Optional[str] = None, to_date: Optional[str] = None):
+    """Trade count and PnL by exit reason"""
+    return {"exit_reasons": await history.exit_reasons(from_date, to_date)}
+
+@api_router.post("/bot/history/ingest")
+async def ingest_history():
+    """Import new trades, orders and daily summaries from the bot's files now"""
+    try:
+        return {"status": "success", "ingested": await history.ingest()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/bot/live")
+async def get_live_state():
+    """Latest state published by the bot over IPC (heartbeat, positions, risk, latency)"""
+    return bot_channel.summary()
+
+@api_router.post("/bot/command")
+async def send_bot_command(command: BotCommand):
+    """Send a command (e.g. kill, pause, resume) to the running bot over IPC"""
+    result = await bot_channel.send_command(command.command, command.args)
+    if not result.get("ok") and result.get("error") == "Bot channel not connected":
+        raise HTTPException(status_code=409, detail=result["error"])
+    return result
+
+@api_router.get("/bot/kill-switch")
+async def get_kill_switch():
+    """State of the kill switch shared by every bot process"""
+    return kill_switch.state()
+
+@api_router.post("/bot/kill-switch")
+async def set_kill_switch(request: KillSwitchRequest):
+    """Engage (every bot cancels its orders and flattens) or release the kill switch"""
+    if request.engaged:
+        kill_switch.engage(request.reason)
+    else:
+        kill_switch.release()
+    state = kill_switch.state()
+    live_hub.publish("kill_switch", state)
+    return state
+
+@api_router.websocket("/ws/live")
+async def live_updates(websocket: WebSocket):
+    """Push status, trades, PnL and log lines to the dashboard as they change"""
+    await websocket.accept()
+    queue = live_hub.subscribe()
+
+    async def send_updates():
+        try:
+            while True:
+                message = await queue.get()
+                if message is None:
+                    return
+                await websocket.send_json(message)
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+
+    async def wait_disconnect():
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = [asyncio.create_task(send_updates()), asyncio.create_task(wait_disconnect())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        live_hub.unsubscribe(queue)
 
 # Include router
 app.include_router(api_router)
@@ -335,13 +490,49 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+async def history_ingest_loop():
+    """Periodically move new file records and buffered signals into MongoDB"""
+    while True:
+        try:
+            await history.ingest()
+        except Exception as e:
+            logger.error(f"History ingest failed: {str(e)}")
+        await asyncio.sleep(HISTORY_INGEST_INTERVAL)
+
+@app.on_event("startup")
+async def start_bot_channel():
+    try:
+        await bot_channel.start()
+    except OSError as e:
+        logger.error(f"Bot channel unavailable: {str(e)}")
+
+@app.on_event("startup")
+async def start_history_ingest():
+    global history_task
+    try:
+        await history.ensure_indexes()
+    except Exception as e:
+        logger.error(f"Could not create history indexes: {str(e)}")
+    history_task = asyncio.create_task(history_ingest_loop())
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    if history_task:
+        history_task.cancel()
     client.close()
+    await live_hub.stop()
+    bot_channel.close()
+    kill_switch.close()
     
     # Stop bot if running
     if bot_status["running"] and bot_status["pid"]:
         try:
             os.killpg(os.getpgid(bot_status["pid"]), signal.SIGTERM)
+        except:
+            pass
+    
+    if feed_process is not None and feed_process.poll() is None:
+        try:
+            os.killpg(os.getpgid(feed_process.pid), signal.SIGTERM)
         except:
             pass
\ No newline at end of file
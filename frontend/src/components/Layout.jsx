@@ -4,6 +4,7 @@ import { Button } from "@/components/ui/button";
 import { useState, useEffect } from "react";
 import axios from "axios";
 import { toast } from "sonner";
+import { useLiveUpdates } from "@/hooks/use-live-updates";
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
@@ -12,6 +13,7 @@ export default function Layout({ children }) {
   const location = useLocation();
   const [botStatus, setBotStatus] = useState({ running: false });
   const [loading, setLoading] = useState(false);
+  const live = useLiveUpdates();
 
   const fetchStatus = async () => {
     try {
@@ -24,9 +26,22 @@ export default function Layout({ children }) {
 
   useEffect(() => {
     fetchStatus();
+  }, []);
+
+  useEffect(() => {
+    // Poll only while the live channel is down
+    if (live.connected) {
+      return;
+    }
     const interval = setInterval(fetchStatus, 5000);
     return () => clearInterval(interval);
-  }, []);
+  }, [live.connected]);
+
+  useEffect(() => {
+    if (live.status) {
+      setBotStatus(live.status);
+    }
+  }, [live.status]);
 
   const handleStartBot = async () => {
     setLoading(true);
@@ -0,0 +1,74 @@
+import { useEffect, useState } from "react";
+
+const BACKEND_URL = process.env.REACT_APP_BACKEND_URL || window.location.origin;
+const WS_URL = `${BACKEND_URL.replace(/^http/, "ws")}/api/ws/live`;
+const MAX_LOG_LINES = 200;
+const MAX_RETRY_DELAY = 30000;
+
+// One socket per tab, shared by every component that subscribes
+const state = { status: null, pnl: null, trades: null, logs: null, connected: false };
+const listeners = new Set();
+let socket = null;
+let retryDelay = 1000;
+
+function notify() {
+  const snapshot = { ...state };
+  listeners.forEach((listener) => listener(snapshot));
+}
+
+function apply({ type, data }) {
+  if (type === "trades") {
+    state.trades = data.reset ? data.trades : [...(state.trades || []), ...data.trades];
+  } else if (type === "logs") {
+    const lines = data.reset ? data.logs : [...(state.logs || []), ...data.logs];
+    state.logs = lines.slice(-MAX_LOG_LINES);
+  } else {
+    state[type] = data;
+  }
+}
+
+function connect() {
+  if (socket) {
+    return;
+  }
+
+  socket = new WebSocket(WS_URL);
+
+  socket.onopen = () => {
+    retryDelay = 1000;
+    state.connected = true;
+    notify();
+  };
+
+  socket.onmessage = (event) => {
+    apply(JSON.parse(event.data));
+    notify();
+  };
+
+  socket.onclose = () => {
+    socket = null;
+    state.connected = false;
+    notify();
+    if (listeners.size > 0) {
+      setTimeout(connect, retryDelay);
+      retryDelay = Math.min(retryDelay * 2, MAX_RETRY_DELAY);
+    }
+  };
+}
+
+export function useLiveUpdates() {
+  const [snapshot, setSnapshot] = useState({ ...state });
+
+  useEffect(() => {
+    listeners.add(setSnapshot);
+    connect();
+    return () => {
+      listeners.delete(setSnapshot);
+      if (listeners.size === 0 && socket) {
+        socket.close();
+      }
+    };
+  }, []);
+
+  return snapshot;
+}
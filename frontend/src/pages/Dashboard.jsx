@@ -3,6 +3,7 @@ import axios from "axios";
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card";
 import { TrendingUp, TrendingDown, Activity, DollarSign, Target, AlertCircle } from "lucide-react";
 import { Badge } from "@/components/ui/badge";
+import { useLiveUpdates } from "@/hooks/use-live-updates";
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
@@ -12,12 +13,29 @@ export default function Dashboard() {
   const [performance, setPerformance] = useState(null);
   const [config, setConfig] = useState(null);
   const [loading, setLoading] = useState(true);
+  const live = useLiveUpdates();
 
   useEffect(() => {
     fetchData();
+  }, []);
+
+  useEffect(() => {
+    // Poll only while the live channel is down
+    if (live.connected) {
+      return;
+    }
     const interval = setInterval(fetchData, 5000);
     return () => clearInterval(interval);
-  }, []);
+  }, [live.connected]);
+
+  useEffect(() => {
+    if (live.status) {
+      setStatus(live.status);
+    }
+    if (live.pnl) {
+      setPerformance(live.pnl);
+    }
+  }, [live.status, live.pnl]);
 
   const fetchData = async () => {
     try {
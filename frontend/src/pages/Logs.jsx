@@ -1,29 +1,43 @@
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import axios from "axios";
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
 import { RefreshCw, Terminal } from "lucide-react";
+import { useLiveUpdates } from "@/hooks/use-live-updates";
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
+const MAX_LINES = 200;
 
 export default function Logs() {
   const [logs, setLogs] = useState([]);
   const [loading, setLoading] = useState(true);
   const [autoRefresh, setAutoRefresh] = useState(true);
+  const offsetRef = useRef(null);
+  const fileRef = useRef(null);
+  const live = useLiveUpdates();
 
   useEffect(() => {
     fetchLogs();
     
-    if (autoRefresh) {
-      const interval = setInterval(fetchLogs, 3000);
+    // Poll only while the live channel is down
+    if (autoRefresh && !live.connected) {
+      const interval = setInterval(fetchNewLogs, 3000);
       return () => clearInterval(interval);
     }
-  }, [autoRefresh]);
+  }, [autoRefresh, live.connected]);
+
+  useEffect(() => {
+    if (autoRefresh && live.logs) {
+      setLogs(live.logs);
+    }
+  }, [autoRefresh, live.logs]);
 
   const fetchLogs = async () => {
     try {
-      const response = await axios.get(`${API}/bot/logs?lines=200`);
+      const response = await axios.get(`${API}/bot/logs?lines=${MAX_LINES}`);
+      offsetRef.current = response.data.offset;
+      fileRef.current = response.data.file;
       setLogs(response.data.logs);
     } catch (error) {
       console.error("Error fetching logs:", error);
@@ -32,6 +46,30 @@ export default function Logs() {
     }
   };
 
+  const fetchNewLogs = async () => {
+    if (offsetRef.current === null) {
+      return fetchLogs();
+    }
+    try {
+      const response = await axios.get(`${API}/bot/logs`, {
+        params: { lines: MAX_LINES, after_offset: offsetRef.current, file: fileRef.current },
+      });
+      const { logs: newLogs, offset, file, reset } = response.data;
+      offsetRef.current = offset;
+      fileRef.current = file;
+      if (reset) {
+        // New day's file, or the old one was truncated; the server sent a fresh tail
+        setLogs(newLogs);
+      } else if (newLogs.length > 0) {
+        setLogs((current) => [...current, ...newLogs].slice(-MAX_LINES));
+      }
+    } catch (error) {
+      console.error("Error fetching logs:", error);
+    } finally {
+      setLoading(false);
+    }
+  };
+
   const getLogColor = (line) => {
     if (line.includes("ERROR")) return "text-red-600";
     if (line.includes("WARNING")) return "text-amber-600";
@@ -5,6 +5,7 @@ import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from "@
 import { Badge } from "@/components/ui/badge";
 import { Button } from "@/components/ui/button";
 import { RefreshCw, TrendingUp, TrendingDown } from "lucide-react";
+import { useLiveUpdates } from "@/hooks/use-live-updates";
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
@@ -13,12 +14,29 @@ export default function Trades() {
   const [trades, setTrades] = useState([]);
   const [performance, setPerformance] = useState(null);
   const [loading, setLoading] = useState(true);
+  const live = useLiveUpdates();
 
   useEffect(() => {
     fetchData();
+  }, []);
+
+  useEffect(() => {
+    // Poll only while the live channel is down
+    if (live.connected) {
+      return;
+    }
     const interval = setInterval(fetchData, 5000);
     return () => clearInterval(interval);
-  }, []);
+  }, [live.connected]);
+
+  useEffect(() => {
+    if (live.trades) {
+      setTrades(live.trades);
+    }
+    if (live.pnl) {
+      setPerformance(live.pnl);
+    }
+  }, [live.trades, live.pnl]);
 
   const fetchData = async () => {
     try {
@@ -6,6 +6,18 @@ from dotenv import load_dotenv
 BASE_DIR = Path(__file__).parent.parent
 load_dotenv(BASE_DIR / '.env')
 
+def _parse_list(value, default):
+    items = [item.strip() for item in (value or '').split(',') if item.strip()]
+    return items or [default]
+
+def _parse_supertrend_configs(value, period, multiplier):
+    """'7:4,10:3' -> [(7, 4.0), (10, 3.0)]; defaults to the single period/multiplier"""
+    configs = []
+    for item in _parse_list(value, f'{period}:{multiplier}'):
+        p, m = item.split(':')
+        configs.append((int(p), float(m)))
+    return configs
+
 class Config:
     # Dhan API
     DHAN_CLIENT_ID = os.getenv('DHAN_CLIENT_ID')
@@ -16,29 +28,70 @@ class Config:
     
     # Index Configuration
     INDEX_NAME = os.getenv('INDEX_NAME', 'NIFTY')
+    INDEX_NAMES = _parse_list(os.getenv('INDEX_NAMES'), INDEX_NAME)  # e.g. NIFTY,BANKNIFTY,FINNIFTY
     LOT_SIZE = int(os.getenv('LOT_SIZE', 10))
     STRIKE_INTERVAL = int(os.getenv('STRIKE_INTERVAL', 50))
+    LADDER_STRIKES = int(os.getenv('LADDER_STRIKES', 2))  # strikes each side of ATM kept subscribed (0 = off)
+    RISK_FREE_RATE = float(os.getenv('RISK_FREE_RATE', 0.07))  # for option IV/Greeks
     
     # Risk Management
     STOP_LOSS_PERCENT = float(os.getenv('STOP_LOSS_PERCENT', 30))
     TRAILING_STOP_PERCENT = float(os.getenv('TRAILING_STOP_PERCENT', 10))
     MAX_TRADES_PER_DAY = int(os.getenv('MAX_TRADES_PER_DAY', 20))
     MAX_LOSS_PER_DAY = float(os.getenv('MAX_LOSS_PER_DAY', 20000))
+    TRADING_CAPITAL = float(os.getenv('TRADING_CAPITAL', 100000))  # for RISK_PER_TRADE_PCT
+    MAX_OPEN_POSITIONS = int(os.getenv('MAX_OPEN_POSITIONS', 0))  # 0 = no limit
+    MAX_EXPOSURE = float(os.getenv('MAX_EXPOSURE', 0))  # premium outstanding, 0 = no limit
+    # Position sizing: lots from the per-trade risk budget, ATR and available funds
+    SIZING_ATR_MULTIPLIER = float(os.getenv('SIZING_ATR_MULTIPLIER', 1.0))  # adverse index move, in ATRs
+    MAX_LOTS = int(os.getenv('MAX_LOTS', 0))  # per entry, 0 = no limit
+    SELECT_STRIKE_BY_RISK = os.getenv('SELECT_STRIKE_BY_RISK', 'false').lower() == 'true'  # else ATM
     
     # SuperTrend Strategy
     SUPERTREND_PERIOD = int(os.getenv('SUPERTREND_PERIOD', 7))
     SUPERTREND_MULTIPLIER = float(os.getenv('SUPERTREND_MULTIPLIER', 4))
+    SUPERTREND_CONFIGS = _parse_supertrend_configs(  # period:multiplier per strategy, e.g. 7:4,10:3
+        os.getenv('SUPERTREND_CONFIGS'), SUPERTREND_PERIOD, SUPERTREND_MULTIPLIER
+    )
     CANDLE_TIMEFRAME = int(os.getenv('CANDLE_TIMEFRAME', 1))  # in minutes
+    WARMUP_BARS = int(os.getenv('WARMUP_BARS', 100))  # history candles loaded before trading
+    # Higher timeframes (minutes) that must agree before entering, e.g. 5,15
+    CONFIRM_TIMEFRAMES = [int(tf) for tf in os.getenv('CONFIRM_TIMEFRAMES', '').split(',') if tf.strip()]
+    
+    # Paper fills: latency, bid/ask spread and volatility slippage (off: instant fills at the order price)
+    PAPER_FILL_MODEL = os.getenv('PAPER_FILL_MODEL', 'false').lower() == 'true'
+    PAPER_LATENCY_MS = float(os.getenv('PAPER_LATENCY_MS', 150))
+    PAPER_SPREAD_PCT = float(os.getenv('PAPER_SPREAD_PCT', 0.2))  # full spread, % of price
+    PAPER_SLIPPAGE_FACTOR = float(os.getenv('PAPER_SLIPPAGE_FACTOR', 1.0))
+    
+    # Orders
+    ORDER_RATE_LIMIT = float(os.getenv('ORDER_RATE_LIMIT', 10))  # orders per second sent to the broker
     
     # Polling
     POLLING_INTERVAL = int(os.getenv('POLLING_INTERVAL', 1))  # in seconds
     
+    # Shared feed: one feed.py process polls Dhan for every bot process
+    SHARED_FEED = os.getenv('SHARED_FEED', 'false').lower() == 'true'
+    SHARED_FEED_NAME = os.getenv('SHARED_FEED_NAME', 'dhan_feed')
+    SHARED_FEED_SLOTS = int(os.getenv('SHARED_FEED_SLOTS', 512))
+    SHARED_FEED_WAIT = float(os.getenv('SHARED_FEED_WAIT', 60))  # seconds a bot waits for feed.py at startup
+    
     # Directories
     DATA_DIR = BASE_DIR / 'data'
     INSTRUMENTS_DIR = DATA_DIR / 'instruments'
     TRADES_DIR = DATA_DIR / 'trades'
     PNL_DIR = DATA_DIR / 'pnl'
+    CANDLES_DIR = DATA_DIR / 'candles'
     LOGS_DIR = BASE_DIR / 'logs'
+
+    # Logging: JSON lines in LOGS_DIR, rotated daily and gzipped
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+    LOG_BACKUP_DAYS = int(os.getenv('LOG_BACKUP_DAYS', 30))
+    LOG_RATE_LIMIT = float(os.getenv('LOG_RATE_LIMIT', 20))  # INFO/DEBUG records per second per logger (0 = off)
+    LOG_RATE_BURST = int(os.getenv('LOG_RATE_BURST', 100))
+    RUN_DIR = BASE_DIR / 'run'  # IPC sockets shared with the API server
+    # NSE holidays and special sessions (see config/market_calendar.csv)
+    MARKET_CALENDAR_FILE = Path(os.getenv('MARKET_CALENDAR_FILE', BASE_DIR / 'config' / 'market_calendar.csv'))
     
     @classmethod
     def validate(cls):
@@ -0,0 +1,64 @@
+# index_options_bot/download_history.py
+
+import argparse
+import asyncio
+import logging
+
+from config.settings import config
+from utils import DhanClient, CandleStore, HistoryDownloader, setup_logging
+from utils.instruments import INDEX_SECURITY_IDS
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Download intraday candles into data/candles")
+    parser.add_argument('--from', dest='from_date', required=True, help="YYYY-MM-DD")
+    parser.add_argument('--to', dest='to_date', required=True, help="YYYY-MM-DD")
+    parser.add_argument('--indices', default=','.join(config.INDEX_NAMES),
+                        help="Comma-separated index names (default: INDEX_NAMES)")
+    parser.add_argument('--options', default='',
+                        help="Comma-separated NSE_FNO option security IDs")
+    parser.add_argument('--interval', type=int, default=1, help="Candle minutes: 1, 5, 15, 25 or 60")
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--rate', type=float, default=5, help="Requests per second")
+    return parser.parse_args()
+
+
+def main():
+    setup_logging('download_history')
+    args = parse_args()
+    config.validate()
+
+    dhan_client = DhanClient()
+    if not dhan_client.authenticate():
+        raise RuntimeError("Dhan authentication failed")
+
+    instruments = [
+        ('IDX_I', INDEX_SECURITY_IDS[name.strip()], 'INDEX')
+        for name in args.indices.split(',') if name.strip()
+    ]
+    instruments += [
+        ('NSE_FNO', int(security_id), 'OPTIDX')
+        for security_id in args.options.split(',') if security_id.strip()
+    ]
+
+    def progress(done, total, candles):
+        logger.info("%s/%s chunks, %s candles", done, total, candles)
+
+    downloader = HistoryDownloader(
+        dhan_client, CandleStore(config.CANDLES_DIR),
+        interval=args.interval,
+        concurrency=args.concurrency,
+        rate_per_second=args.rate,
+        on_progress=progress
+    )
+    report = asyncio.run(downloader.download(instruments, args.from_date, args.to_date))
+    logger.info("%s candles in %ss (%s/s), %s requests, %s failed chunks",
+                report['candles'], report['seconds'], report['candles_per_second'],
+                report['requests'], len(report['failed']))
+    return 1 if report['failed'] else 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -1,4 +1,18 @@
-from .paper import PaperTrading
-from .live import LiveTrading
+from utils.lazy import lazy_exports
 
-__all__ = ['PaperTrading', 'LiveTrading']
\ No newline at end of file
+# Submodules load on first use of a name (see utils/lazy.py)
+_EXPORTS = {
+    'PaperTrading': 'paper',
+    'LiveTrading': 'live',
+    'OrderPipeline': 'order_pipeline',
+    'OrderTicket': 'order_pipeline',
+    'LatencyHistogram': 'latency',
+    'FillModel': 'fill_model',
+    'TickVolatility': 'fill_model',
+    'Basket': 'basket',
+    'BasketLeg': 'basket',
+    'KillSwitch': 'kill_switch',
+}
+
+__all__ = list(_EXPORTS)
+__getattr__ = lazy_exports(__name__, _EXPORTS)
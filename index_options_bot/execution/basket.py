@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+class BasketLeg:
+    """One instrument in a basket"""
+
+    __slots__ = ('security_id', 'symbol', 'side', 'quantity', 'price')
+
+    def __init__(self, security_id, symbol, side, quantity, price):
+        self.security_id = security_id
+        self.symbol = symbol
+        self.side = side
+        self.quantity = quantity
+        self.price = price
+
+class Basket:
+    """
+    Several NFO legs (straddle, strangle, hedged spread) placed as one.
+
+    validate() checks every leg before anything is sent. execute() submits
+    all legs concurrently through an OrderPipeline, which spaces them to
+    the order rate limit, so a basket costs about one broker round trip
+    rather than one per leg, then waits for every fill. If any leg is
+    rejected, cancelled or only partly filled, the filled quantity of
+    every leg is unwound with opposite orders (rollback=True), so a
+    failed basket never leaves a naked leg behind.
+    """
+
+    def __init__(self, legs, name=None):
+        self.legs = list(legs)
+        self.name = name or ' + '.join(leg.symbol for leg in self.legs)
+        self.status = 'NEW'
+        self.errors = []
+        self.tickets = []
+        self.unwinds = []
+        self.submit_ms = None
+        self.fill_ms = None
+
+    def validate(self):
+        errors = []
+        if not self.legs:
+            errors.append("Basket has no legs")
+        seen = set()
+        for i, leg in enumerate(self.legs):
+            label = f"Leg {i + 1} ({leg.symbol})"
+            if leg.security_id is None:
+                errors.append(f"{label}: no security ID")
+            if leg.side not in ('BUY', 'SELL'):
+                errors.append(f"{label}: side must be BUY or SELL, not {leg.side!r}")
+            if not isinstance(leg.quantity, int) or leg.quantity <= 0:
+                errors.append(f"{label}: quantity must be a positive integer")
+            if not leg.price or leg.price <= 0:
+                errors.append(f"{label}: no reference price")
+            if (leg.security_id, leg.side) in seen:
+                errors.append(f"{label}: duplicates another leg")
+            seen.add((leg.security_id, leg.side))
+        self.errors = errors
+        return errors
+
+    @property
+    def filled(self):
+        return self.status == 'FILLED'
+
+    async def execute(self, pipeline, rollback=True):
+        if self.validate():
+            self.status = 'REJECTED'
+            logger.error("Basket %s rejected: %s", self.name, '; '.join(self.errors))
+            return self
+
+        started = time.perf_counter()
+        self.tickets = await asyncio.gather(*(
+            pipeline.submit(leg.security_id, leg.symbol, leg.price, leg.quantity, leg.side)
+            for leg in self.legs
+        ))
+        self.submit_ms = round((time.perf_counter() - started) * 1000, 3)
+        self.tickets = await asyncio.gather(*(ticket.wait() for ticket in self.tickets))
+        self.fill_ms = round((time.perf_counter() - started) * 1000, 3)
+
+        incomplete = [t for t in self.tickets if t.filled_qty < t.quantity]
+        if not incomplete:
+            self.status = 'FILLED'
+            logger.info("Basket %s filled in %s ms", self.name, self.fill_ms)
+            return self
+
+        self.errors = [f"{t.symbol}: {t.status} {t.filled_qty}/{t.quantity} {t.error or ''}".strip() for t in incomplete]
+        logger.error("Basket %s incomplete: %s", self.name, '; '.join(self.errors))
+        if not rollback:
+            self.status = 'PARTIAL'
+            return self
+
+        await self.unwind(pipeline)
+        return self
+
+    async def unwind(self, pipeline):
+        """Flatten whatever the legs filled; status ROLLED_BACK, or PARTIAL if that failed too"""
+        filled = [t for t in self.tickets if t.filled_qty]
+        unwinds = await asyncio.gather(*(
+            pipeline.submit(t.security_id, t.symbol, t.avg_price, t.filled_qty,
+                            'SELL' if t.side == 'BUY' else 'BUY', reduce_only=True)
+            for t in filled
+        ))
+        self.unwinds = await asyncio.gather(*(ticket.wait() for ticket in unwinds))
+        stuck = [t for t in self.unwinds if t.filled_qty < t.quantity]
+        if stuck:
+            self.status = 'PARTIAL'
+            logger.critical("Basket %s could not be unwound: %s", self.name, [t.symbol for t in stuck])
+        else:
+            self.status = 'ROLLED_BACK'
+            logger.warning("Basket %s rolled back %s filled leg(s)", self.name, len(self.unwinds))
+        return self.unwinds
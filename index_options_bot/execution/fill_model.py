@@ -0,0 +1,92 @@
+import math
+import time
+
+import numpy as np
+
+class FillModel:
+    """
+    Where a paper order would really have filled.
+
+    A fill happens latency_ms after the order, at the mid then, plus half
+    the bid/ask spread (spread_pct of mid, at least one tick) and
+    slippage that grows with volatility over the latency window:
+    slippage_factor * volatility * sqrt(latency seconds), volatility being
+    price points per sqrt(second). Buys round up and sells down to the
+    tick; quantity rounds down to whole lots, and below one lot there is
+    no fill.
+
+    batch() runs the model over numpy arrays (backtests) and fill() over
+    one order (live paper trading); both go through the same _fill().
+    """
+
+    def __init__(self, latency_ms=150, spread_pct=0.2, slippage_factor=1.0, lot_size=1, tick_size=0.05):
+        self.latency_ms = latency_ms
+        self.spread_pct = spread_pct
+        self.slippage_factor = slippage_factor
+        self.lot_size = lot_size
+        self.tick_size = tick_size
+
+    def _fill(self, side, mid, volatility, quantity):
+        """side is +1 (buy) / -1 (sell); works on scalars and arrays alike"""
+        half_spread = np.maximum(mid * self.spread_pct / 200, self.tick_size / 2)
+        slippage = self.slippage_factor * volatility * math.sqrt(self.latency_ms / 1000)
+        raw = mid + side * (half_spread + slippage)
+        ticks = raw / self.tick_size
+        # Round against the trader: buys up, sells down (small epsilon for float noise)
+        ticks = np.where(side > 0, np.ceil(ticks - 1e-9), np.floor(ticks + 1e-9))
+        price = np.maximum(ticks * self.tick_size, self.tick_size).round(2)
+        filled = quantity // self.lot_size * self.lot_size
+        return price, filled
+
+    def fill(self, side, mid, volatility=0.0, quantity=1):
+        """(fill price, filled quantity) for one order; side is 'BUY' or 'SELL'"""
+        price, filled = self._fill(1 if side == 'BUY' else -1, mid, volatility, quantity)
+        return float(price), int(filled)
+
+    def batch(self, side, mid, volatility, quantity, order_time=None):
+        """
+        Fill a batch of orders.
+
+        side: array of +1/-1; mid: price at fill time (see mid_at);
+        volatility, quantity: arrays or scalars. Returns (price, filled,
+        fill_time) arrays; fill_time is order_time + latency when given.
+        """
+        side = np.asarray(side)
+        price, filled = self._fill(side, np.asarray(mid, dtype=float), np.asarray(volatility, dtype=float),
+                                   np.asarray(quantity, dtype=np.int64))
+        fill_time = None if order_time is None else np.asarray(order_time, dtype=float) + self.latency_ms / 1000
+        return price, filled, fill_time
+
+    def mid_at(self, times, prices, order_time):
+        """Last price at or before each order's fill time, from a sorted price series"""
+        fill_time = np.asarray(order_time, dtype=float) + self.latency_ms / 1000
+        i = np.searchsorted(times, fill_time, side='right') - 1
+        return np.asarray(prices)[np.clip(i, 0, len(prices) - 1)]
+
+class TickVolatility:
+    """
+    Per-instrument volatility from the live tick stream, in price points
+    per sqrt(second): an exponentially weighted mean of dp^2/dt.
+    """
+
+    def __init__(self, alpha=0.1):
+        self.alpha = alpha
+        self._last = {}
+        self._variance = {}
+
+    def update(self, key, price, ts=None):
+        ts = ts if ts is not None else time.monotonic()
+        last = self._last.get(key)
+        self._last[key] = (price, ts)
+        if last is None or ts <= last[1]:
+            return
+        sample = (price - last[0]) ** 2 / (ts - last[1])
+        variance = self._variance.get(key)
+        self._variance[key] = sample if variance is None else variance + self.alpha * (sample - variance)
+
+    def get(self, key):
+        return math.sqrt(self._variance.get(key, 0.0))
+
+    def price(self, key):
+        last = self._last.get(key)
+        return last[0] if last else None
@@ -0,0 +1,87 @@
+import fcntl
+import mmap
+import os
+import struct
+import time
+
+MAGIC = b'KILLSWCH'
+VERSION = 1
+
+# magic, version, engaged | triggered at (epoch s), released at | reason
+LAYOUT = struct.Struct('<8sIIdd32s')
+SIZE = 64
+ENGAGED_OFFSET = 12
+TRIGGER = struct.Struct('<dd32s')
+TRIGGER_OFFSET = 16
+
+class KillSwitch:
+    """
+    One shared flag that stops opening orders in every process at once.
+
+    The flag lives in a small file memory-mapped by each process (bots,
+    the API server), so engaging it is a single store and checking it on
+    the order path is one byte read from the mapping: no lock, no
+    syscall. Engaging writes the trigger time and reason before the flag.
+    The switch latches until release() is called. With no path it is an
+    anonymous mapping private to this process.
+
+    backend/kill_switch.py maps the same file from the API server using
+    this class, so the layout is defined only here.
+    """
+
+    def __init__(self, path=None):
+        self.path = str(path) if path is not None else None
+        if path is None:
+            self._mm = mmap.mmap(-1, SIZE)
+            LAYOUT.pack_into(self._mm, 0, MAGIC, VERSION, 0, 0.0, 0.0, b'')
+            return
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                if os.fstat(fd).st_size < SIZE:
+                    os.ftruncate(fd, SIZE)
+                    os.pwrite(fd, LAYOUT.pack(MAGIC, VERSION, 0, 0.0, 0.0, b''), 0)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            self._mm = mmap.mmap(fd, SIZE)
+        finally:
+            os.close(fd)
+        magic, version = LAYOUT.unpack_from(self._mm, 0)[:2]
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a v{VERSION} kill switch")
+
+    @property
+    def engaged(self):
+        return self._mm[ENGAGED_OFFSET] != 0
+
+    def engage(self, reason='manual'):
+        """Trip the switch; returns False if it was already engaged"""
+        if self.engaged:
+            return False
+        TRIGGER.pack_into(self._mm, TRIGGER_OFFSET, time.time(), 0.0, reason.encode()[:32])
+        self._mm[ENGAGED_OFFSET] = 1
+        return True
+
+    def release(self):
+        if not self.engaged:
+            return
+        self._mm[ENGAGED_OFFSET] = 0
+        struct.pack_into('<d', self._mm, TRIGGER_OFFSET + 8, time.time())
+
+    def state(self):
+        _, _, engaged, triggered_at, released_at, reason = LAYOUT.unpack_from(self._mm, 0)
+        return {
+            'engaged': bool(engaged),
+            'triggered_at': triggered_at or None,
+            'released_at': released_at or None,
+            'reason': reason.rstrip(b'\0').decode(errors='replace') or None,
+        }
+
+    @property
+    def triggered_at(self):
+        return TRIGGER.unpack_from(self._mm, TRIGGER_OFFSET)[0] or None
+
+    def close(self):
+        self._mm.close()
@@ -0,0 +1,52 @@
+import bisect
+
+# Bucket upper bounds in milliseconds, roughly log-spaced
+DEFAULT_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram.
+
+    record() is one bisect and an increment; percentiles are read off the
+    bucket counts (upper bound of the bucket holding the rank), so they
+    are accurate to a bucket, which is all a dashboard needs.
+    """
+
+    def __init__(self, bounds_ms=DEFAULT_BOUNDS_MS):
+        self.bounds = tuple(bounds_ms)
+        self.counts = [0] * (len(self.bounds) + 1)  # last bucket: above the top bound
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, ms):
+        self.counts[bisect.bisect_left(self.bounds, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, p):
+        if not self.count:
+            return None
+        rank = max(int(self.count * p / 100 + 0.5), 1)
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count, 3) if self.count else None,
+            'p50_ms': self.percentile(50),
+            'p90_ms': self.percentile(90),
+            'p99_ms': self.percentile(99),
+            'max_ms': round(self.max, 3),
+            'buckets': {
+                (f"<={bound}" if i < len(self.bounds) else f">{self.bounds[-1]}"): n
+                for i, (bound, n) in enumerate(zip(self.bounds + (None,), self.counts)) if n
+            },
+        }
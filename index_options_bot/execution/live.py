@@ -5,10 +5,22 @@ from config.settings import config
 logger = logging.getLogger(__name__)
 
 class LiveTrading:
-    """Live trading engine using Dhan API"""
+    """
+    Live trading engine using Dhan API.
     
-    def __init__(self, dhan_client):
+    With a kill switch, place_order itself refuses any order that would
+    open or add to a position while the switch is engaged, whoever calls
+    it; orders that only reduce the filled net quantity of a security
+    (exits) still go out. Net quantity comes from fills, reported by the
+    order pipeline through on_order_done(); orders still working on the
+    same side count against it, so exits can never add up to a reversal.
+    """
+    
+    def __init__(self, dhan_client, kill_switch=None):
         self.dhan_client = dhan_client
+        self.kill_switch = kill_switch  # shared with every bot process and the API server
+        self.net_qty = {}  # security_id -> filled net quantity, BUY positive
+        self.working = {}  # (security_id, side) -> quantity placed and not yet resolved
         self.enabled = (config.TRADING_MODE == 'live')
         
         if not self.enabled:
@@ -23,8 +35,15 @@ class LiveTrading:
                 'error': 'Live trading is disabled'
             }
         
+        if self.kill_switch is not None and self.kill_switch.engaged and not self._reduces(security_id, transaction_type, quantity):
+            logger.error("Kill switch engaged: refusing %s %s x %s", transaction_type, symbol, quantity)
+            return {
+                'status': 'failure',
+                'error': 'Kill switch engaged'
+            }
+        
         try:
-            logger.info(f"🔴 LIVE ORDER: {transaction_type} {symbol} @ ₹{price} x {quantity}")
+            logger.info("🔴 LIVE ORDER: %s %s @ ₹%s x %s", transaction_type, symbol, price, quantity)
             
             response = self.dhan_client.place_order(
                 security_id=security_id,
@@ -37,21 +56,42 @@ class LiveTrading:
             )
             
             if response and response.get('status') == 'success':
+                key = (security_id, transaction_type)
+                self.working[key] = self.working.get(key, 0) + quantity
                 order_id = response.get('data', {}).get('orderId')
-                logger.info(f"✓ Live order placed successfully. Order ID: {order_id}")
+                logger.info("✓ Live order placed successfully. Order ID: %s", order_id)
                 return response
             else:
                 error_msg = response.get('remarks', 'Unknown error') if response else 'No response'
-                logger.error(f"Live order failed: {error_msg}")
+                logger.error("Live order failed: %s", error_msg)
                 return response
                 
         except Exception as e:
-            logger.error(f"Error placing live order: {str(e)}")
+            logger.error("Error placing live order: %s", e)
             return {
                 'status': 'failure',
                 'error': str(e)
             }
     
+    def on_order_done(self, security_id, transaction_type, quantity, filled_qty):
+        """An order placed here is terminal (filled, cancelled, rejected, expired) with filled_qty filled"""
+        key = (security_id, transaction_type)
+        working = self.working.get(key, 0) - quantity
+        if working > 0:
+            self.working[key] = working
+        else:
+            self.working.pop(key, None)
+        if filled_qty:
+            signed = filled_qty if transaction_type == 'BUY' else -filled_qty
+            self.net_qty[security_id] = self.net_qty.get(security_id, 0) + signed
+    
+    def _reduces(self, security_id, transaction_type, quantity):
+        """True if the order, with every working order on its side, takes the filled net towards zero without crossing it"""
+        net = self.net_qty.get(security_id, 0)
+        if transaction_type == 'BUY':
+            net = -net
+        return net > 0 and self.working.get((security_id, transaction_type), 0) + quantity <= net
+    
     def get_order_status(self, order_id):
         """Get status of a live order"""
         if not self.enabled:
@@ -60,7 +100,36 @@ class LiveTrading:
         try:
             return self.dhan_client.get_order_status(order_id)
         except Exception as e:
-            logger.error(f"Error getting order status: {str(e)}")
+            logger.error("Error getting order status: %s", e)
+            return None
+    
+    def cancel_order(self, order_id):
+        """Cancel a live order"""
+        if not self.enabled:
+            return None
+        
+        try:
+            response = self.dhan_client.cancel_order(order_id)
+            if not response or response.get('status') != 'success':
+                logger.error("Cancel failed for order %s: %s", order_id, response.get('remarks') if response else 'No response')
+            return response
+        except Exception as e:
+            logger.error("Error cancelling order: %s", e)
+            return None
+    
+    def get_order_book(self):
+        """Today's orders with their latest status (one request for all of them)"""
+        if not self.enabled:
+            return None
+        
+        try:
+            response = self.dhan_client.get_order_list()
+            if response and response.get('status') == 'success' and isinstance(response.get('data'), list):
+                return response['data']
+            logger.error("Order book request failed: %s", response.get('remarks') if response else 'No response')
+            return None
+        except Exception as e:
+            logger.error("Error getting order book: %s", e)
             return None
     
     def enable_live_trading(self):
@@ -69,6 +138,15 @@ class LiveTrading:
         logger.warning("⚠️ LIVE TRADING ENABLED")
     
     def disable_live_trading(self):
-        """Disable live trading (kill-switch)"""
-        self.enabled = False
+        """
+        Disable live trading (kill-switch).
+        
+        With a shared kill switch this engages it, so every bot process
+        cancels its open orders and flattens; exits still go out.
+        Without one, this process stops placing orders at all.
+        """
+        if self.kill_switch is not None:
+            self.kill_switch.engage('disable_live_trading')
+        else:
+            self.enabled = False
         logger.critical("🛑 LIVE TRADING DISABLED (Kill-switch activated)")
\ No newline at end of file
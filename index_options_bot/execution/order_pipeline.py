@@ -0,0 +1,286 @@
+import asyncio
+import logging
+import time
+
+from execution.latency import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = {'TRADED', 'REJECTED', 'CANCELLED', 'EXPIRED'}
+
+class OrderTicket:
+    """One submitted order and what is known about its fill"""
+
+    __slots__ = (
+        'order_id', 'security_id', 'symbol', 'side', 'quantity', 'price', 'status',
+        'filled_qty', 'avg_price', 'submitted_at', 'acked_at', 'filled_at', 'error', 'reduce_only', 'accepted', 'done'
+    )
+
+    def __init__(self, security_id, symbol, side, quantity, price, reduce_only=False):
+        self.order_id = None
+        self.security_id = security_id
+        self.symbol = symbol
+        self.side = side
+        self.quantity = quantity
+        self.price = price
+        self.status = 'NEW'
+        self.filled_qty = 0
+        self.avg_price = None
+        self.submitted_at = None
+        self.acked_at = None
+        self.filled_at = None
+        self.error = None
+        self.reduce_only = reduce_only
+        self.accepted = False  # the executor took the order
+        self.done = None  # asyncio.Future resolved with this ticket
+
+    @property
+    def is_filled(self):
+        return self.status == 'TRADED'
+
+    async def wait(self):
+        """The ticket once its order is terminal (filled, rejected, cancelled, timed out)"""
+        return await self.done
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__ if name != 'done'}
+
+class OrderPipeline:
+    """
+    Submits orders off the event loop and tracks them to a fill.
+
+    submit() sends the order on a worker thread and returns its ticket
+    once the broker acknowledges it; await ticket.wait() for the fill.
+    One background task polls the broker's order book (a single request
+    however many orders are open, falling back to per-order status calls
+    when the executor has no order book) and updates filled quantity and
+    average price, including partial fills, until each order is terminal
+    or `timeout` seconds pass; an order still open then is cancelled at
+    the broker, and its ticket resolves as TIMEOUT (with any fill picked
+    up on the way) only once the cancel is accepted. Executors that cannot report status (paper
+    trading) are treated as filled at the requested price on ack.
+    With a limiter (utils.history_downloader.RateLimiter), submissions
+    are spaced to the broker's order rate limit. With a risk engine
+    (risk.RiskEngine), every order is checked inline before it is sent
+    and every fill is reported back to it. With a kill switch
+    (execution.KillSwitch), orders that are not reduce_only are rejected
+    while it is engaged; cancel_all() cancels every open order that is
+    not itself an exit. Each accepted order's final fill is also
+    reported to the executor's on_order_done, if it has one.
+    Submit-to-ack and submit-to-fill latencies go into histograms.
+    """
+
+    def __init__(self, executor, poll_interval=0.5, timeout=30.0, limiter=None, risk=None, kill_switch=None):
+        self.executor = executor
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.limiter = limiter
+        self.risk = risk
+        self.kill_switch = kill_switch
+        self.pending = {}
+        self.ack_latency = LatencyHistogram()
+        self.fill_latency = LatencyHistogram()
+        self._tracker = None
+        self._on_order_done = getattr(executor, 'on_order_done', None)  # live engine's fill-based net
+        self._trackable = (
+            callable(getattr(executor, 'get_order_book', None))
+            or callable(getattr(executor, 'get_order_status', None))
+        )
+
+    async def submit(self, security_id, symbol, price, quantity, side='BUY', stop_loss=None, reduce_only=False):
+        ticket = OrderTicket(security_id, symbol, side, quantity, price, reduce_only)
+        ticket.done = asyncio.get_running_loop().create_future()
+        if not reduce_only and self.kill_switch is not None and self.kill_switch.engaged:
+            ticket.error = 'Kill switch engaged'
+            logger.warning("Kill switch rejected %s %s x %s", side, symbol, quantity)
+            self._finish(ticket, 'REJECTED')
+            return ticket
+        if self.risk is not None:
+            decision = self.risk.check(security_id, side, quantity, price, stop_loss)
+            if not decision:
+                ticket.error = '; '.join(decision.reasons)
+                logger.warning("Risk rejected %s %s x %s: %s", side, symbol, quantity, ticket.error)
+                self._finish(ticket, 'REJECTED')
+                return ticket
+        if self.limiter is not None:
+            await self.limiter.wait()
+        ticket.submitted_at = time.perf_counter()
+
+        try:
+            response = await asyncio.to_thread(
+                self.executor.place_order, security_id, symbol, price, quantity, side
+            )
+        except Exception as e:
+            response = {'status': 'failure', 'error': str(e)}
+        ticket.acked_at = time.perf_counter()
+        self.ack_latency.record((ticket.acked_at - ticket.submitted_at) * 1000)
+
+        if not response or response.get('status') != 'success':
+            ticket.error = (response or {}).get('error') or (response or {}).get('remarks') or 'No response'
+            self._finish(ticket, 'REJECTED')
+            return ticket
+
+        ticket.accepted = True
+        data = response.get('data') if isinstance(response.get('data'), dict) else {}
+        order_id = response.get('order_id') or data.get('orderId')
+        ticket.order_id = str(order_id) if order_id is not None else None
+        ticket.status = data.get('orderStatus', 'PENDING')
+        if data.get('status') == 'COMPLETED' or ticket.order_id is None or not self._trackable:
+            # Executor fills synchronously or cannot be asked: take the ack as the fill
+            ticket.filled_qty = data.get('quantity', quantity)
+            ticket.avg_price = data.get('price', price)
+            self._finish(ticket, 'TRADED')
+            return ticket
+
+        self.pending[ticket.order_id] = ticket
+        if self._tracker is None or self._tracker.done():
+            self._tracker = asyncio.create_task(self._track(), name='order-tracker')
+        return ticket
+
+    async def _track(self):
+        while self.pending:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                records = await asyncio.to_thread(self._fetch, list(self.pending))
+            except Exception as e:
+                logger.error("Order status poll failed: %s", e)
+                records = {}
+
+            now = time.perf_counter()
+            expired = []
+            for order_id, ticket in list(self.pending.items()):
+                record = records.get(order_id)
+                if record is not None:
+                    self._apply(ticket, record)
+                if ticket.status in TERMINAL_STATUSES:
+                    self.pending.pop(order_id)
+                    self._finish(ticket, ticket.status)
+                elif now - ticket.submitted_at > self.timeout:
+                    expired.append(ticket)
+            if expired:
+                await self._cancel_expired(expired)
+
+    async def _cancel_expired(self, tickets):
+        """Cancel orders open past the timeout; any whose cancel fails stay tracked and are retried"""
+        for ticket in tickets:
+            logger.error("Order %s (%s) unconfirmed after %ss: %s; cancelling",
+                         ticket.order_id, ticket.symbol, self.timeout, ticket.status)
+        cancel_order = getattr(self.executor, 'cancel_order', None)
+        if callable(cancel_order):
+            responses = await asyncio.gather(*(
+                asyncio.to_thread(cancel_order, ticket.order_id) for ticket in tickets
+            ), return_exceptions=True)
+        else:
+            logger.error("Executor cannot cancel orders; %s timed-out order(s) may still fill", len(tickets))
+            responses = [{'status': 'success'}] * len(tickets)
+
+        cancelled = []
+        for ticket, response in zip(tickets, responses):
+            if isinstance(response, dict) and response.get('status') == 'success':
+                logger.warning("Cancelled timed-out order %s (%s)", ticket.order_id, ticket.symbol)
+                cancelled.append(ticket)
+            else:
+                reason = response if isinstance(response, Exception) else (response or {}).get('remarks', 'No response')
+                logger.error("Cancel of timed-out order %s (%s) failed: %s; still tracking it",
+                             ticket.order_id, ticket.symbol, reason)
+        if not cancelled:
+            return
+
+        # Pick up anything that filled before the cancel landed
+        try:
+            records = await asyncio.to_thread(self._fetch, [t.order_id for t in cancelled])
+        except Exception as e:
+            logger.error("Order status poll failed: %s", e)
+            records = {}
+        for ticket in cancelled:
+            record = records.get(ticket.order_id)
+            if record is not None:
+                self._apply(ticket, record)
+            if self.pending.pop(ticket.order_id, None) is not None:
+                self._finish(ticket, ticket.status if ticket.status == 'TRADED' else 'TIMEOUT')
+
+    def _fetch(self, order_ids):
+        """{order_id: order record} for the open orders, in as few requests as possible"""
+        get_order_book = getattr(self.executor, 'get_order_book', None)
+        if callable(get_order_book):
+            book = get_order_book() or []
+            return {str(record.get('orderId')): record for record in book}
+
+        records = {}
+        for order_id in order_ids:
+            response = self.executor.get_order_status(order_id)
+            data = response.get('data') if response else None
+            if isinstance(data, list):
+                data = data[0] if data else None
+            if data:
+                records[order_id] = data
+        return records
+
+    @staticmethod
+    def _apply(ticket, record):
+        filled = record.get('filledQty')
+        if filled is not None and int(filled) != ticket.filled_qty:
+            ticket.filled_qty = int(filled)
+            if ticket.filled_qty < ticket.quantity:
+                logger.info("%s: %s/%s filled", ticket.symbol, ticket.filled_qty, ticket.quantity)
+        if record.get('averageTradedPrice'):
+            ticket.avg_price = float(record['averageTradedPrice'])
+        ticket.status = record.get('orderStatus', ticket.status)
+        if record.get('omsErrorDescription'):
+            ticket.error = record['omsErrorDescription']
+
+    def _finish(self, ticket, status):
+        ticket.status = status
+        if status == 'TRADED':
+            ticket.filled_qty = ticket.filled_qty or ticket.quantity
+            ticket.avg_price = ticket.avg_price or ticket.price
+            ticket.filled_at = time.perf_counter()
+            self.fill_latency.record((ticket.filled_at - ticket.submitted_at) * 1000)
+        elif ticket.filled_qty:
+            logger.warning("%s: order %s after a partial fill of %s/%s", ticket.symbol, status, ticket.filled_qty, ticket.quantity)
+        if ticket.filled_qty and self.risk is not None:
+            self.risk.on_fill(ticket.security_id, ticket.side, ticket.filled_qty, ticket.avg_price or ticket.price)
+        if ticket.accepted and self._on_order_done is not None:
+            self._on_order_done(ticket.security_id, ticket.side, ticket.quantity, ticket.filled_qty)
+        if not ticket.done.done():
+            ticket.done.set_result(ticket)
+
+    async def cancel_all(self):
+        """Cancel every open order except exits at once; returns the tickets once each is terminal"""
+        tickets = [ticket for ticket in self.pending.values() if not ticket.reduce_only]
+        cancel_order = getattr(self.executor, 'cancel_order', None)
+        if not tickets or not callable(cancel_order):
+            return tickets
+        logger.warning("Cancelling %s open order(s)", len(tickets))
+        await asyncio.gather(*(
+            asyncio.to_thread(cancel_order, ticket.order_id) for ticket in tickets
+        ), return_exceptions=True)
+        # Pick up the cancellations (and any last fills) now rather than on the next poll
+        try:
+            records = await asyncio.to_thread(self._fetch, [t.order_id for t in tickets])
+        except Exception as e:
+            logger.error("Order status poll failed: %s", e)
+            records = {}
+        for ticket in tickets:
+            record = records.get(ticket.order_id)
+            if record is not None:
+                self._apply(ticket, record)
+            if ticket.status in TERMINAL_STATUSES and self.pending.pop(ticket.order_id, None) is not None:
+                self._finish(ticket, ticket.status)
+        return await asyncio.gather(*(ticket.wait() for ticket in tickets))
+
+    def stats(self):
+        return {
+            'pending': len(self.pending),
+            'submit_to_ack': self.ack_latency.snapshot(),
+            'submit_to_fill': self.fill_latency.snapshot(),
+        }
+
+    async def close(self):
+        """Stop tracking; unresolved tickets resolve as TIMEOUT"""
+        if self._tracker is not None:
+            self._tracker.cancel()
+            await asyncio.gather(self._tracker, return_exceptions=True)
+        for order_id, ticket in list(self.pending.items()):
+            self.pending.pop(order_id)
+            self._finish(ticket, 'TIMEOUT')
@@ -1,29 +1,60 @@
 import logging
 import json
 import csv
+import itertools
+import threading
+import time
 from datetime import datetime, timezone
-from pathlib import Path
 from config.settings import config
+from execution.fill_model import TickVolatility
+from execution.paper_book import PaperBook
 
 logger = logging.getLogger(__name__)
 
 class PaperTrading:
-    """Paper trading engine for simulation"""
-    
-    def __init__(self):
-        self.positions = {}
-        self.trades = []
-        self.capital = 100000  # Starting virtual capital
-        
+    """
+    Paper trading engine for simulation.
+
+    Without a fill_model orders fill instantly at the price they carry.
+    With one, place_order waits the model's latency and fills at the
+    latest marked price plus spread and volatility slippage, in whole lots.
+    """
+
+    def __init__(self, capital=100000, save_trades=True, fill_model=None):
+        self.book = PaperBook()
+        self.fill_model = fill_model
+        self.volatility = TickVolatility()
+        self.capital = capital  # Starting virtual capital
+        self.save_trades = save_trades
+        self._order_seq = itertools.count(1)
+        self._lock = threading.Lock()  # orders arrive on worker threads, several at once for baskets
+        self._session = datetime.now().strftime('%Y%m%d_%H%M%S')
+
         # Ensure directories exist
-        config.TRADES_DIR.mkdir(parents=True, exist_ok=True)
-        config.PNL_DIR.mkdir(parents=True, exist_ok=True)
-    
+        if save_trades:
+            config.TRADES_DIR.mkdir(parents=True, exist_ok=True)
+            config.PNL_DIR.mkdir(parents=True, exist_ok=True)
+
     def place_order(self, security_id, symbol, price, quantity, order_type='BUY'):
         """Simulate order placement"""
         try:
-            order_id = f"PAPER_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{security_id}"
-            
+            order_id = f"PAPER_{self._session}_{next(self._order_seq)}"
+            if self.fill_model is not None:
+                time.sleep(self.fill_model.latency_ms / 1000)
+                mid = self.volatility.price(security_id) or price
+                price, quantity = self.fill_model.fill(
+                    order_type, mid, self.volatility.get(security_id), quantity
+                )
+                if not quantity:
+                    raise ValueError(f"Quantity is below one lot of {self.fill_model.lot_size}")
+            with self._lock:
+                fill = self.book.fill(order_id, security_id, symbol, order_type, price, quantity)
+
+            if order_type == 'BUY':
+                logger.info("💰 PAPER BUY: %s @ ₹%s x %s", symbol, price, quantity)
+            else:
+                logger.info("💸 PAPER SELL: %s @ ₹%s x %s (PnL ₹%.2f)", symbol, price, quantity, fill.realized)
+
             trade = {
                 'order_id': order_id,
                 'security_id': security_id,
@@ -31,87 +62,82 @@ class PaperTrading:
                 'order_type': order_type,
                 'price': price,
                 'quantity': quantity,
-                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'pnl': round(fill.realized, 2),
+                'timestamp': datetime.fromtimestamp(fill.timestamp, timezone.utc).isoformat(),
                 'status': 'COMPLETED'
             }
-            
-            if order_type == 'BUY':
-                # Add to positions
-                self.positions[order_id] = {
-                    'security_id': security_id,
-                    'symbol': symbol,
-                    'entry_price': price,
-                    'quantity': quantity,
-                    'entry_time': trade['timestamp']
-                }
-                logger.info(f"💰 PAPER BUY: {symbol} @ ₹{price} x {quantity}")
-            else:
-                # SELL - remove from positions
-                if order_id in self.positions:
-                    del self.positions[order_id]
-                logger.info(f"💸 PAPER SELL: {symbol} @ ₹{price} x {quantity}")
-            
-            self.trades.append(trade)
-            self._save_trade(trade)
-            
+            if self.save_trades:
+                with self._lock:
+                    self._save_trade(trade)
+
             return {
                 'status': 'success',
                 'order_id': order_id,
                 'data': trade
             }
-            
+
         except Exception as e:
-            logger.error(f"Error in paper trading: {str(e)}")
+            logger.error("Error in paper trading: %s", e)
             return {
                 'status': 'failure',
                 'error': str(e)
             }
-    
+
+    def update_price(self, security_id, ltp):
+        """Mark an open paper position to market"""
+        self.volatility.update(security_id, ltp)
+        with self._lock:
+            self.book.update_price(security_id, ltp)
+
+    @property
+    def positions(self):
+        """Open net positions by security ID"""
+        return self.book.open_positions()
+
+    @property
+    def trades(self):
+        """Every fill, oldest first"""
+        return self.book.fills
+
     def get_positions(self):
         """Get all active positions"""
         return self.positions
-    
+
     def get_trades(self):
         """Get all trades"""
         return self.trades
-    
+
     def _save_trade(self, trade):
         """Save trade to file"""
         try:
             today = datetime.now().strftime('%Y-%m-%d')
-            
+
             # Save as JSON
             json_file = config.TRADES_DIR / f'trades_{today}.json'
             trades_list = []
-            
+
             if json_file.exists():
                 with open(json_file, 'r') as f:
                     trades_list = json.load(f)
-            
+
             trades_list.append(trade)
-            
+
             with open(json_file, 'w') as f:
                 json.dump(trades_list, f, indent=2)
-            
+
             # Save as CSV
             csv_file = config.TRADES_DIR / f'trades_{today}.csv'
             file_exists = csv_file.exists()
-            
+
             with open(csv_file, 'a', newline='') as f:
                 writer = csv.DictWriter(f, fieldnames=trade.keys())
                 if not file_exists:
                     writer.writeheader()
                 writer.writerow(trade)
-            
+
         except Exception as e:
-            logger.error(f"Error saving trade: {str(e)}")
-    
+            logger.error("Error saving trade: %s", e)
+
     def calculate_pnl(self):
         """Calculate total PnL"""
-        total_pnl = 0
-        
-        for trade in self.trades:
-            if trade['order_type'] == 'SELL' and 'pnl' in trade:
-                total_pnl += trade['pnl']
-        
-        return total_pnl
\ No newline at end of file
+        return self.book.realized_pnl
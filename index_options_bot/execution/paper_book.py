@@ -0,0 +1,132 @@
+import time
+
+class Fill:
+    """One simulated execution"""
+
+    __slots__ = ('order_id', 'security_id', 'symbol', 'side', 'price', 'quantity', 'timestamp', 'realized')
+
+    def __init__(self, order_id, security_id, symbol, side, price, quantity, timestamp, realized=0.0):
+        self.order_id = order_id
+        self.security_id = security_id
+        self.symbol = symbol
+        self.side = side
+        self.price = price
+        self.quantity = quantity
+        self.timestamp = timestamp
+        self.realized = realized  # PnL this fill closed out
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+class BookPosition:
+    """Net position in one security"""
+
+    __slots__ = ('security_id', 'symbol', 'net_qty', 'avg_price', 'realized', 'last_price')
+
+    def __init__(self, security_id, symbol):
+        self.security_id = security_id
+        self.symbol = symbol
+        self.net_qty = 0  # > 0 long, < 0 short
+        self.avg_price = 0.0
+        self.realized = 0.0
+        self.last_price = None
+
+    @property
+    def unrealized(self):
+        if not self.net_qty or self.last_price is None:
+            return 0.0
+        return (self.last_price - self.avg_price) * self.net_qty
+
+    def apply(self, signed_qty, price):
+        """Net a fill into the position; returns the PnL it realized"""
+        realized = 0.0
+        if self.net_qty and (self.net_qty > 0) != (signed_qty > 0):
+            closed = min(abs(signed_qty), abs(self.net_qty))
+            direction = 1 if self.net_qty > 0 else -1
+            realized = (price - self.avg_price) * closed * direction
+            self.net_qty += closed * -direction
+            signed_qty += closed * direction
+            if not self.net_qty:
+                self.avg_price = 0.0
+        if signed_qty:
+            # Adding to (or flipping into) a position: weighted average entry
+            total = self.net_qty + signed_qty
+            self.avg_price = (self.avg_price * self.net_qty + price * signed_qty) / total
+            self.net_qty = total
+        self.realized += realized
+        self.last_price = price
+        return realized
+
+    def to_dict(self):
+        return {
+            'security_id': self.security_id,
+            'symbol': self.symbol,
+            'net_qty': self.net_qty,
+            'avg_price': round(self.avg_price, 4),
+            'last_price': self.last_price,
+            'realized': round(self.realized, 2),
+            'unrealized': round(self.unrealized, 2),
+        }
+
+class PaperBook:
+    """
+    Paper orders and net positions, indexed by order ID and security ID.
+
+    Fills are netted per security (weighted-average entry, realized PnL on
+    every reduction, flips carry the remainder). Realized and unrealized
+    totals are maintained as fills and prices arrive, and the set of open
+    securities is kept alongside, so PnL and open-position queries never
+    scan the fill history.
+    """
+
+    def __init__(self):
+        self.orders = {}
+        self.fills = []
+        self.positions = {}
+        self.realized_pnl = 0.0
+        self.unrealized_pnl = 0.0
+        self._open = {}
+
+    def fill(self, order_id, security_id, symbol, side, price, quantity, timestamp=None):
+        position = self.positions.get(security_id)
+        if position is None:
+            position = self.positions[security_id] = BookPosition(security_id, symbol)
+
+        before = position.unrealized
+        realized = position.apply(quantity if side == 'BUY' else -quantity, price)
+        self.realized_pnl += realized
+        self.unrealized_pnl += position.unrealized - before
+
+        if position.net_qty:
+            self._open[security_id] = position
+        else:
+            self._open.pop(security_id, None)
+
+        fill = Fill(order_id, security_id, symbol, side, price, quantity, timestamp or time.time(), realized)
+        self.orders[order_id] = fill
+        self.fills.append(fill)
+        return fill
+
+    def update_price(self, security_id, ltp):
+        """Mark an open position to market"""
+        position = self._open.get(security_id)
+        if position is None:
+            return
+        self.unrealized_pnl += (ltp - position.last_price) * position.net_qty
+        position.last_price = ltp
+
+    def order(self, order_id):
+        return self.orders.get(order_id)
+
+    def position(self, security_id):
+        return self.positions.get(security_id)
+
+    def open_positions(self):
+        return self._open
+
+    def is_open(self, security_id):
+        return security_id in self._open
+
+    @property
+    def total_pnl(self):
+        return self.realized_pnl + self.unrealized_pnl
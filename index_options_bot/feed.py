@@ -0,0 +1,52 @@
+# index_options_bot/feed.py
+
+import asyncio
+import logging
+import signal
+
+from config.settings import config
+from runtime import SharedQuoteTable, FeedPublisher
+from utils import DhanClient, setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """
+    Feed owner: the only process that polls Dhan for prices. Bot
+    processes started with SHARED_FEED=true read quotes from its
+    shared-memory table instead.
+    """
+    setup_logging('feed')
+    logger.info("Feed started")
+
+    config.validate()
+    dhan_client = DhanClient()
+    if not dhan_client.authenticate():
+        raise RuntimeError("Dhan authentication failed")
+
+    config.RUN_DIR.mkdir(parents=True, exist_ok=True)
+    table = SharedQuoteTable.create(
+        config.SHARED_FEED_NAME, config.SHARED_FEED_SLOTS, config.RUN_DIR / 'feed.lock'
+    )
+    publisher = FeedPublisher(
+        dhan_client, table,
+        poll_interval=config.POLLING_INTERVAL
+    )
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, publisher.stop)
+        await publisher.run()
+
+    try:
+        asyncio.run(run())
+    finally:
+        table.close()
+
+    logger.info("Feed stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+from .graph import Indicator, IndicatorGraph
+from .volatility import TrueRange, ATR, SuperTrend
+from .averages import EMA, VWAP
+from .momentum import RSI
+
+__all__ = ['Indicator', 'IndicatorGraph', 'TrueRange', 'ATR', 'SuperTrend', 'EMA', 'VWAP', 'RSI']
@@ -0,0 +1,70 @@
+import numpy as np
+
+from indicators.graph import Indicator
+from indicators.smoothing import Smoother, smooth
+from runtime.candles import IST_OFFSET
+
+class EMA(Indicator):
+    """Exponential moving average of one price field, seeded with its SMA"""
+
+    def __init__(self, period=20, source='close'):
+        super().__init__()
+        self.period = period
+        self.source = source
+        self.key = ('ema', period, source)
+        self._smoother = Smoother(period, 'ema')
+
+    def update(self, bar):
+        self.value = self._smoother.update(getattr(bar, self.source))
+
+    def compute(self, data, results):
+        return smooth(data[self.source], self.period, 'ema')
+
+class VWAP(Indicator):
+    """
+    Session VWAP of the typical price, reset at each IST trading day.
+
+    Index bars carry no volume; with zero session volume every bar is
+    weighted equally.
+    """
+
+    key = ('vwap',)
+
+    def __init__(self):
+        super().__init__()
+        self._session = None
+        self._pv = self._volume = self._price_sum = 0.0
+        self._bars = 0
+
+    def update(self, bar):
+        session = int((bar.start + IST_OFFSET) // 86400)
+        if session != self._session:
+            self._session = session
+            self._pv = self._volume = self._price_sum = 0.0
+            self._bars = 0
+        typical = (bar.high + bar.low + bar.close) / 3
+        self._pv += typical * bar.volume
+        self._volume += bar.volume
+        self._price_sum += typical
+        self._bars += 1
+        self.value = self._pv / self._volume if self._volume else self._price_sum / self._bars
+
+    def compute(self, data, results):
+        typical = (data['high'] + data['low'] + data['close']) / 3
+        volume = data['volume']
+        session = ((data['start'] + IST_OFFSET) // 86400).astype(np.int64)
+        new_session = np.ones(len(session), dtype=bool)
+        new_session[1:] = session[1:] != session[:-1]
+        group = np.cumsum(new_session) - 1
+        starts = np.flatnonzero(new_session)
+
+        def session_cumsum(x):
+            csum = np.cumsum(x)
+            offset = np.concatenate(([0.0], csum[starts[1:] - 1]))
+            return csum - offset[group]
+
+        pv = session_cumsum(typical * volume)
+        vol = session_cumsum(volume)
+        mean = session_cumsum(typical) / (np.arange(len(typical)) - starts[group] + 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(vol > 0, pv / vol, mean)
@@ -0,0 +1,81 @@
+import numpy as np
+
+class Indicator:
+    """
+    One node of an IndicatorGraph.
+
+    Subclasses set key (hashable, identifies the series: same key, same
+    values) and deps (indicators whose values they read), and implement
+    update(bar) for streaming and compute(data, results) for batch.
+    """
+
+    key = None
+    deps = ()
+
+    def __init__(self):
+        self.value = None
+
+    def update(self, bar):
+        raise NotImplementedError
+
+    def compute(self, data, results):
+        raise NotImplementedError
+
+class IndicatorGraph:
+    """
+    Indicators of one instrument, with shared intermediate series.
+
+    add() returns the graph's existing node when one with the same key is
+    already registered, and wires dependencies to those shared nodes, so
+    e.g. SuperTrend(7, 4) and ATR(7) both read the same True Range. Nodes
+    are kept in dependency order: update(bar) computes every series once
+    per bar, and batch() computes every series once over whole arrays.
+
+    Live trading streams bars through update(); batch() is for warm-up
+    checks and backtests. Several strategies on one instrument can share
+    a graph: a bar that does not start after the last one applied is
+    ignored, so each of them may feed the same bar.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+        self.last_start = None
+
+    def add(self, indicator):
+        existing = self.nodes.get(indicator.key)
+        if existing is not None:
+            return existing
+        indicator.deps = tuple(self.add(dep) for dep in indicator.deps)
+        self.nodes[indicator.key] = indicator
+        return indicator
+
+    def __getitem__(self, key):
+        return self.nodes[key]
+
+    def __contains__(self, key):
+        return key in self.nodes
+
+    def update(self, bar):
+        """Feed one closed bar (open/high/low/close/volume/start attributes); False if already applied"""
+        if self.last_start is not None and bar.start <= self.last_start:
+            return False
+        self.last_start = bar.start
+        for node in self.nodes.values():
+            node.update(bar)
+        return True
+
+    def batch(self, high, low, close, open=None, volume=None, start=None):
+        """Compute every series over arrays; returns {key: ndarray}"""
+        close = np.asarray(close, dtype=float)
+        data = {
+            'open': np.asarray(open if open is not None else close, dtype=float),
+            'high': np.asarray(high, dtype=float),
+            'low': np.asarray(low, dtype=float),
+            'close': close,
+            'volume': np.asarray(volume if volume is not None else np.zeros(len(close)), dtype=float),
+            'start': np.asarray(start if start is not None else np.zeros(len(close)), dtype=float),
+        }
+        results = {}
+        for key, node in self.nodes.items():
+            results[key] = node.compute(data, results)
+        return results
@@ -0,0 +1,34 @@
+import numpy as np
+
+from indicators.graph import Indicator
+from indicators.smoothing import Smoother, smooth
+
+class RSI(Indicator):
+    """Wilder's Relative Strength Index of the close"""
+
+    def __init__(self, period=14):
+        super().__init__()
+        self.period = period
+        self.key = ('rsi', period)
+        self._gain = Smoother(period, 'wilder')
+        self._loss = Smoother(period, 'wilder')
+        self._prev_close = None
+
+    def update(self, bar):
+        prev_close, self._prev_close = self._prev_close, bar.close
+        if prev_close is None:
+            return
+        change = bar.close - prev_close
+        gain = self._gain.update(max(change, 0.0))
+        loss = self._loss.update(max(-change, 0.0))
+        if gain is not None:
+            self.value = 100.0 if loss == 0 else 100.0 - 100.0 / (1.0 + gain / loss)
+
+    def compute(self, data, results):
+        change = np.full(len(data['close']), np.nan)
+        change[1:] = np.diff(data['close'])
+        gain = smooth(np.where(np.isnan(change), np.nan, np.maximum(change, 0.0)), self.period, 'wilder')
+        loss = smooth(np.where(np.isnan(change), np.nan, np.maximum(-change, 0.0)), self.period, 'wilder')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100.0 - 100.0 / (1.0 + gain / loss)
+        return np.where(loss == 0, 100.0, rsi)
@@ -0,0 +1,65 @@
+from collections import deque
+
+import numpy as np
+
+MODES = ('sma', 'wilder', 'ema')
+
+def alpha(period, mode):
+    return 1.0 / period if mode == 'wilder' else 2.0 / (period + 1)
+
+class Smoother:
+    """Streaming SMA / Wilder / EMA; recursive modes are seeded with the SMA"""
+
+    def __init__(self, period, mode='sma'):
+        if mode not in MODES:
+            raise ValueError(f"Unknown smoothing mode {mode!r}; expected one of {MODES}")
+        self.period = period
+        self.mode = mode
+        self.alpha = alpha(period, mode)
+        self.value = None
+        self._window = deque(maxlen=period)
+        self._sum = 0.0
+
+    def update(self, x):
+        if self.mode != 'sma' and self.value is not None:
+            self.value += self.alpha * (x - self.value)
+            return self.value
+
+        if len(self._window) == self.period:
+            self._sum -= self._window[0]
+        self._window.append(x)
+        self._sum += x
+        if len(self._window) == self.period:
+            self.value = self._sum / self.period
+        return self.value
+
+def smooth(x, period, mode='sma'):
+    """Batch counterpart of Smoother; NaN until the first full window"""
+    x = np.asarray(x, dtype=float)
+    out = np.full(len(x), np.nan)
+    valid = np.flatnonzero(~np.isnan(x))
+    if len(valid) == 0:
+        return out
+    first = valid[0]
+    values = x[first:]
+    if len(values) < period:
+        return out
+
+    if mode == 'sma':
+        csum = np.cumsum(np.insert(values, 0, 0.0))
+        out[first + period - 1:] = (csum[period:] - csum[:-period]) / period
+        return out
+    if mode not in MODES:
+        raise ValueError(f"Unknown smoothing mode {mode!r}; expected one of {MODES}")
+
+    # Recursive filter: inherently sequential, so one pass over plain floats
+    a = alpha(period, mode)
+    y = values[:period].mean()
+    out[first + period - 1] = y
+    tail = values[period:].tolist()
+    result = np.empty(len(tail))
+    for i, v in enumerate(tail):
+        y += a * (v - y)
+        result[i] = y
+    out[first + period:] = result
+    return out
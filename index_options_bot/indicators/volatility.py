@@ -0,0 +1,111 @@
+import numpy as np
+
+from indicators.graph import Indicator
+from indicators.smoothing import Smoother, smooth
+
+class TrueRange(Indicator):
+    """max(high - low, |high - prev close|, |low - prev close|)"""
+
+    key = ('tr',)
+
+    def __init__(self):
+        super().__init__()
+        self._prev_close = None
+
+    def update(self, bar):
+        if self._prev_close is None:
+            self.value = bar.high - bar.low
+        else:
+            self.value = max(bar.high - bar.low, abs(bar.high - self._prev_close), abs(bar.low - self._prev_close))
+        self._prev_close = bar.close
+
+    def compute(self, data, results):
+        high, low, close = data['high'], data['low'], data['close']
+        tr = high - low
+        if len(close) > 1:
+            prev_close = close[:-1]
+            tr[1:] = np.maximum.reduce([tr[1:], np.abs(high[1:] - prev_close), np.abs(low[1:] - prev_close)])
+        return tr
+
+class ATR(Indicator):
+    """Average True Range; mode is 'sma', 'wilder' or 'ema'"""
+
+    def __init__(self, period=14, mode='sma'):
+        super().__init__()
+        self.period = period
+        self.mode = mode
+        self.key = ('atr', period, mode)
+        self.deps = (TrueRange(),)
+        self._smoother = Smoother(period, mode)
+
+    def update(self, bar):
+        self.value = self._smoother.update(self.deps[0].value)
+
+    def compute(self, data, results):
+        return smooth(results[TrueRange.key], self.period, self.mode)
+
+class SuperTrend(Indicator):
+    """
+    SuperTrend line and direction (1 up, -1 down).
+
+    Bands are hl2 ± multiplier × ATR; a final band only moves against the
+    trend when the previous close broke it. No value for the first
+    `period` bars.
+    """
+
+    def __init__(self, period=7, multiplier=4, atr_mode='sma'):
+        super().__init__()
+        self.period = period
+        self.multiplier = multiplier
+        self.key = ('supertrend', period, multiplier, atr_mode)
+        self.deps = (ATR(period, atr_mode),)
+        self.direction = None
+        self.bars = 0
+        self.final_ub = 0.0
+        self.final_lb = 0.0
+        self._prev_close = None
+
+    def update(self, bar):
+        index = self.bars
+        self.bars += 1
+        prev_close, self._prev_close = self._prev_close, bar.close
+        atr = self.deps[0].value
+        if index < self.period or atr is None:
+            return
+
+        mid = (bar.high + bar.low) / 2
+        basic_ub = mid + self.multiplier * atr
+        basic_lb = mid - self.multiplier * atr
+        if basic_ub < self.final_ub or prev_close > self.final_ub:
+            self.final_ub = basic_ub
+        if basic_lb > self.final_lb or prev_close < self.final_lb:
+            self.final_lb = basic_lb
+
+        if bar.close <= self.final_ub:
+            self.value, self.direction = self.final_ub, -1
+        else:
+            self.value, self.direction = self.final_lb, 1
+
+    def compute(self, data, results):
+        """Returns (line, direction); both 0 before the first value"""
+        high, low, close = data['high'], data['low'], data['close']
+        atr = results[self.deps[0].key]
+        mid = (high + low) / 2
+        basic_ub = (mid + self.multiplier * atr).tolist()
+        basic_lb = (mid - self.multiplier * atr).tolist()
+        closes = close.tolist()
+
+        n = len(closes)
+        line = [0.0] * n
+        direction = [0] * n
+        final_ub = final_lb = 0.0
+        for i in range(self.period, n):
+            if basic_ub[i] < final_ub or closes[i - 1] > final_ub:
+                final_ub = basic_ub[i]
+            if basic_lb[i] > final_lb or closes[i - 1] < final_lb:
+                final_lb = basic_lb[i]
+            if closes[i] <= final_ub:
+                line[i], direction[i] = final_ub, -1
+            else:
+                line[i], direction[i] = final_lb, 1
+        return np.array(line), np.array(direction)
@@ -1,102 +1,150 @@
 # index_options_bot/main.py
 
-from index_options_bot.strategy.supertrend import check_signal
-from index_options_bot.positions.position import Position
-from index_options_bot.positions.position_manager import PositionManager
-from index_options_bot.execution.paper_executor import PaperExecutor
-from index_options_bot.risk.risk_manager import RiskManager
-from index_options_bot.pnl.trade_logger import TradeLogger
-from index_options_bot.pnl.daily_summary import DailyPnLSummary
-from index_options_bot.utils.market_time import is_market_open
-
-
-# ===== CONFIG =====
-INITIAL_SL_POINTS = 10
-TRAIL_SL_POINTS = 5
-QTY = 50
-
-MAX_TRADES_PER_DAY = 3
-MAX_LOSS_PER_DAY = 2000
-COOLDOWN_MINUTES = 10
-# ==================
-
-
-def main():
-    print("[SYSTEM] Bot started")
-
-    if not is_market_open():
-        print("[SYSTEM] Market is closed")
-        return
-
-    executor = PaperExecutor()
-
-    risk_manager = RiskManager(
-        max_trades_per_day=MAX_TRADES_PER_DAY,
-        max_loss_per_day=MAX_LOSS_PER_DAY,
-        cooldown_minutes=COOLDOWN_MINUTES
+import asyncio
+import logging
+
+from config.settings import config
+from utils.ipc import BotChannel
+from utils.log_pipeline import setup_logging
+
+# Everything else (pandas, numpy, dhanhq behind it) is imported by
+# build_runtime, after the config has been validated: a bad .env fails
+# fast, and `python -m startup_profile` shows where start-up time goes.
+
+logger = logging.getLogger(__name__)
+
+
+def build_strategy(period, multiplier, graph=None):
+    from strategy import SuperTrendStrategy, MultiTimeframeSuperTrendStrategy
+
+    if config.CONFIRM_TIMEFRAMES:
+        return MultiTimeframeSuperTrendStrategy(
+            period=period,
+            multiplier=multiplier,
+            base_timeframe=config.CANDLE_TIMEFRAME,
+            confirm_timeframes=config.CONFIRM_TIMEFRAMES,
+            graph=graph
+        )
+    return SuperTrendStrategy(period=period, multiplier=multiplier, graph=graph)
+
+
+def build_runtime(channel):
+    from execution import PaperTrading, LiveTrading, FillModel, OrderPipeline, KillSwitch
+    from positions.position_manager import PositionManager
+    from risk import RiskEngine, PositionSizer, FundsCache
+    from pnl.trade_logger import TradeLogger
+    from pnl.daily_summary import DailyPnLSummary
+    from runtime import TradingRuntime, StrategySlot, SharedQuoteTable, SharedFeedClient, HistoryWarmup
+    from indicators import IndicatorGraph
+    from utils import DhanClient, InstrumentManager, CandleStore
+    from utils.history_downloader import RateLimiter
+
+    dhan_client = DhanClient()
+    if not dhan_client.authenticate():
+        raise RuntimeError("Dhan authentication failed")
+
+    instruments = InstrumentManager(dhan_client)
+    instruments.load_instruments()
+
+    # Prices come from the shared feed process if one is configured; it may
+    # still be authenticating, so wait for its first poll
+    price_source = dhan_client
+    if config.SHARED_FEED:
+        price_source = SharedFeedClient(SharedQuoteTable.attach(
+            config.SHARED_FEED_NAME, config.RUN_DIR / 'feed.lock',
+            timeout=config.SHARED_FEED_WAIT, max_age=max(5.0, 3 * config.POLLING_INTERVAL)
+        ))
+
+    # Shared with every bot process and the API server; latched until released
+    kill_switch = KillSwitch(config.RUN_DIR / 'kill_switch')
+    if kill_switch.engaged:
+        logger.warning("Kill switch is engaged (%s); release it to trade", kill_switch.state()['reason'])
+
+    if config.TRADING_MODE == 'live':
+        executor = LiveTrading(dhan_client, kill_switch=kill_switch)
+    else:
+        fill_model = None
+        if config.PAPER_FILL_MODEL:
+            fill_model = FillModel(
+                latency_ms=config.PAPER_LATENCY_MS,
+                spread_pct=config.PAPER_SPREAD_PCT,
+                slippage_factor=config.PAPER_SLIPPAGE_FACTOR,
+                lot_size=config.LOT_SIZE
+            )
+        executor = PaperTrading(fill_model=fill_model)
+
+    # One slot per (underlying, SuperTrend config); all share one market-data
+    # bus, and the slots of an underlying share one indicator graph
+    graphs = {}
+    slots = [
+        StrategySlot(
+            underlying,
+            build_strategy(period, multiplier, graph=graphs.setdefault(underlying, IndicatorGraph())),
+            name=f"{underlying} ST({period},{multiplier:g})"
+        )
+        for underlying in config.INDEX_NAMES
+        for period, multiplier in config.SUPERTREND_CONFIGS
+    ]
+
+    # Every rule in risk/rules.py, checked inline before each order; the daily
+    # limits come from .env (the dashboard's settings), the rest from rules.py
+    funds = FundsCache(dhan_client) if config.TRADING_MODE == 'live' else None
+    available_margin = funds.get() if funds is not None else None
+    risk_manager = RiskEngine(
+        capital=config.TRADING_CAPITAL,
+        max_trades_per_day=config.MAX_TRADES_PER_DAY,
+        max_loss_per_day=config.MAX_LOSS_PER_DAY,
+        max_open_positions=config.MAX_OPEN_POSITIONS or None,
+        max_exposure=config.MAX_EXPOSURE or None,
+        available_margin=available_margin
     )
 
-    trade_logger = TradeLogger()
-    daily_summary = DailyPnLSummary()
-
-    # 1️⃣ Signal
-    signal = check_signal()
-    if not signal:
-        print("[SYSTEM] No trade signal")
-        return
-
-    # 2️⃣ Risk check (includes cool-off)
-    if not risk_manager.can_take_trade():
-        print("[SYSTEM] Trade blocked by risk rules")
-        return
-
-    symbol = signal["symbol"]
-    print(f"[SIGNAL] BUY signal for {symbol}")
-
-    # 3️⃣ Entry
-    order = executor.buy(symbol=symbol, qty=QTY)
-    entry_price = order["price"]
-
-    risk_manager.register_trade()
-
-    position = Position(
-        symbol=symbol,
-        qty=QTY,
-        entry_price=entry_price,
-        sl=entry_price - INITIAL_SL_POINTS
-    )
-
-    # 4️⃣ Manage position
-    position_manager = PositionManager(
+    return TradingRuntime(
+        price_source=price_source,
+        instruments=instruments,
         executor=executor,
-        trail_points=TRAIL_SL_POINTS,
-        poll_interval=1
+        orders=OrderPipeline(
+            executor, limiter=RateLimiter(config.ORDER_RATE_LIMIT), risk=risk_manager, kill_switch=kill_switch
+        ),
+        kill_switch=kill_switch,
+        slots=slots,
+        risk_manager=risk_manager,
+        position_manager=PositionManager(trail_percent=config.TRAILING_STOP_PERCENT),
+        trade_logger=TradeLogger(),
+        daily_summary=DailyPnLSummary(),
+        channel=channel,
+        sizer=PositionSizer(
+            capital=config.TRADING_CAPITAL,
+            lot_size=config.LOT_SIZE,
+            max_loss_per_day=config.MAX_LOSS_PER_DAY,
+            atr_multiplier=config.SIZING_ATR_MULTIPLIER,
+            max_lots=config.MAX_LOTS or None,
+            funds=funds
+        ),
+        warmup=HistoryWarmup(
+            CandleStore(config.CANDLES_DIR),
+            broker=dhan_client,
+            timeframe_minutes=config.CANDLE_TIMEFRAME,
+            bars=config.WARMUP_BARS
+        )
     )
 
-    final_position = position_manager.manage(position)
 
-    # 5️⃣ PnL
-    pnl = (final_position.exit_price - entry_price) * QTY
-    print(f"[PNL] Trade PnL: {pnl}")
+def main():
+    setup_logging('bot')
+    logger.info("Bot started")
 
-    # 6️⃣ Update systems
-    risk_manager.register_exit(pnl, final_position.exit_reason)
+    config.validate()
 
-    trade_logger.log_trade(
-        symbol=symbol,
-        qty=QTY,
-        entry_price=entry_price,
-        exit_price=final_position.exit_price,
-        pnl=pnl,
-        exit_reason=final_position.exit_reason
-    )
+    channel = BotChannel()
+    channel.start()
+    try:
+        runtime = build_runtime(channel)
+        asyncio.run(runtime.run())
+    finally:
+        channel.close()
 
-    daily_summary.update(pnl)
-
-    print(
-        f"[RESULT] Exit Reason: {final_position.exit_reason}, "
-        f"Exit Price: {final_position.exit_price}"
-    )
+    logger.info("Bot stopped")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,12 @@
+from utils.lazy import lazy_exports
+
+# Submodules load on first use of a name (see utils/lazy.py)
+_EXPORTS = {
+    'OptionChain': 'chain',
+    'ChainSnapshot': 'chain',
+    'years_to_expiry': 'chain',
+    'black_scholes': None,
+}
+
+__all__ = list(_EXPORTS)
+__getattr__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,92 @@
+import numpy as np
+
+SQRT_2PI = np.sqrt(2 * np.pi)
+
+def norm_cdf(x):
+    """
+    Standard normal CDF, vectorized (|error| < 1.2e-7).
+
+    Chebyshev fit of erfc (Numerical Recipes erfcc); numpy has no erf
+    and scipy is not a dependency.
+    """
+    z = np.abs(x) / np.sqrt(2)
+    t = 1.0 / (1.0 + 0.5 * z)
+    erfc = t * np.exp(
+        -z * z - 1.26551223 + t * (1.00002368 + t * (0.37409196 + t * (0.09678418 + t * (-0.18628806
+        + t * (0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (-0.82215223 + t * 0.17087277))))))))
+    )
+    return np.where(x >= 0, 1.0 - 0.5 * erfc, 0.5 * erfc)
+
+def norm_pdf(x):
+    return np.exp(-0.5 * x * x) / SQRT_2PI
+
+def _d1_d2(spot, strike, t, rate, sigma):
+    vol_t = sigma * np.sqrt(t)
+    d1 = (np.log(spot / strike) + (rate + 0.5 * sigma * sigma) * t) / vol_t
+    return d1, d1 - vol_t
+
+def price(spot, strike, t, rate, sigma, is_call):
+    """Black-Scholes premium; is_call is a boolean array (False = put)"""
+    d1, d2 = _d1_d2(spot, strike, t, rate, sigma)
+    discount = strike * np.exp(-rate * t)
+    call = spot * norm_cdf(d1) - discount * norm_cdf(d2)
+    put = discount * norm_cdf(-d2) - spot * norm_cdf(-d1)
+    return np.where(is_call, call, put)
+
+def greeks(spot, strike, t, rate, sigma, is_call):
+    """
+    (delta, gamma, theta, vega) per option.
+
+    theta is per calendar day, vega per 1 vol point (0.01).
+    """
+    d1, d2 = _d1_d2(spot, strike, t, rate, sigma)
+    pdf = norm_pdf(d1)
+    sqrt_t = np.sqrt(t)
+    discount = strike * np.exp(-rate * t)
+
+    delta = np.where(is_call, norm_cdf(d1), norm_cdf(d1) - 1.0)
+    gamma = pdf / (spot * sigma * sqrt_t)
+    decay = -spot * pdf * sigma / (2 * sqrt_t)
+    theta = np.where(
+        is_call,
+        decay - rate * discount * norm_cdf(d2),
+        decay + rate * discount * norm_cdf(-d2)
+    ) / 365.0
+    vega = spot * pdf * sqrt_t / 100.0
+    return delta, gamma, theta, vega
+
+def implied_vol(premium, spot, strike, t, rate, is_call, initial=0.2, tol=1e-6, max_iter=50,
+                low=1e-4, high=5.0):
+    """
+    Implied volatility for every option at once by Newton's method.
+
+    Each iteration prices the whole chain in one vectorized pass; options
+    converge independently and drop out of the update. Premiums outside
+    the no-arbitrage bounds, or that do not converge, give NaN.
+    """
+    premium = np.asarray(premium, dtype=float)
+    spot = np.broadcast_to(np.asarray(spot, dtype=float), premium.shape)
+    strike = np.asarray(strike, dtype=float)
+    is_call = np.asarray(is_call, dtype=bool)
+
+    discount = strike * np.exp(-rate * t)
+    intrinsic = np.where(is_call, np.maximum(spot - discount, 0.0), np.maximum(discount - spot, 0.0))
+    upper = np.where(is_call, spot, discount)
+    valid = (premium > intrinsic) & (premium < upper) & (t > 0)
+
+    sigma = np.full(premium.shape, initial)
+    active = valid.copy()
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        idx = np.flatnonzero(active)
+        s = sigma[idx]
+        d1, _ = _d1_d2(spot[idx], strike[idx], t, rate, s)
+        diff = price(spot[idx], strike[idx], t, rate, s, is_call[idx]) - premium[idx]
+        vega = spot[idx] * norm_pdf(d1) * np.sqrt(t)
+        step = np.divide(diff, vega, out=np.zeros_like(diff), where=vega > 1e-12)
+        sigma[idx] = np.clip(s - step, low, high)
+        active[idx] = np.abs(diff) > tol * np.maximum(premium[idx], 1.0)
+
+    result = np.where(valid & ~active, sigma, np.nan)
+    return result
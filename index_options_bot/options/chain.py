@@ -0,0 +1,134 @@
+import logging
+import time
+from datetime import datetime
+
+import numpy as np
+
+from config.settings import config
+from options import black_scholes
+from runtime.candles import IST
+from utils.instruments import INDEX_SECURITY_IDS
+
+logger = logging.getLogger(__name__)
+
+YEAR_SECONDS = 365 * 86400
+
+def years_to_expiry(expiry, now=None):
+    """Year fraction until 15:30 IST on the expiry date"""
+    close = datetime.strptime(f"{expiry} 15:30", '%Y-%m-%d %H:%M').replace(tzinfo=IST)
+    return max(close.timestamp() - (now or time.time()), 0.0) / YEAR_SECONDS
+
+class ChainSnapshot:
+    """
+    Quotes, implied volatility and Greeks for one expiry, as parallel arrays.
+
+    Rows are (strike, option_type) pairs sorted by strike, calls first.
+    """
+
+    def __init__(self, underlying, expiry, spot, t, rate, strikes, option_types, security_ids, ltp):
+        self.underlying = underlying
+        self.expiry = expiry
+        self.spot = spot
+        self.t = t
+        self.rate = rate
+        self.strikes = np.asarray(strikes, dtype=float)
+        self.option_types = np.asarray(option_types)
+        self.security_ids = np.asarray(security_ids)
+        self.ltp = np.asarray(ltp, dtype=float)
+        self.is_call = self.option_types == 'CE'
+
+        self.iv = black_scholes.implied_vol(self.ltp, spot, self.strikes, t, rate, self.is_call)
+        self.delta, self.gamma, self.theta, self.vega = black_scholes.greeks(
+            spot, self.strikes, t, rate, self.iv, self.is_call
+        )
+
+    def __len__(self):
+        return len(self.strikes)
+
+    def _pick(self, option_type, values, target):
+        mask = (self.option_types == option_type) & ~np.isnan(values)
+        if not mask.any():
+            return None
+        idx = np.flatnonzero(mask)
+        return self.row(idx[np.argmin(np.abs(values[idx] - target))])
+
+    def select_by_delta(self, target, option_type='CE'):
+        """Row whose delta is closest to target (use a negative target for puts)"""
+        return self._pick(option_type, self.delta, target)
+
+    def select_by_premium(self, target, option_type='CE'):
+        """Row whose last price is closest to target"""
+        return self._pick(option_type, self.ltp, target)
+
+    def row(self, i):
+        return {
+            'security_id': self.security_ids[i].item(),
+            'strike': self.strikes[i].item(),
+            'option_type': str(self.option_types[i]),
+            'ltp': self.ltp[i].item(),
+            'iv': self.iv[i].item(),
+            'delta': self.delta[i].item(),
+            'gamma': self.gamma[i].item(),
+            'theta': self.theta[i].item(),
+            'vega': self.vega[i].item(),
+        }
+
+    def to_records(self):
+        return [self.row(i) for i in range(len(self))]
+
+class OptionChain:
+    """
+    Builds ChainSnapshots for ATM±N strikes of one underlying.
+
+    The strike/security-ID table for an expiry is cut from the instrument
+    master once and reused; each snapshot is one batched quote request for
+    the index and every option, then one vectorized IV/Greeks solve.
+    """
+
+    def __init__(self, instruments, price_source, underlying, strikes_each_side=10,
+                 rate=config.RISK_FREE_RATE):
+        self.instruments = instruments
+        self.price_source = price_source
+        self.underlying = underlying
+        self.strikes_each_side = strikes_each_side
+        self.rate = rate
+        self.index_key = ('IDX_I', INDEX_SECURITY_IDS.get(underlying))
+        self._tables = {}
+
+    def _table(self, expiry):
+        table = self._tables.get(expiry)
+        if table is None:
+            options = self.instruments.filter_options(self.underlying)
+            options = options[options['expiry'] == expiry].sort_values(['strike', 'option_type'])
+            table = (
+                options['strike'].to_numpy(dtype=float),
+                options['option_type'].to_numpy(),
+                options['security_id'].to_numpy(),
+            )
+            self._tables[expiry] = table
+        return table
+
+    def snapshot(self, expiry=None, spot=None, now=None):
+        expiry = expiry or self.instruments.get_nearest_expiry(self.underlying)
+        strikes, option_types, security_ids = self._table(expiry)
+        if spot is None:
+            spot = self.price_source.get_ltp_batch([self.index_key]).get(self.index_key)
+        if not spot:
+            logger.warning("No %s price; cannot build option chain", self.underlying)
+            return None
+
+        # ATM ± N listed strikes
+        unique = np.unique(strikes)
+        atm = int(np.argmin(np.abs(unique - spot)))
+        lo = unique[max(atm - self.strikes_each_side, 0)]
+        hi = unique[min(atm + self.strikes_each_side, len(unique) - 1)]
+        rows = np.flatnonzero((strikes >= lo) & (strikes <= hi))
+
+        keys = [('NSE_FNO', security_ids[i]) for i in rows]
+        quotes = self.price_source.get_ltp_batch(keys)
+        ltp = np.array([quotes.get(key, np.nan) for key in keys], dtype=float)
+
+        return ChainSnapshot(
+            self.underlying, expiry, spot, years_to_expiry(expiry, now), self.rate,
+            strikes[rows], option_types[rows], security_ids[rows], ltp
+        )
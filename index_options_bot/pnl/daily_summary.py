@@ -1,9 +1,12 @@
 # index_options_bot/pnl/daily_summary.py
 
 import csv
+import logging
 import os
 from datetime import date
 
+logger = logging.getLogger(__name__)
+
 
 class DailyPnLSummary:
     """
@@ -48,4 +51,4 @@ class DailyPnLSummary:
             writer.writerow(header)
             writer.writerows(data)
 
-        print("[PNL] Daily PnL updated")
+        logger.info("Daily PnL updated")
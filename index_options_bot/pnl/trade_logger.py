@@ -1,9 +1,12 @@
 # index_options_bot/pnl/trade_logger.py
 
 import csv
+import logging
 import os
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 
 class TradeLogger:
     """
@@ -48,4 +51,7 @@ class TradeLogger:
                 exit_reason
             ])
 
-        print("[PNL] Trade logged to CSV")
+        logger.info("Trade logged to CSV", extra={
+            'event': 'trade', 'symbol': symbol, 'qty': qty, 'entry_price': entry_price,
+            'exit_price': exit_price, 'pnl': pnl, 'exit_reason': exit_reason
+        })
@@ -8,17 +8,53 @@ class Position:
     Just state.
     """
 
-    def __init__(self, symbol, qty, entry_price, sl):
+    def __init__(self, symbol, qty, entry_price, sl, security_id=None, option_type=None, slot=None):
         self.symbol = symbol
         self.qty = qty
         self.entry_price = entry_price
         self.sl = sl
+        self.security_id = security_id
+        self.option_type = option_type
+        self.slot = slot  # strategy slot that owns this trade
 
         self.is_open = True
-        self.exit_price = None
+        self.last_price = entry_price
+        self.exit_price = None  # average over every exit fill
         self.exit_reason = None
+        self.exited_qty = 0
+        self.realized_pnl = 0.0
 
     def close(self, price, reason):
         self.is_open = False
-        self.exit_price = price
+        self.last_price = price
+        self.exit_price = price if self.exit_price is None else self.exit_price
         self.exit_reason = reason
+
+    def fill_exit(self, qty, price, reason):
+        """Book an exit fill of qty at price; the position closes once nothing is left open"""
+        exited_value = (self.exit_price or 0) * self.exited_qty + price * qty
+        self.realized_pnl += (price - self.entry_price) * qty
+        self.exited_qty += qty
+        self.qty -= qty
+        self.exit_price = exited_value / self.exited_qty
+        if self.qty <= 0:
+            self.close(price, reason)
+
+    @property
+    def pnl(self):
+        return self.realized_pnl + (self.last_price - self.entry_price) * self.qty
+
+    def to_dict(self):
+        return {
+            "symbol": self.symbol,
+            "security_id": self.security_id,
+            "option_type": self.option_type,
+            "slot": self.slot,
+            "qty": self.qty,
+            "exited_qty": self.exited_qty,
+            "entry_price": self.entry_price,
+            "sl": self.sl,
+            "last_price": self.last_price,
+            "pnl": self.pnl,
+            "is_open": self.is_open
+        }
@@ -1,54 +1,71 @@
 # index_options_bot/positions/position_manager.py
 
-import time
+import logging
 
-from index_options_bot.risk.trailing_sl import TrailingSL
-from index_options_bot.utils.dhan_client import get_ltp
-from index_options_bot.utils.market_time import is_market_open
+from risk.trailing_sl import TrailingSL
+
+logger = logging.getLogger(__name__)
 
 
 class PositionManager:
     """
-    Owns the FULL lifecycle of a position:
+    Owns the FULL lifecycle of open positions:
     ENTRY already done
     → Monitor price
     → Update trailing SL
-    → Exit when SL hits
+    → Flag exit when SL hits
+
+    Tick-driven: the runtime feeds prices in, orders go out through the
+    runtime, so nothing here blocks or sleeps.
     """
 
-    def __init__(self, executor, trail_points, poll_interval=1):
-        self.executor = executor
-        self.trailing_sl = TrailingSL(trail_points)
-        self.poll_interval = poll_interval
+    def __init__(self, trail_percent):
+        self.trail_percent = trail_percent
+        self.positions = {}
+        self._trailing = {}
 
-    def manage(self, position):
-        print(f"[POSITION] Started managing {position.symbol}")
+    @staticmethod
+    def _key(position):
+        # Several strategy slots may hold the same contract independently
+        return (position.slot, position.security_id or position.symbol)
 
-        while position.is_open and is_market_open():
-            ltp = get_ltp(position.symbol)
+    def open(self, position):
+        key = self._key(position)
+        self.positions[key] = position
+        self._trailing[key] = TrailingSL(position.entry_price * self.trail_percent / 100)
+        logger.info("Started managing %s", position.symbol)
 
-            # Update trailing SL
-            new_sl = self.trailing_sl.update_sl(
-                ltp=ltp,
-                current_sl=position.sl
-            )
+    def remove(self, position):
+        key = self._key(position)
+        self.positions.pop(key, None)
+        self._trailing.pop(key, None)
 
-            if new_sl != position.sl:
-                print(f"[SL] {position.symbol} SL moved {position.sl} → {new_sl}")
-                position.sl = new_sl
+    def open_positions(self, slot=None):
+        if slot is None:
+            return list(self.positions.values())
+        return [p for p in self.positions.values() if p.slot == slot]
 
-            # Exit condition
-            if ltp <= position.sl:
-                print(f"[EXIT] SL hit for {position.symbol} at {ltp}")
+    def on_price(self, position, ltp):
+        """
+        Apply a new price. Returns True when the SL is hit and the
+        position should be exited.
+        """
+        key = self._key(position)
+        position.last_price = ltp
 
-                self.executor.exit(
-                    symbol=position.symbol,
-                    qty=position.qty
-                )
+        # Update trailing SL
+        new_sl = self._trailing[key].update_sl(
+            ltp=ltp,
+            current_sl=position.sl
+        )
 
-                position.close(price=ltp, reason="TRAILING_SL")
-                break
+        if new_sl != position.sl:
+            logger.info("%s SL moved %s → %s", position.symbol, position.sl, new_sl)
+            position.sl = new_sl
 
-            time.sleep(self.poll_interval)
+        # Exit condition
+        if ltp <= position.sl:
+            logger.info("SL hit for %s at %s", position.symbol, ltp)
+            return True
 
-        return position
+        return False
@@ -1,3 +1,14 @@
-from .risk_manager import RiskManager
+from utils.lazy import lazy_exports
 
-__all__ = ['RiskManager']
\ No newline at end of file
+# Submodules load on first use of a name (see utils/lazy.py)
+_EXPORTS = {
+    'RiskManager': 'risk_manager',
+    'RiskEngine': 'risk_engine',
+    'RiskDecision': 'risk_engine',
+    'PortfolioRisk': 'portfolio',
+    'PositionSizer': 'position_sizer',
+    'FundsCache': 'position_sizer',
+}
+
+__all__ = list(_EXPORTS)
+__getattr__ = lazy_exports(__name__, _EXPORTS)
\ No newline at end of file
@@ -0,0 +1,154 @@
+# index_options_bot/risk/portfolio.py
+
+import logging
+
+from risk import rules
+
+logger = logging.getLogger(__name__)
+
+
+class _Holding:
+    """Aggregate of every open position in one contract"""
+
+    __slots__ = ("underlying", "qty", "cost", "last_price", "delta", "gamma", "index_ref")
+
+    def __init__(self, underlying, price):
+        self.underlying = underlying
+        self.qty = 0
+        self.cost = 0.0        # sum of entry price * qty
+        self.last_price = price
+        self.delta = 0.0       # per unit, at index_ref
+        self.gamma = 0.0       # per unit
+        self.index_ref = None
+
+    @property
+    def unrealized(self):
+        return self.last_price * self.qty - self.cost
+
+
+class PortfolioRisk:
+    """
+    Live mark-to-market of all open positions.
+
+    Positions in the same contract are aggregated, so an option tick is
+    one multiply-add on the running unrealized PnL, and an index tick
+    moves the underlying's net delta by its net gamma; a contract's own
+    delta is only derived (entry delta + gamma * index move) when its
+    size changes. Both ticks are O(1) however many positions are open.
+    Margin used (premium paid) changes only on open/close. When realized
+    plus unrealized PnL falls to -max_loss_per_day, on_stop_out(total_pnl)
+    is called once and the portfolio stays stopped out for the day.
+    """
+
+    def __init__(self, max_loss_per_day=rules.MAX_LOSS_PER_DAY, on_stop_out=None):
+        self.max_loss_per_day = max_loss_per_day
+        self.on_stop_out = on_stop_out
+        self.holdings = {}
+        self.realized = 0.0
+        self.unrealized = 0.0
+        self.margin_used = 0.0
+        self.net_delta = {}
+        self.net_gamma = {}
+        self.index_price = {}
+        self.stopped_out = False
+        self.ticks = 0
+
+    @property
+    def total_pnl(self):
+        return self.realized + self.unrealized
+
+    def open(self, security_id, underlying, qty, price, delta=0.0, gamma=0.0):
+        holding = self.holdings.get(security_id)
+        if holding is None:
+            holding = self.holdings[security_id] = _Holding(underlying, price)
+        before = holding.unrealized
+        # New legs of the same contract share its current greeks
+        self.net_delta[underlying] = self.net_delta.get(underlying, 0.0) - self._delta(holding) * holding.qty
+        self.net_gamma[underlying] = self.net_gamma.get(underlying, 0.0) - holding.gamma * holding.qty
+        holding.delta, holding.gamma = delta, gamma
+        holding.index_ref = self.index_price.get(underlying)
+        holding.qty += qty
+        holding.cost += price * qty
+        self.net_delta[underlying] += holding.delta * holding.qty
+        self.net_gamma[underlying] += holding.gamma * holding.qty
+        self.unrealized += holding.unrealized - before
+        self.margin_used += price * qty
+        self._check()
+
+    def close(self, security_id, qty, price):
+        """Realize qty of a contract at price; returns the realized PnL"""
+        holding = self.holdings.get(security_id)
+        if holding is None or not holding.qty:
+            return 0.0
+        qty = min(qty, holding.qty)
+        avg = holding.cost / holding.qty
+        before = holding.unrealized
+        u = holding.underlying
+
+        self.net_delta[u] -= self._delta(holding) * qty
+        self.net_gamma[u] -= holding.gamma * qty
+        holding.qty -= qty
+        holding.cost -= avg * qty
+        self.margin_used -= avg * qty
+        pnl = (price - avg) * qty
+        self.realized += pnl
+        if holding.qty:
+            self.unrealized += holding.unrealized - before
+        else:
+            self.unrealized -= before
+            del self.holdings[security_id]
+        self._check()
+        return pnl
+
+    def on_price(self, security_id, ltp):
+        """Option tick"""
+        holding = self.holdings.get(security_id)
+        if holding is None:
+            return
+        self.ticks += 1
+        self.unrealized += (ltp - holding.last_price) * holding.qty
+        holding.last_price = ltp
+        self._check()
+
+    def on_index(self, underlying, ltp):
+        """Index tick: carry each contract's delta along with the move"""
+        last = self.index_price.get(underlying)
+        self.index_price[underlying] = ltp
+        if last is None:
+            # First index price: it is the reference for contracts opened before it
+            for holding in self.holdings.values():
+                if holding.underlying == underlying and holding.index_ref is None:
+                    holding.index_ref = ltp
+            return
+        gamma = self.net_gamma.get(underlying)
+        if not gamma:
+            return
+        self.net_delta[underlying] += gamma * (ltp - last)
+
+    def _delta(self, holding):
+        """Per-unit delta now: entry delta carried along by gamma"""
+        index = self.index_price.get(holding.underlying)
+        if holding.index_ref is None or index is None:
+            return holding.delta
+        return holding.delta + holding.gamma * (index - holding.index_ref)
+
+    def _check(self):
+        if not self.stopped_out and self.realized + self.unrealized <= -self.max_loss_per_day:
+            self._stop()
+
+    def _stop(self):
+        self.stopped_out = True
+        logger.critical("Portfolio stop-out: PnL %.2f <= -%s", self.total_pnl, self.max_loss_per_day)
+        if self.on_stop_out is not None:
+            self.on_stop_out(self.total_pnl)
+
+    def snapshot(self):
+        return {
+            "realized": round(self.realized, 2),
+            "unrealized": round(self.unrealized, 2),
+            "total": round(self.total_pnl, 2),
+            "margin_used": round(self.margin_used, 2),
+            "net_delta": {u: round(d, 2) for u, d in self.net_delta.items()},
+            "open_contracts": len(self.holdings),
+            "stopped_out": self.stopped_out,
+        }
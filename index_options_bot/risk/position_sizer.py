@@ -1,12 +1,164 @@
 # index_option_bot/risk/position_sizer.py
 
-def calculate_quantity(capital, entry_price, sl_price):
+import asyncio
+import logging
+import time
+
+import numpy as np
+
+from config.settings import config
+from risk import rules
+
+logger = logging.getLogger(__name__)
+
+
+def calculate_quantity(capital, entry_price, sl_price, lot_size=1):
     risk_amount = capital * 0.01  # 1% risk
-    risk_per_lot = abs(entry_price - sl_price)
-    
+    risk_per_lot = abs(entry_price - sl_price) * lot_size
+
     if risk_per_lot == 0:
         return 0
 
-    qty = int(risk_amount / risk_per_lot)
-    return max(qty, 0)
+    lots = int(risk_amount / risk_per_lot)
+    return max(lots, 0) * lot_size
+
+
+class FundsCache:
+    """
+    Available balance from the broker's fund limits, fetched at most once
+    every `ttl` seconds. A failed fetch keeps the last known balance.
+
+    get() fetches inline when the balance is stale (for start-up, off the
+    event loop). During a session run() keeps it fresh on a worker
+    thread, and sizing only reads `balance`, so the loop never waits on
+    the broker.
+    """
+
+    def __init__(self, broker, ttl=30.0, clock=time.monotonic):
+        self.broker = broker
+        self.ttl = ttl
+        self.clock = clock
+        self.balance = None
+        self.fetched_at = None
+
+    @property
+    def stale(self):
+        return self.fetched_at is None or self.clock() - self.fetched_at >= self.ttl
+
+    def refresh(self):
+        """Fetch the balance now (blocking)"""
+        self.fetched_at = self.clock()
+        funds = self.broker.get_fund_limits()
+        if funds and funds.get('status') == 'success':
+            balance = funds['data'].get('availabelBalance')  # sic, Dhan's field name
+            if balance is not None:
+                self.balance = float(balance)
+        return self.balance
+
+    def get(self):
+        if self.stale:
+            self.refresh()
+        return self.balance
+
+    def invalidate(self):
+        """Refetch on the next get() or run() check, e.g. after a fill"""
+        self.fetched_at = None
+
+    async def run(self, check_interval=1.0):
+        """Refresh on a worker thread whenever the balance goes stale; runs until cancelled"""
+        while True:
+            if self.stale:
+                try:
+                    await asyncio.to_thread(self.refresh)
+                except Exception as e:
+                    # Keep the last known balance; retried once stale again
+                    logger.error("Funds refresh failed: %s", e)
+            await asyncio.sleep(check_interval)
+
+
+class PositionSizer:
+    """
+    Whole-lot quantities from the rupee risk a trade may take.
+
+    The budget for one trade is the smallest of risk_per_trade_pct of
+    capital, max_loss_per_trade and what is left of max_loss_per_day after
+    the day's losses. Risk per unit is the larger of the stop distance
+    (stop_loss_pct of the premium) and the option's share of an adverse
+    index move of atr_multiplier × ATR (|delta| × move), so size shrinks
+    as the index gets more volatile. Lots are the budget over risk per
+    lot, capped by what the available funds can pay for and by max_lots.
+    Funds are read from the FundsCache as last fetched, never fetched
+    here.
+
+    what_if() sizes arrays of candidates (a whole strike ladder) in one
+    vectorized pass; size() is the same calculation for one option.
+    """
+
+    def __init__(self, capital, lot_size=config.LOT_SIZE,
+                 risk_per_trade_pct=rules.RISK_PER_TRADE_PCT,
+                 max_loss_per_trade=rules.MAX_LOSS_PER_TRADE,
+                 max_loss_per_day=rules.MAX_LOSS_PER_DAY,
+                 stop_loss_pct=config.STOP_LOSS_PERCENT,
+                 atr_multiplier=1.0, max_lots=None, funds=None):
+        self.capital = capital
+        self.lot_size = lot_size
+        self.risk_per_trade_pct = risk_per_trade_pct
+        self.max_loss_per_trade = max_loss_per_trade
+        self.max_loss_per_day = max_loss_per_day
+        self.stop_loss_pct = stop_loss_pct
+        self.atr_multiplier = atr_multiplier
+        self.max_lots = max_lots
+        self.funds = funds  # FundsCache, or None for no funds cap
+
+    def budget(self, day_pnl=0.0):
+        """Rupees one trade may lose, given the day's PnL so far"""
+        remaining = self.max_loss_per_day + min(day_pnl, 0.0)
+        return max(min(self.capital * self.risk_per_trade_pct / 100, self.max_loss_per_trade, remaining), 0.0)
+
+    def what_if(self, premium, delta=0.5, atr=None, day_pnl=0.0):
+        """
+        Size every candidate at once.
+
+        premium, delta: arrays (or scalars) per candidate; atr: the
+        underlying's ATR in index points. Returns a dict of arrays:
+        lots, quantity, cost (premium paid), risk (rupees lost at the
+        stop or on the ATR move) and delta_exposure (|delta| × quantity,
+        the index exposure the budget buys; higher is better value for
+        the same risk).
+        """
+        premium = np.asarray(premium, dtype=float)
+        delta = np.abs(np.broadcast_to(np.asarray(delta, dtype=float), premium.shape))
+        risk_per_unit = premium * self.stop_loss_pct / 100
+        if atr and np.isfinite(atr):
+            risk_per_unit = np.maximum(risk_per_unit, delta * atr * self.atr_multiplier)
+
+        budget = self.budget(day_pnl)
+        lot_risk = risk_per_unit * self.lot_size
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lots = np.where(lot_risk > 0, np.floor(budget / lot_risk), 0.0)
+            available = self.funds.balance if self.funds is not None else None
+            if available is not None:
+                lots = np.minimum(lots, np.where(premium > 0, np.floor(available / (premium * self.lot_size)), 0.0))
+        if self.max_lots is not None:
+            lots = np.minimum(lots, self.max_lots)
+        lots = np.maximum(lots, 0).astype(np.int64)
+
+        quantity = lots * self.lot_size
+        return {
+            'lots': lots,
+            'quantity': quantity,
+            'cost': premium * quantity,
+            'risk': risk_per_unit * quantity,
+            'delta_exposure': delta * quantity,
+        }
+
+    def size(self, premium, delta=0.5, atr=None, day_pnl=0.0):
+        """Quantity (a whole number of lots) for one option"""
+        return int(self.what_if(premium, delta, atr, day_pnl)['quantity'])
 
+    def best(self, premium, delta, atr=None, day_pnl=0.0):
+        """(index of the candidate with the most delta exposure for the budget or None, what_if result)"""
+        sized = self.what_if(premium, delta, atr, day_pnl)
+        if not sized['quantity'].any():
+            return None, sized
+        return int(np.argmax(sized['delta_exposure'])), sized
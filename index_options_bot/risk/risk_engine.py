@@ -0,0 +1,202 @@
+# index_options_bot/risk/risk_engine.py
+
+import logging
+import time
+
+from config.settings import config
+from risk import rules
+from utils.ist import IST_OFFSET
+
+logger = logging.getLogger(__name__)
+
+
+def _seconds_of_day(hhmm):
+    hours, minutes = hhmm.split(":")
+    return int(hours) * 3600 + int(minutes) * 60
+
+
+class RiskDecision:
+    """Outcome of a pre-trade check; falsy when rejected"""
+
+    __slots__ = ("allowed", "reasons")
+
+    def __init__(self, reasons):
+        self.reasons = reasons
+        self.allowed = not reasons
+
+    def __bool__(self):
+        return self.allowed
+
+    def __repr__(self):
+        return "ALLOWED" if self.allowed else f"REJECTED: {'; '.join(self.reasons)}"
+
+
+ALLOWED = RiskDecision([])
+
+
+class RiskEngine:
+    """
+    Pre-trade risk checks for every rule in risk/rules.py, plus open
+    position, exposure and margin limits.
+
+    Every limit is compared against a running counter that fills and exits
+    keep current, so a check is a handful of comparisons and never scans
+    trades or positions. All failing rules are reported, not just the
+    first. Orders that reduce an open position are always allowed: risk
+    never blocks an exit.
+
+    Drop-in for RiskManager (can_take_trade / register_trade /
+    register_exit / snapshot); check() is what OrderPipeline calls inline
+    for every order.
+    """
+
+    def __init__(self, capital,
+                 max_loss_per_trade=rules.MAX_LOSS_PER_TRADE,
+                 max_loss_per_day=rules.MAX_LOSS_PER_DAY,
+                 max_trades_per_day=rules.MAX_TRADES_PER_DAY,
+                 max_consecutive_losses=rules.MAX_CONSECUTIVE_LOSSES,
+                 risk_per_trade_pct=rules.RISK_PER_TRADE_PCT,
+                 cooldown_minutes=rules.COOLDOWN_AFTER_LOSS_MIN,
+                 market_start=rules.MARKET_START,
+                 market_end=rules.MARKET_END,
+                 stop_loss_pct=config.STOP_LOSS_PERCENT,
+                 max_open_positions=None,
+                 max_exposure=None,
+                 available_margin=None,
+                 clock=time.time):
+        self.capital = capital
+        self.max_loss_per_trade = max_loss_per_trade
+        self.max_loss_per_day = max_loss_per_day
+        self.max_trades_per_day = max_trades_per_day
+        self.max_consecutive_losses = max_consecutive_losses
+        self.risk_per_trade_pct = risk_per_trade_pct
+        self.cooldown_minutes = cooldown_minutes
+        self.stop_loss_pct = stop_loss_pct
+        self.max_open_positions = max_open_positions
+        self.max_exposure = max_exposure
+        self.available_margin = available_margin
+        self.clock = clock
+
+        self.window = (_seconds_of_day(market_start), _seconds_of_day(market_end))
+        self.max_risk_per_trade = min(max_loss_per_trade, capital * risk_per_trade_pct / 100)
+
+        # Running counters
+        self.trades_taken = 0
+        self.realized_pnl = 0.0
+        self.consecutive_losses = 0
+        self.cooldown_until = 0.0
+        self.day_stopped = False  # latched once the daily loss limit is hit
+        self.exposure = 0.0
+        self.positions = {}  # security_id -> (net_qty, notional)
+        self.rejections = 0
+
+    # Checks
+
+    def _session_reasons(self, now):
+        reasons = []
+        seconds = (now + IST_OFFSET) % 86400
+        if not self.window[0] <= seconds < self.window[1]:
+            reasons.append("Outside the trading window")
+        if self.trades_taken >= self.max_trades_per_day:
+            reasons.append(f"Max trades per day reached ({self.trades_taken})")
+        if self.day_stopped:
+            reasons.append(f"Max loss per day reached ({self.realized_pnl:.2f})")
+        if self.consecutive_losses >= self.max_consecutive_losses:
+            reasons.append(f"{self.consecutive_losses} consecutive losses")
+        if now < self.cooldown_until:
+            reasons.append(f"Cool-off after loss ({self.cooldown_until - now:.0f}s remaining)")
+        if self.max_open_positions is not None and len(self.positions) >= self.max_open_positions:
+            reasons.append(f"Max open positions reached ({len(self.positions)})")
+        return reasons
+
+    def check(self, security_id, side, quantity, price, stop_loss=None):
+        """RiskDecision for an order; stop_loss defaults to stop_loss_pct below/above price"""
+        held = self.positions.get(security_id)
+        if held is not None and (held[0] > 0) != (side == "BUY") and quantity <= abs(held[0]):
+            return ALLOWED  # reduces an open position
+
+        now = self.clock()
+        reasons = self._session_reasons(now)
+
+        notional = price * quantity
+        if stop_loss is None:
+            worst_loss = notional * self.stop_loss_pct / 100
+        else:
+            worst_loss = abs(price - stop_loss) * quantity
+        if worst_loss > self.max_risk_per_trade:
+            reasons.append(f"Risk {worst_loss:.2f} exceeds per-trade limit {self.max_risk_per_trade:.2f}")
+        if self.max_exposure is not None and self.exposure + notional > self.max_exposure:
+            reasons.append(f"Exposure {self.exposure + notional:.2f} exceeds {self.max_exposure:.2f}")
+        if self.available_margin is not None and notional > self.available_margin:
+            reasons.append(f"Needs {notional:.2f} margin, {self.available_margin:.2f} available")
+
+        if reasons:
+            self.rejections += 1
+            return RiskDecision(reasons)
+        return ALLOWED
+
+    def can_take_trade(self):
+        reasons = self._session_reasons(self.clock())
+        if reasons:
+            logger.info("%s", '; '.join(reasons))
+        return not reasons
+
+    # Counters
+
+    def on_fill(self, security_id, side, quantity, price):
+        """Keep positions, exposure and margin current after an execution"""
+        signed = quantity if side == "BUY" else -quantity
+        net, notional = self.positions.get(security_id, (0, 0.0))
+        if net and (net > 0) != (signed > 0):
+            # Reducing: release the exposure proportionally
+            closed = min(abs(signed), abs(net))
+            released = notional * closed / abs(net)
+            net += closed if net < 0 else -closed
+            notional -= released
+            self.exposure -= released
+            if self.available_margin is not None:
+                self.available_margin += released
+            signed += closed if signed < 0 else -closed
+        if signed:
+            net += signed
+            notional += abs(signed) * price
+            self.exposure += abs(signed) * price
+            if self.available_margin is not None:
+                self.available_margin -= abs(signed) * price
+        if net:
+            self.positions[security_id] = (net, notional)
+        else:
+            self.positions.pop(security_id, None)
+
+    def register_trade(self):
+        self.trades_taken += 1
+        logger.info("Trades taken today: %s", self.trades_taken)
+
+    def register_exit(self, pnl, exit_reason):
+        self.realized_pnl += pnl
+        if self.realized_pnl <= -self.max_loss_per_day:
+            self.day_stopped = True
+        if pnl < 0:
+            self.consecutive_losses += 1
+            self.cooldown_until = self.clock() + self.cooldown_minutes * 60
+            logger.info("Loss #%s in a row → cool-off for %s minutes", self.consecutive_losses, self.cooldown_minutes)
+        else:
+            self.consecutive_losses = 0
+        logger.info("Realized PnL: %s", self.realized_pnl)
+
+    def snapshot(self):
+        return {
+            "trades_taken": self.trades_taken,
+            "max_trades_per_day": self.max_trades_per_day,
+            "realized_pnl": self.realized_pnl,
+            "max_loss_per_day": self.max_loss_per_day,
+            "day_stopped": self.day_stopped,
+            "consecutive_losses": self.consecutive_losses,
+            "max_consecutive_losses": self.max_consecutive_losses,
+            "cooldown_until": self.cooldown_until or None,
+            "open_positions": len(self.positions),
+            "exposure": round(self.exposure, 2),
+            "available_margin": self.available_margin,
+            "max_risk_per_trade": self.max_risk_per_trade,
+            "rejections": self.rejections,
+        }
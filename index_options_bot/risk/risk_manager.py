@@ -1,7 +1,10 @@
 # index_options_bot/risk/risk_manager.py
 
+import logging
 from datetime import datetime, timedelta
 
+logger = logging.getLogger(__name__)
+
 
 class RiskManager:
     """
@@ -25,12 +28,12 @@ class RiskManager:
 
         # Max trades check
         if self.trades_taken >= self.max_trades_per_day:
-            print("[RISK] Max trades per day reached")
+            logger.info("Max trades per day reached")
             return False
 
         # Max loss check
         if abs(self.realized_pnl) >= self.max_loss_per_day:
-            print("[RISK] Max loss per day reached")
+            logger.info("Max loss per day reached")
             return False
 
         # Cool-off check
@@ -40,7 +43,7 @@ class RiskManager:
             )
             if datetime.now() < next_allowed_time:
                 remaining = (next_allowed_time - datetime.now()).seconds
-                print(f"[RISK] Cool-off active ({remaining}s remaining)")
+                logger.info("Cool-off active (%ss remaining)", remaining)
                 return False
 
         return True
@@ -50,18 +53,27 @@ class RiskManager:
         Called AFTER order entry
         """
         self.trades_taken += 1
-        print(f"[RISK] Trades taken today: {self.trades_taken}")
+        logger.info("Trades taken today: %s", self.trades_taken)
 
     def register_exit(self, pnl, exit_reason):
         """
         Called AFTER trade exit
         """
         self.realized_pnl += pnl
-        print(f"[RISK] Realized PnL: {self.realized_pnl}")
+        logger.info("Realized PnL: %s", self.realized_pnl)
 
         if exit_reason == "TRAILING_SL":
             self.last_sl_time = datetime.now()
-            print(
-                f"[RISK] SL hit → Cool-off started for "
-                f"{self.cooldown_minutes} minutes"
-            )
+            logger.info("SL hit → Cool-off started for %s minutes", self.cooldown_minutes)
+
+    def snapshot(self):
+        """
+        Current counters, as published to the API server
+        """
+        return {
+            "trades_taken": self.trades_taken,
+            "max_trades_per_day": self.max_trades_per_day,
+            "realized_pnl": self.realized_pnl,
+            "max_loss_per_day": self.max_loss_per_day,
+            "last_sl_time": self.last_sl_time.isoformat() if self.last_sl_time else None
+        }
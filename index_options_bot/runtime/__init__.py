@@ -0,0 +1,18 @@
+from utils.lazy import lazy_exports
+
+# Submodules load on first use of a name (see utils/lazy.py)
+_EXPORTS = {
+    'TradingRuntime': 'trading_runtime',
+    'StrategySlot': 'trading_runtime',
+    'MarketDataBus': 'market_data',
+    'StrikeLadder': 'strike_ladder',
+    'SharedQuoteTable': 'shared_feed',
+    'FeedPublisher': 'shared_feed',
+    'SharedFeedClient': 'shared_feed',
+    'HistoryWarmup': 'warmup',
+    'Bar': 'candles',
+    'CandleBuilder': 'candles',
+}
+
+__all__ = list(_EXPORTS)
+__getattr__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,82 @@
+from collections import namedtuple
+from datetime import datetime
+
+from utils.ist import IST, IST_OFFSET  # candle buckets align to IST wall clock
+
+class Bar(namedtuple('Bar', 'start open high low close volume')):
+    """Closed, immutable OHLC bar shared by every consumer"""
+
+    __slots__ = ()
+
+    @property
+    def timestamp(self):
+        return datetime.fromtimestamp(self.start, IST)
+
+class Candle:
+    """One OHLC bar while it is still forming"""
+
+    __slots__ = ('start', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, start, price, volume=0):
+        self.start = start
+        self.open = price
+        self.high = price
+        self.low = price
+        self.close = price
+        self.volume = volume
+
+    def update(self, price, volume=0):
+        if price > self.high:
+            self.high = price
+        if price < self.low:
+            self.low = price
+        self.close = price
+        self.volume += volume
+
+    @property
+    def timestamp(self):
+        return datetime.fromtimestamp(self.start, IST)
+
+    def freeze(self):
+        return Bar(self.start, self.open, self.high, self.low, self.close, self.volume)
+
+class CandleBuilder:
+    """Aggregates price ticks into fixed-timeframe candles"""
+
+    def __init__(self, timeframe_minutes):
+        self.timeframe = int(timeframe_minutes * 60)
+        self.current = None
+        self.last_closed = None
+
+    def bucket_start(self, ts):
+        """Start (epoch seconds) of the candle containing ts"""
+        return ts - (ts + IST_OFFSET) % self.timeframe
+
+    def next_close(self, ts):
+        """Epoch seconds at which the candle containing ts closes"""
+        return self.bucket_start(ts) + self.timeframe
+
+    def update(self, ts, price, volume=0):
+        """Add a tick; returns the previous candle if this tick started a new one"""
+        start = self.bucket_start(ts)
+        if self.last_closed is not None and start <= self.last_closed:
+            return None  # late tick for a candle already closed
+        if self.current is None:
+            self.current = Candle(start, price, volume)
+            return None
+        if start > self.current.start:
+            closed = self.current
+            self.last_closed = closed.start
+            self.current = Candle(start, price, volume)
+            return closed
+        self.current.update(price, volume)
+        return None
+
+    def close_due(self, ts):
+        """Close and return the current candle if its period has ended by ts"""
+        if self.current is not None and ts >= self.current.start + self.timeframe:
+            closed = self.current
+            self.last_closed = closed.start
+            self.current = None
+            return closed
+        return None
@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+from runtime.candles import CandleBuilder
+
+class Subscription:
+    """Handle returned by MarketDataBus.subscribe"""
+
+    __slots__ = ('key', 'on_tick', 'on_bar')
+
+    def __init__(self, key, on_tick=None, on_bar=None):
+        self.key = key
+        self.on_tick = on_tick
+        self.on_bar = on_bar
+
+class MarketDataBus:
+    """
+    Deduplicated tick and candle feed shared by every strategy and position.
+
+    Consumers subscribe to (exchange_segment, security_id) with async
+    on_tick(ltp) and/or on_bar(bar) callbacks. Each poll fetches every
+    subscribed instrument in one batched broker call no matter how many
+    consumers share it, and each instrument's candles are built once; the
+    closed Bar is immutable and handed to all of its bar subscribers.
+    Instruments are dropped from the poll when their last subscriber leaves.
+    """
+
+    def __init__(self, price_source, timeframe_minutes):
+        self.price_source = price_source
+        self.timeframe_minutes = timeframe_minutes
+        self.subscriptions = {}
+        self.prices = {}
+        self.last_bars = {}
+        self._builders = {}
+        self._clock = CandleBuilder(timeframe_minutes)  # bucket boundaries only
+        self.polls = 0
+
+    def subscribe(self, exchange_segment, security_id, on_tick=None, on_bar=None):
+        key = (exchange_segment, security_id)
+        subscription = Subscription(key, on_tick, on_bar)
+        self.subscriptions.setdefault(key, []).append(subscription)
+        if on_bar is not None and key not in self._builders:
+            self._builders[key] = CandleBuilder(self.timeframe_minutes)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        key = subscription.key
+        subscribers = self.subscriptions.get(key, [])
+        if subscription in subscribers:
+            subscribers.remove(subscription)
+        if not subscribers:
+            self.subscriptions.pop(key, None)
+            self.prices.pop(key, None)
+            self.last_bars.pop(key, None)
+            self._builders.pop(key, None)
+        elif not any(s.on_bar for s in subscribers):
+            self._builders.pop(key, None)
+
+    def instruments(self):
+        return list(self.subscriptions)
+
+    def last_price(self, exchange_segment, security_id):
+        return self.prices.get((exchange_segment, security_id))
+
+    async def fetch(self, exchange_segment, security_id):
+        """One-off price for an instrument that is not subscribed (yet)"""
+        key = (exchange_segment, security_id)
+        if key in self.prices:
+            return self.prices[key]
+        prices = await asyncio.to_thread(self.price_source.get_ltp_batch, [key])
+        return prices.get(key)
+
+    async def poll(self):
+        """Fetch all subscribed instruments in one call and dispatch"""
+        keys = self.instruments()
+        if not keys:
+            return
+        prices = await asyncio.to_thread(self.price_source.get_ltp_batch, keys)
+        self.polls += 1
+        now = time.time()
+
+        for key in keys:
+            ltp = prices.get(key)
+            if not isinstance(ltp, (int, float)):
+                continue
+            self.prices[key] = ltp
+
+            builder = self._builders.get(key)
+            closed = builder.update(now, ltp) if builder is not None else None
+
+            # Copy: callbacks may unsubscribe while we dispatch
+            for subscription in tuple(self.subscriptions.get(key, ())):
+                if subscription.on_tick is not None:
+                    await subscription.on_tick(ltp)
+            if closed is not None:
+                await self._dispatch_bar(key, closed)
+
+    def next_close(self, ts):
+        """Epoch seconds of the next candle boundary"""
+        return self._clock.next_close(ts)
+
+    async def close_due(self, ts):
+        """Close every candle whose period has ended by ts and dispatch it"""
+        for key, builder in list(self._builders.items()):
+            closed = builder.close_due(ts)
+            if closed is not None:
+                await self._dispatch_bar(key, closed)
+
+    async def _dispatch_bar(self, key, candle):
+        bar = candle.freeze()
+        self.last_bars[key] = bar
+        for subscription in tuple(self.subscriptions.get(key, ())):
+            if subscription.on_bar is not None:
+                await subscription.on_bar(bar)
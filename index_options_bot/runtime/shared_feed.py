@@ -0,0 +1,306 @@
+import asyncio
+import fcntl
+import logging
+import struct
+import time
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'DHANFEED'
+VERSION = 2
+
+# magic, version, capacity, owner heartbeat (epoch s), polls
+HEADER = struct.Struct('<8sIIdQ')
+HEADER_SIZE = 64
+
+# seq | segment, security_id | lease | ltp, tick_ts
+SLOT = struct.Struct('<Q8sqddd')
+SLOT_SIZE = 64
+SEQ = struct.Struct('<Q')
+KEY = struct.Struct('<8sq')
+LEASE = struct.Struct('<d')
+DATA = struct.Struct('<dd')
+KEY_OFFSET = 8
+LEASE_OFFSET = 24
+DATA_OFFSET = 32
+
+class SharedQuoteTable:
+    """
+    Fixed-size table of quote slots in a named shared-memory block.
+
+    Each slot holds one instrument's latest LTP behind a seqlock: the writer bumps the sequence to odd, writes, and bumps it
+    back to even; readers copy the slot straight out of the shared buffer
+    and retry if the sequence was odd or changed underneath them. Reads
+    take no lock and no syscall. Writers (the feed owner, and readers
+    claiming a slot) serialise on an flock of lock_path, which is only
+    taken once per poll and on registration, never per read.
+
+    x86 keeps stores in program order, which is what the seqlock relies on.
+    """
+
+    def __init__(self, shm, lock_path, owner=False):
+        self.shm = shm
+        self.buf = shm.buf
+        self.lock_path = str(lock_path)
+        self.owner = owner
+        magic, version, self.capacity, _, _ = HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Shared memory {shm.name} is not a v{VERSION} quote table")
+        self._lock_file = open(self.lock_path, 'a+')
+
+    @classmethod
+    def create(cls, name, capacity, lock_path):
+        try:
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()  # left behind by a crashed feed owner
+        except FileNotFoundError:
+            pass
+        shm = shared_memory.SharedMemory(name=name, create=True, size=HEADER_SIZE + capacity * SLOT_SIZE)
+        shm.buf[:len(shm.buf)] = bytes(len(shm.buf))
+        HEADER.pack_into(shm.buf, 0, MAGIC, VERSION, capacity, 0.0, 0)
+        return cls(shm, lock_path, owner=True)
+
+    @classmethod
+    def attach(cls, name, lock_path, timeout=0.0, max_age=None, poll=0.1):
+        """
+        Open the feed owner's table. Retries for up to timeout seconds
+        while the block is missing or not yet initialised (the owner
+        creates it only after it has authenticated) and, if max_age is
+        set, while its heartbeat is older than max_age seconds: a block
+        left by a crashed owner is not attached to until a new owner polls.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            table, problem = cls._try_attach(name, lock_path, max_age)
+            if table is not None:
+                return table
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Shared feed {name} not ready after {timeout:g}s: {problem}")
+            time.sleep(poll)
+
+    @classmethod
+    def _try_attach(cls, name, lock_path, max_age):
+        """(table, None) or (None, why not)"""
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            return None, "feed process has not created it"
+        # Readers must not unlink the block when they exit (Python < 3.13)
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        try:
+            table = cls(shm, lock_path)
+        except ValueError as e:
+            shm.close()
+            return None, str(e)
+        if max_age is not None and time.time() - table.heartbeat()[0] > max_age:
+            table.close()
+            return None, f"no feed heartbeat in the last {max_age:g}s"
+        return table, None
+
+    def close(self):
+        self._lock_file.close()
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    @contextmanager
+    def locked(self):
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    # Header
+
+    def heartbeat(self):
+        """(owner's last poll time, poll count)"""
+        _, _, _, ts, polls = HEADER.unpack_from(self.buf, 0)
+        return ts, polls
+
+    def set_heartbeat(self, ts, polls):
+        HEADER.pack_into(self.buf, 0, MAGIC, VERSION, self.capacity, ts, polls)
+
+    # Slots
+
+    def _offset(self, index):
+        return HEADER_SIZE + index * SLOT_SIZE
+
+    def key(self, index):
+        segment, security_id = KEY.unpack_from(self.buf, self._offset(index) + KEY_OFFSET)
+        return segment.rstrip(b'\0').decode(), security_id
+
+    def lease(self, index):
+        return LEASE.unpack_from(self.buf, self._offset(index) + LEASE_OFFSET)[0]
+
+    def renew(self, index, now):
+        LEASE.pack_into(self.buf, self._offset(index) + LEASE_OFFSET, now)
+
+    def read(self, index, spins=1000):
+        """Consistent copy of a slot's fields, or None if the writer kept it busy"""
+        offset = self._offset(index)
+        for _ in range(spins):
+            before = SEQ.unpack_from(self.buf, offset)[0]
+            if before & 1:
+                continue
+            fields = SLOT.unpack_from(self.buf, offset)
+            if SEQ.unpack_from(self.buf, offset)[0] == before:
+                return fields
+        return None
+
+    def write(self, index, ltp, tick_ts):
+        """Publish a tick; caller holds the lock"""
+        offset = self._offset(index)
+        seq = SEQ.unpack_from(self.buf, offset)[0]
+        SEQ.pack_into(self.buf, offset, seq + 1)
+        DATA.pack_into(self.buf, offset + DATA_OFFSET, ltp, tick_ts)
+        SEQ.pack_into(self.buf, offset, seq + 2)
+
+    def assign(self, index, key, now):
+        """Hand a slot to a new instrument; caller holds the lock"""
+        offset = self._offset(index)
+        seq = SEQ.unpack_from(self.buf, offset)[0]
+        SEQ.pack_into(self.buf, offset, seq + 1)
+        KEY.pack_into(self.buf, offset + KEY_OFFSET, key[0].encode(), int(key[1]))
+        LEASE.pack_into(self.buf, offset + LEASE_OFFSET, now)
+        DATA.pack_into(self.buf, offset + DATA_OFFSET, 0.0, 0.0)
+        SEQ.pack_into(self.buf, offset, seq + 2)
+
+    def active(self, now, lease_seconds):
+        """[(index, key)] of slots some reader renewed within lease_seconds"""
+        slots = []
+        for index in range(self.capacity):
+            key = self.key(index)
+            if key[0] and now - self.lease(index) <= lease_seconds:
+                slots.append((index, key))
+        return slots
+
+class FeedPublisher:
+    """
+    Feed-owner side: polls the broker once per interval for every
+    instrument any reader process has leased, and publishes the quotes
+    into the shared table. Readers build their own candles from them.
+    """
+
+    def __init__(self, price_source, table, poll_interval=1.0, lease_seconds=30.0):
+        self.price_source = price_source
+        self.table = table
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.polls = 0
+        self._stop = None
+
+    def publish_once(self):
+        now = time.time()
+        slots = self.table.active(now, self.lease_seconds)
+        prices = self.price_source.get_ltp_batch([key for _, key in slots]) if slots else {}
+        tick_ts = time.time()
+        self.polls += 1
+
+        with self.table.locked():
+            for index, key in slots:
+                ltp = prices.get(key)
+                if not isinstance(ltp, (int, float)) or self.table.key(index) != key:
+                    continue  # no quote, or slot reassigned while we polled
+                self.table.write(index, ltp, tick_ts)
+            self.table.set_heartbeat(tick_ts, self.polls)
+        return len(prices)
+
+    async def run(self):
+        """Poll until stop() is called"""
+        self._stop = asyncio.Event()
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            try:
+                await asyncio.to_thread(self.publish_once)
+            except Exception as e:
+                logger.error("Feed poll failed: %s", e)
+            elapsed = time.perf_counter() - started
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=max(self.poll_interval - elapsed, 0))
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+
+class SharedFeedClient:
+    """
+    Reader side: a drop-in price_source for MarketDataBus that reads
+    quotes from the shared table instead of calling the broker.
+
+    The first request for an instrument claims a slot and waits briefly
+    for its first quote; afterwards reads are lock-free copies. Quotes
+    older than max_age seconds are treated as missing.
+    """
+
+    def __init__(self, table, max_age=5.0, first_quote_timeout=3.0, lease_seconds=30.0):
+        self.table = table
+        self.max_age = max_age
+        self.first_quote_timeout = first_quote_timeout
+        self.lease_seconds = lease_seconds
+        self._slots = {}
+
+    def _slot(self, key, now):
+        index = self._slots.get(key)
+        if index is not None and self.table.key(index) == key:
+            return index, False
+
+        with self.table.locked():
+            free = None
+            for i in range(self.table.capacity):
+                slot_key = self.table.key(i)
+                if slot_key == key:
+                    self.table.renew(i, now)
+                    self._slots[key] = i
+                    return i, False
+                if free is None and (not slot_key[0] or now - self.table.lease(i) > self.lease_seconds):
+                    free = i
+            if free is None:
+                raise RuntimeError(f"Shared feed is full ({self.table.capacity} instruments)")
+            self.table.assign(free, key, now)
+        self._slots[key] = free
+        return free, True
+
+    def _quote(self, index, key, now):
+        fields = self.table.read(index)
+        if fields is None:
+            return None
+        _, segment, security_id, _, ltp, tick_ts = fields[:6]
+        if (segment.rstrip(b'\0').decode(), security_id) != key or not tick_ts:
+            return None
+        if now - tick_ts > self.max_age:
+            return None
+        return ltp
+
+    def get_ltp_batch(self, instruments):
+        now = time.time()
+        slots = {}
+        fresh = False
+        for segment, security_id in instruments:
+            key = (segment, int(security_id))
+            index, claimed = self._slot(key, now)
+            self.table.renew(index, now)
+            slots[(segment, security_id)] = (index, key)
+            fresh = fresh or claimed
+
+        prices = {}
+        deadline = now + (self.first_quote_timeout if fresh else 0)
+        while True:
+            now = time.time()
+            for request, (index, key) in slots.items():
+                if request not in prices:
+                    ltp = self._quote(index, key, now)
+                    if ltp is not None:
+                        prices[request] = ltp
+            if len(prices) == len(slots) or now >= deadline:
+                return prices
+            time.sleep(0.01)
+
+    def get_ltp(self, security_id, exchange_segment):
+        return self.get_ltp_batch([(exchange_segment, security_id)]).get((exchange_segment, security_id))
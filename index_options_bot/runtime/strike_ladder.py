@@ -0,0 +1,119 @@
+import bisect
+import logging
+
+logger = logging.getLogger(__name__)
+
+class StrikeLadder:
+    """
+    Security IDs and live quotes for the strikes around ATM of one
+    underlying and expiry.
+
+    The strike/security-ID table is cut from the instrument master once.
+    The ladder follows the index through a bus subscription and keeps
+    ATM±strikes_each_side subscribed, so the bus polls only options the
+    bot may trade and a signal can go straight to an order. ATM moves to
+    the nearest strike only once the index is more than (0.5 + hysteresis)
+    strike intervals from the current one, so a quote oscillating around
+    a midpoint does not flip strikes; the window then shifts incrementally,
+    subscribing strikes that enter it and dropping those that leave.
+    """
+
+    def __init__(self, bus, instruments, underlying, index_security_id, strikes_each_side=2,
+                 hysteresis=0.25, expiry=None):
+        self.bus = bus
+        self.instruments = instruments
+        self.underlying = underlying
+        self.index_security_id = index_security_id
+        self.strikes_each_side = strikes_each_side
+        self.hysteresis = hysteresis
+        self.expiry = expiry
+        self.interval = None
+
+        self.strikes = []
+        self.security_ids = {}
+        self.atm = None
+        self.shifts = 0
+        self._window = {}
+        self._index_sub = None
+
+    def start(self):
+        """Load the strike table and follow the index; returns False if there is none"""
+        self.expiry = self.expiry or self.instruments.get_nearest_expiry(self.underlying)
+        self.interval = self.instruments.get_strike_interval(self.underlying)
+        options = self.instruments.filter_options(self.underlying)
+        options = options[options['expiry'] == self.expiry]
+        for strike, option_type, security_id in zip(options['strike'], options['option_type'], options['security_id']):
+            self.security_ids.setdefault(float(strike), {})[option_type] = security_id
+        self.strikes = sorted(self.security_ids)
+        if not self.strikes:
+            logger.warning("No %s strikes listed for %s; strike ladder disabled", self.underlying, self.expiry)
+            return False
+
+        self._index_sub = self.bus.subscribe('IDX_I', self.index_security_id, on_tick=self._on_index)
+        index_ltp = self.bus.last_price('IDX_I', self.index_security_id)
+        if index_ltp is not None:
+            self.update(index_ltp)
+        return True
+
+    def stop(self):
+        if self._index_sub is not None:
+            self.bus.unsubscribe(self._index_sub)
+            self._index_sub = None
+        for subscription in self._window.values():
+            self.bus.unsubscribe(subscription)
+        self._window = {}
+        self.atm = None
+
+    async def _on_index(self, ltp):
+        self.update(ltp)
+
+    def nearest(self, index_ltp):
+        """Listed strike closest to index_ltp"""
+        i = bisect.bisect_left(self.strikes, index_ltp)
+        if i == len(self.strikes) or (i > 0 and index_ltp - self.strikes[i - 1] <= self.strikes[i] - index_ltp):
+            i -= 1
+        return self.strikes[i]
+
+    def update(self, index_ltp):
+        """Re-centre on a new index price; returns True if ATM moved"""
+        if self.atm is not None and abs(index_ltp - self.atm) < (0.5 + self.hysteresis) * self.interval:
+            return False
+        atm = self.nearest(index_ltp)
+        if atm == self.atm:
+            return False
+
+        i = self.strikes.index(atm)
+        window = self.strikes[max(i - self.strikes_each_side, 0):i + self.strikes_each_side + 1]
+        keys = {
+            ('NSE_FNO', security_id)
+            for strike in window for security_id in self.security_ids[strike].values()
+        }
+        for key in self._window.keys() - keys:
+            self.bus.unsubscribe(self._window.pop(key))
+        for key in keys - self._window.keys():
+            self._window[key] = self.bus.subscribe(*key)
+
+        if self.atm is not None:
+            self.shifts += 1
+            logger.info("%s ATM %g -> %g (index %s)", self.underlying, self.atm, atm, index_ltp)
+        self.atm = atm
+        return True
+
+    def select(self, option_type, offset=0):
+        """
+        (strike, security_id, ltp) for the strike `offset` steps from ATM;
+        ltp is None until the bus has polled the option.
+        """
+        if self.atm is None:
+            return None
+        i = self.strikes.index(self.atm) + offset
+        if not 0 <= i < len(self.strikes):
+            return None
+        strike = self.strikes[i]
+        security_id = self.security_ids[strike].get(option_type)
+        if security_id is None:
+            return None
+        return strike, security_id, self.bus.last_price('NSE_FNO', security_id)
+
+    def subscribed(self):
+        return sorted(self._window)
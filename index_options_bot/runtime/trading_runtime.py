@@ -0,0 +1,614 @@
+import asyncio
+import logging
+import signal
+import time
+
+import numpy as np
+
+from config.settings import config
+from execution.kill_switch import KillSwitch
+from execution.order_pipeline import OrderPipeline
+from options import black_scholes
+from options.chain import years_to_expiry
+from positions.position import Position
+from risk.portfolio import PortfolioRisk
+from runtime.market_data import MarketDataBus
+from runtime.strike_ladder import StrikeLadder
+from utils.instruments import INDEX_SECURITY_IDS
+from utils.market_time import MarketTime
+
+logger = logging.getLogger(__name__)
+
+class StrategySlot:
+    """One strategy instance trading one underlying"""
+
+    def __init__(self, underlying, strategy, name=None):
+        self.underlying = underlying
+        self.strategy = strategy
+        self.name = name or underlying
+        self.index_security_id = INDEX_SECURITY_IDS.get(underlying)
+
+class TradingRuntime:
+    """
+    Long-running asyncio trading session.
+
+    Waits (sleeping, not polling) for the market to open, then runs two
+    tasks until the close: a price loop that polls the market-data bus
+    every POLLING_INTERVAL, and a candle loop that wakes at each candle
+    boundary to close bars. Every strategy slot subscribes to its
+    underlying's bars and every open position to its option's ticks, so
+    all underlyings, strategies and positions share one batched poll.
+    Each underlying keeps a StrikeLadder of the strikes around ATM
+    subscribed, so entries need no instrument lookups or quote requests.
+    Orders go through an OrderPipeline and wait for the broker's fill
+    (quantity and average price) in their own tasks: a signal is handled
+    in a task per slot (in order), and a stop-loss exit in a task per
+    position, so neither the price loop nor the candle loop ever waits
+    on the broker.
+    With a PositionSizer, entries are sized in whole lots from the risk
+    budget and the signal's ATR, and can pick the ladder strike with the
+    most delta for that risk. Risk checks run inline before every entry,
+    and a PortfolioRisk marks every open position to market on each tick;
+    if the day's combined PnL reaches -max_loss_per_day, entries stop and
+    everything is flattened. At the close or on SIGTERM/SIGINT, open positions are
+    flattened and the session ends. The kill switch is shared with other
+    processes: once it is engaged, here (kill command) or anywhere else,
+    opening orders are refused, open orders are cancelled and every
+    position is exited concurrently, then the session ends; the
+    trigger-to-flat time is published as 'kill'.
+    """
+
+    def __init__(self, price_source, instruments, executor, slots, risk_manager,
+                 position_manager, trade_logger=None, daily_summary=None, channel=None,
+                 quantity=config.LOT_SIZE, stop_loss_percent=config.STOP_LOSS_PERCENT,
+                 poll_interval=config.POLLING_INTERVAL, candle_timeframe=config.CANDLE_TIMEFRAME,
+                 market_time=MarketTime, bus=None, warmup=None, ladder_strikes=config.LADDER_STRIKES,
+                 orders=None, kill_switch=None, kill_poll_interval=0.25, sizer=None,
+                 select_by_risk=config.SELECT_STRIKE_BY_RISK, exit_attempts=3):
+        self.bus = bus or MarketDataBus(price_source, candle_timeframe)
+        self.instruments = instruments
+        self.executor = executor
+        self.orders = orders or OrderPipeline(executor)
+        self.kill_switch = kill_switch or KillSwitch()
+        if self.orders.kill_switch is None:
+            self.orders.kill_switch = self.kill_switch
+        self.kill_poll_interval = kill_poll_interval
+        self._mark_price = getattr(executor, 'update_price', None)  # paper book MTM
+        self.portfolio = PortfolioRisk(risk_manager.max_loss_per_day, on_stop_out=self._on_stop_out)
+        self.slots = list(slots)
+        self.risk_manager = risk_manager
+        self.position_manager = position_manager
+        self.trade_logger = trade_logger
+        self.daily_summary = daily_summary
+        self.channel = channel
+        self.quantity = quantity  # per entry when there is no sizer
+        self.sizer = sizer
+        self.select_by_risk = select_by_risk
+        self.exit_attempts = exit_attempts
+        self.stop_loss_percent = stop_loss_percent
+        self.poll_interval = poll_interval
+        self.market_time = market_time
+        self.warmup = warmup
+        self.ladder_strikes = ladder_strikes
+        self.ladders = {}
+
+        self.paused = False
+        self.killed = False
+        self.state = 'idle'
+        self.latency = {}
+        self._loop = None
+        self._stop = None
+        self._order_lock = None
+        self._position_subs = {}
+        self._tasks = set()     # signal and exit tasks in flight
+        self._exits = {}        # id(position) -> its exit task
+        self._slot_locks = {}   # slot name -> lock, so a slot's signals run in order
+        self._stop_out_task = None
+        self._kill_task = None
+        self.kill_stats = None
+
+        if channel is not None:
+            channel.on_command('pause', self._command_pause)
+            channel.on_command('resume', self._command_resume)
+            channel.on_command('kill', self._command_kill)
+
+    # Lifecycle
+
+    async def run(self):
+        """Run one full trading session; returns when it is over"""
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        self._order_lock = asyncio.Lock()
+        self._install_signal_handlers()
+
+        try:
+            wait = self.market_time.seconds_until_open()
+            if wait > 0:
+                self._set_state('waiting_for_open')
+                logger.info("Market closed; sleeping %.1f minutes until open", wait / 60)
+                if await self._sleep_or_stop(wait):
+                    return
+
+            if self.warmup is not None:
+                self._set_state('warming_up')
+                await self.warmup.warm_up(self.slots)
+
+            self._set_state('trading')
+            logger.info("Trading session started: %s", ', '.join(slot.name for slot in self.slots))
+            subscriptions = [
+                self.bus.subscribe('IDX_I', slot.index_security_id, on_bar=self._bar_handler(slot))
+                for slot in self.slots
+            ]
+            for underlying in {slot.underlying for slot in self.slots}:
+                subscriptions.append(self.bus.subscribe(
+                    'IDX_I', INDEX_SECURITY_IDS.get(underlying), on_tick=self._index_tick(underlying)
+                ))
+            if self.warmup is not None:
+                # Keep the candle cache current for a mid-session restart
+                for security_id in {slot.index_security_id for slot in self.slots}:
+                    subscriptions.append(self.bus.subscribe(
+                        'IDX_I', security_id, on_bar=self._recorder('IDX_I', security_id)
+                    ))
+            self._start_ladders()
+            tasks = [
+                asyncio.create_task(self._price_loop(), name='price-loop'),
+                asyncio.create_task(self._candle_loop(), name='candle-loop'),
+                asyncio.create_task(self._watch_kill_switch(), name='kill-switch'),
+            ]
+            if self.sizer is not None and self.sizer.funds is not None:
+                tasks.append(asyncio.create_task(self.sizer.funds.run(), name='funds-refresh'))
+            try:
+                await self._sleep_or_stop(self.market_time.seconds_until_close())
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                for subscription in subscriptions:
+                    self.bus.unsubscribe(subscription)
+                for ladder in self.ladders.values():
+                    ladder.stop()
+
+            self._set_state('closing')
+            # Let entries and exits already at the broker settle before flattening
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            await self.flatten_all('SESSION_END' if not self.killed else 'KILL_SWITCH')
+            await self.orders.close()
+        finally:
+            self._set_state('stopped')
+            logger.info("Trading session ended")
+
+    def stop(self):
+        """Request a clean shutdown (thread-safe)"""
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+
+    async def _sleep_or_stop(self, seconds):
+        """Sleep for seconds; returns True if a stop was requested meanwhile"""
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=max(seconds, 0))
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def _install_signal_handlers(self):
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                self._loop.add_signal_handler(sig, self._stop.set)
+            except (NotImplementedError, RuntimeError):
+                # Not on the main thread / unsupported platform
+                pass
+
+    # Loops
+
+    async def _price_loop(self):
+        while True:
+            started = time.perf_counter()
+            try:
+                await self.bus.poll()
+            except Exception as e:
+                logger.error("Price poll failed: %s", e)
+            self.latency['poll_ms'] = round((time.perf_counter() - started) * 1000, 3)
+            self._publish_positions()
+            await asyncio.sleep(self.poll_interval)
+
+    async def _watch_kill_switch(self):
+        # Only starts the flatten: the order pipeline and the live engine check
+        # the same flag on every order, so a coarse interval costs no safety
+        while not self.kill_switch.engaged:
+            await asyncio.sleep(self.kill_poll_interval)
+        self._kill_task = asyncio.create_task(self.kill(), name='kill')
+
+    async def kill(self):
+        """Refuse entries, cancel open orders, exit everything at once, end the session"""
+        if self.killed and self.kill_stats is not None:
+            return self.kill_stats
+        self.killed = True
+        self.kill_switch.engage('runtime')
+        state = self.kill_switch.state()
+        logger.critical("Kill switch engaged (%s): cancelling orders and flattening", state['reason'])
+        started = time.perf_counter()
+        detected_ms = (time.time() - state['triggered_at']) * 1000
+
+        cancelled = await self.orders.cancel_all()
+        positions = self.position_manager.open_positions()
+        await self.flatten_all('KILL_SWITCH')
+
+        self.kill_stats = {
+            'reason': state['reason'],
+            'cancelled_orders': len(cancelled),
+            'flattened_positions': len(positions),
+            'trigger_to_detect_ms': round(detected_ms, 3),
+            'flatten_ms': round((time.perf_counter() - started) * 1000, 3),
+            'trigger_to_flat_ms': round((time.time() - state['triggered_at']) * 1000, 3),
+        }
+        logger.critical("Flat in %s ms after kill switch", self.kill_stats['trigger_to_flat_ms'])
+        if self.channel:
+            self.channel.publish('kill', self.kill_stats)
+        self._publish_positions()
+        if self._stop is not None:
+            self._stop.set()
+        return self.kill_stats
+
+    async def _candle_loop(self):
+        while True:
+            now = time.time()
+            await asyncio.sleep(max(self.bus.next_close(now) - now, 0) + 0.05)
+            await self.bus.close_due(time.time())
+
+    def index_ltp(self, underlying):
+        return self.bus.last_price('IDX_I', INDEX_SECURITY_IDS.get(underlying))
+
+    def _start_ladders(self):
+        if self.ladder_strikes <= 0:
+            return
+        for underlying in {slot.underlying for slot in self.slots}:
+            ladder = StrikeLadder(
+                self.bus, self.instruments, underlying, INDEX_SECURITY_IDS.get(underlying),
+                strikes_each_side=self.ladder_strikes
+            )
+            try:
+                if ladder.start():
+                    self.ladders[underlying] = ladder
+            except Exception as e:
+                logger.error("Strike ladder for %s failed to start: %s", underlying, e)
+
+    # Strategy
+
+    def _recorder(self, segment, security_id):
+        async def on_bar(bar):
+            try:
+                await self.warmup.record(segment, security_id, bar)
+            except OSError as e:
+                logger.error("Could not cache candle: %s", e)
+        return on_bar
+
+    def _bar_handler(self, slot):
+        async def on_bar(bar):
+            await self._on_candle(slot, bar)
+        return on_bar
+
+    async def _on_candle(self, slot, candle):
+        started = time.perf_counter()
+        slot.strategy.add_price_data(
+            timestamp=candle.timestamp,
+            open_price=candle.open,
+            high=candle.high,
+            low=candle.low,
+            close=candle.close,
+            volume=candle.volume
+        )
+        signal = slot.strategy.generate_signal()
+        if signal:
+            self._spawn(self._on_signal(slot, signal), f'signal-{slot.name}')
+        self.latency[f'candle_ms.{slot.name}'] = round((time.perf_counter() - started) * 1000, 3)
+
+    async def _on_signal(self, slot, signal):
+        if self.channel:
+            self.channel.publish('signal', {**signal, 'symbol': slot.underlying, 'slot': slot.name})
+
+        lock = self._slot_locks.setdefault(slot.name, asyncio.Lock())
+        async with lock:
+            await self._handle_signal(slot, signal)
+
+    async def _handle_signal(self, slot, signal):
+        option_type = 'CE' if signal['type'] == 'BUY' else 'PE'
+
+        # Trend reversed: close this slot's positions on the other side first
+        for position in self.position_manager.open_positions(slot.name):
+            if position.option_type != option_type:
+                await self.exit_position(position, position.last_price, 'REVERSAL')
+
+        killed = self.killed or self.kill_switch.engaged
+        closing = self.state != 'trading'
+        if killed or closing or self.paused or self.portfolio.stopped_out:
+            state = ('killed' if killed else 'closing' if closing
+                     else 'paused' if self.paused else 'stopped out')
+            logger.info("%s: signal %s ignored: trading %s", slot.name, signal['type'], state)
+            return
+        if self.position_manager.open_positions(slot.name):
+            return
+        if not self.risk_manager.can_take_trade():
+            return
+
+        await self.enter_position(slot, option_type, atr=signal.get('atr'))
+
+    def _index_tick(self, underlying):
+        async def on_tick(ltp):
+            self.portfolio.on_index(underlying, ltp)
+        return on_tick
+
+    def _chain_greeks(self, underlying, expiry, strikes, option_type, premiums):
+        """Per-unit (delta, gamma) arrays for options of one type; ±0.5 and 0 where IV has no solution"""
+        strikes = np.asarray(strikes, dtype=float)
+        is_call = option_type == 'CE'
+        delta = np.full(len(strikes), 0.5 if is_call else -0.5)
+        gamma = np.zeros(len(strikes))
+        spot = self.index_ltp(underlying)
+        try:
+            t = years_to_expiry(expiry)
+        except (TypeError, ValueError):
+            t = 0.0
+        if spot and t > 0:
+            calls = np.full(len(strikes), is_call)
+            sigma = black_scholes.implied_vol(premiums, spot, strikes, t, config.RISK_FREE_RATE, calls)
+            solved = ~np.isnan(sigma)
+            if solved.any():
+                d, g, _, _ = black_scholes.greeks(
+                    spot, strikes[solved], t, config.RISK_FREE_RATE, sigma[solved], calls[solved]
+                )
+                delta[solved], gamma[solved] = d, g
+        return delta, gamma
+
+    def _greeks(self, underlying, expiry, strike, option_type, premium):
+        """Per-unit (delta, gamma) of one option at entry"""
+        delta, gamma = self._chain_greeks(underlying, expiry, [strike], option_type, [premium])
+        return float(delta[0]), float(gamma[0])
+
+    def _size(self, underlying, expiry, option_type, candidates, atr):
+        """
+        (strike, security_id, ltp, quantity) to buy from [(strike, security_id, ltp)],
+        the ATM candidate first. Without a sizer this is ATM at the fixed quantity.
+        """
+        if self.sizer is None:
+            return (*candidates[0], self.quantity)
+        strikes = [c[0] for c in candidates]
+        premiums = np.array([c[2] for c in candidates], dtype=float)
+        delta, _ = self._chain_greeks(underlying, expiry, strikes, option_type, premiums)
+        best, sized = self.sizer.best(premiums, delta, atr, day_pnl=self.portfolio.total_pnl)
+        i = best if self.select_by_risk and best is not None else 0
+        logger.info(
+            "%s %s sizing (ATR %s): %s", underlying, option_type, atr,
+            ', '.join(f"{strike:g}x{qty}" for strike, qty in zip(strikes, sized['quantity'].tolist()))
+        )
+        return (*candidates[i], int(sized['quantity'][i]))
+
+    def _on_stop_out(self, total_pnl):
+        # Called from inside a portfolio update: block entries now, flatten on the loop
+        logger.critical("Daily loss limit hit (PnL %.2f); flattening and stopping entries", total_pnl)
+        if hasattr(self.risk_manager, 'day_stopped'):
+            self.risk_manager.day_stopped = True
+        if self._loop is not None:
+            self._stop_out_task = self._loop.create_task(self.flatten_all('MAX_LOSS_STOP'))
+
+    async def _on_position_tick(self, position, ltp):
+        if self._mark_price is not None:
+            self._mark_price(position.security_id, ltp)
+        self.portfolio.on_price(position.security_id, ltp)
+        if position.is_open and self.position_manager.on_price(position, ltp):
+            self.request_exit(position, ltp, 'TRAILING_SL')
+
+    def _spawn(self, coro, name):
+        task = asyncio.create_task(coro, name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("%s failed: %s", task.get_name(), task.exception())
+
+    # Orders
+
+    async def enter_position(self, slot, option_type, atr=None):
+        index_ltp = self.index_ltp(slot.underlying)
+        if index_ltp is None:
+            logger.warning("No %s price yet; cannot select strike", slot.underlying)
+            return None
+
+        underlying = slot.underlying
+        ladder = self.ladders.get(underlying)
+        selected = ladder.select(option_type) if ladder is not None else None
+        if selected is not None:
+            expiry = ladder.expiry
+            strike, security_id, ltp = selected
+        else:
+            expiry = self.instruments.get_nearest_expiry(underlying)
+            strike = self.instruments.get_atm_strike(index_ltp, underlying)
+            security_id = self.instruments.get_option_security_id(expiry, strike, option_type, underlying)
+            if security_id is None:
+                return None
+            ltp = None
+
+        ltp = ltp or await self.bus.fetch('NSE_FNO', security_id)
+        if not ltp:
+            logger.warning("No price for %s %s %g; skipping entry", underlying, option_type, strike)
+            return None
+
+        candidates = [(strike, security_id, ltp)]
+        if selected is not None and self.sizer is not None and self.select_by_risk:
+            # Every quoted strike in the ladder window, sized in one pass
+            for offset in range(1, self.ladder_strikes + 1):
+                for step in (-offset, offset):
+                    candidate = ladder.select(option_type, step)
+                    if candidate is not None and candidate[2]:
+                        candidates.append(candidate)
+        strike, security_id, ltp, quantity = self._size(underlying, expiry, option_type, candidates, atr)
+        if not quantity:
+            logger.warning("%s %s %g: risk budget is below one lot; skipping entry", underlying, option_type, strike)
+            return None
+
+        symbol = f"{underlying} {expiry} {strike:g} {option_type}"
+        async with self._order_lock:
+            ticket = await self.orders.submit(
+                security_id, symbol, ltp, quantity, 'BUY',
+                stop_loss=ltp * (1 - self.stop_loss_percent / 100)
+            )
+        ticket = await ticket.wait()
+        if not ticket.filled_qty:
+            logger.error("Entry failed for %s: %s %s", symbol, ticket.status, ticket.error or '')
+            return None
+        if self.killed:
+            # Filled (or partly) before the cancel reached the broker: exit it straight away
+            await self._exit_ticket(ticket, 'KILL_SWITCH')
+            return None
+
+        self.risk_manager.register_trade()
+        entry_price = ticket.avg_price
+        position = Position(
+            symbol=symbol,
+            qty=ticket.filled_qty,
+            entry_price=entry_price,
+            sl=round(entry_price * (1 - self.stop_loss_percent / 100), 2),
+            security_id=security_id,
+            option_type=option_type,
+            slot=slot.name
+        )
+        self.position_manager.open(position)
+        delta, gamma = self._greeks(underlying, expiry, strike, option_type, entry_price)
+        self.portfolio.open(security_id, underlying, position.qty, entry_price, delta, gamma)
+        self._position_subs[id(position)] = self.bus.subscribe(
+            'NSE_FNO', security_id, on_tick=lambda ltp: self._on_position_tick(position, ltp)
+        )
+        self._publish_risk()
+        self._publish_positions()
+        return position
+
+    def request_exit(self, position, price, reason):
+        """Start exiting a position without waiting for the fill; returns its exit task"""
+        key = id(position)
+        task = self._exits.get(key)
+        if task is None:
+            task = self._spawn(self._exit(position, price, reason), f'exit-{position.symbol}')
+            self._exits[key] = task
+            task.add_done_callback(lambda _: self._exits.pop(key, None))
+        return task
+
+    async def exit_position(self, position, price, reason):
+        """Exit a position and wait for the fill (an exit already under way is waited on, not repeated)"""
+        if not position.is_open and id(position) not in self._exits:
+            return
+        await self.request_exit(position, price, reason)
+
+    async def _exit(self, position, price, reason):
+        """
+        Sell what is still open, up to exit_attempts orders. Only filled
+        quantity is booked; until the last lot is out the position stays
+        tracked, subscribed and under its stop, so a stop-loss hit later
+        starts a new exit.
+        """
+        for attempt in range(1, self.exit_attempts + 1):
+            async with self._order_lock:
+                ticket = await self.orders.submit(
+                    position.security_id, position.symbol, price, position.qty, 'SELL', reduce_only=True
+                )
+            ticket = await ticket.wait()
+            if ticket.filled_qty:
+                self._book_exit(position, ticket.filled_qty, ticket.avg_price, reason)
+            if not position.is_open:
+                return
+            logger.error(
+                "Exit order for %s %s (attempt %s/%s): %s/%s filled %s",
+                position.symbol, ticket.status, attempt, self.exit_attempts,
+                ticket.filled_qty, ticket.quantity, ticket.error or ''
+            )
+            await asyncio.sleep(self.poll_interval)
+            price = position.last_price
+        logger.critical(
+            "%s: %s x %s still open after %s exit orders; it stays under its stop",
+            reason, position.symbol, position.qty, self.exit_attempts
+        )
+
+    def _book_exit(self, position, qty, price, reason):
+        position.fill_exit(qty, price, reason)
+        self.portfolio.close(position.security_id, qty, price)
+        if position.is_open:
+            self._publish_positions()
+            return
+
+        self.position_manager.remove(position)
+        subscription = self._position_subs.pop(id(position), None)
+        if subscription is not None:
+            self.bus.unsubscribe(subscription)
+
+        pnl = position.pnl
+        logger.info("Trade PnL: %s", pnl)
+        self.risk_manager.register_exit(pnl, reason)
+
+        if self.trade_logger:
+            self.trade_logger.log_trade(
+                symbol=position.symbol,
+                qty=position.exited_qty,
+                entry_price=position.entry_price,
+                exit_price=position.exit_price,
+                pnl=pnl,
+                exit_reason=reason
+            )
+        if self.daily_summary:
+            self.daily_summary.update(pnl)
+
+        logger.info("Exit Reason: %s, Exit Price: %s", reason, position.exit_price)
+        self._publish_risk()
+        self._publish_positions()
+
+    async def _exit_ticket(self, ticket, reason):
+        async with self._order_lock:
+            exit_ticket = await self.orders.submit(
+                ticket.security_id, ticket.symbol, ticket.avg_price, ticket.filled_qty, 'SELL', reduce_only=True
+            )
+        exit_ticket = await exit_ticket.wait()
+        logger.warning("%s: exited late entry fill %s x %s: %s", reason, ticket.symbol, ticket.filled_qty, exit_ticket.status)
+
+    async def flatten_all(self, reason):
+        """Exit every open position concurrently"""
+        positions = self.position_manager.open_positions()
+        if not positions:
+            return
+        logger.warning("Flattening %s position(s): %s", len(positions), reason)
+        await asyncio.gather(*(
+            self.exit_position(position, position.last_price, reason) for position in positions
+        ))
+
+    # IPC
+
+    def _command_pause(self, args):
+        self.paused = True
+        return {'paused': True}
+
+    def _command_resume(self, args):
+        self.paused = False
+        return {'paused': False}
+
+    def _command_kill(self, args):
+        # Runs on the channel thread: the switch blocks entries now, the watcher flattens on the loop
+        self.kill_switch.engage(args.get('reason', 'kill command'))
+        return {'killed': True}
+
+    def _set_state(self, state):
+        self.state = state
+        if self.channel:
+            self.channel.set_heartbeat(state=state)
+            self.channel.publish('state', {'state': state})
+
+    def _publish_positions(self):
+        if self.channel:
+            positions = self.position_manager.open_positions()
+            index_ltp = {slot.underlying: self.index_ltp(slot.underlying) for slot in self.slots}
+            self.channel.set_heartbeat(open_positions=len(positions), index_ltp=index_ltp)
+            self.channel.publish('positions', [p.to_dict() for p in positions])
+            self.channel.publish('latency', {**self.latency, 'orders': self.orders.stats()})
+            self.channel.publish('portfolio', self.portfolio.snapshot())
+
+    def _publish_risk(self):
+        if self.channel:
+            self.channel.publish('risk', self.risk_manager.snapshot())
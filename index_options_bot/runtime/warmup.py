@@ -0,0 +1,78 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+
+from runtime.candles import CandleBuilder, IST
+from utils.instruments import INDEX_SECURITY_IDS
+
+logger = logging.getLogger(__name__)
+
+INTRADAY_INTERVALS = (1, 5, 15, 25, 60)  # minutes supported by Dhan intraday charts
+
+class HistoryWarmup:
+    """
+    Seeds strategies with recent candles before trading starts.
+
+    Reads the last `bars` candles from the local CandleStore, asks the
+    broker only for the gap between the newest cached candle and the last
+    closed one (at most `lookback_days` back when nothing is cached), and
+    stores what it fetched. While trading, record() appends every closed
+    live candle to the store, so a mid-session restart is served locally.
+    """
+
+    def __init__(self, store, broker=None, timeframe_minutes=1, bars=100, lookback_days=5):
+        self.store = store
+        self.broker = broker
+        self.timeframe_minutes = timeframe_minutes
+        self.bars = bars
+        self.lookback_days = lookback_days
+        self._clock = CandleBuilder(timeframe_minutes)
+
+    def load(self, segment, security_id, instrument_type='INDEX', now=None):
+        """Last closed candles for an instrument, filling any gap from the broker"""
+        now = now or time.time()
+        timeframe = self.timeframe_minutes
+        last_closed = self._clock.bucket_start(now) - self._clock.timeframe
+
+        cached = self.store.tail(segment, security_id, timeframe, self.bars, until=last_closed)
+        gap_from = cached[-1].start + self._clock.timeframe if cached else now - self.lookback_days * 86400
+        if gap_from > last_closed:
+            return cached
+        if self.broker is None or timeframe not in INTRADAY_INTERVALS:
+            logger.warning("%s:%s history has a gap from %s; not fetching", segment, security_id, self._fmt(gap_from))
+            return cached
+
+        fetched = self.broker.get_intraday_data(
+            security_id, segment, instrument_type,
+            self._fmt(gap_from), self._fmt(last_closed + self._clock.timeframe), interval=timeframe
+        ) or []
+        fetched = [bar for bar in fetched if gap_from <= bar.start <= last_closed]
+        if fetched:
+            self.store.write(segment, security_id, timeframe, fetched)
+        logger.info("%s:%s: %s cached candles, %s fetched", segment, security_id, len(cached), len(fetched))
+        return (cached + fetched)[-self.bars:]
+
+    async def warm_up(self, slots, now=None):
+        """Load history once per underlying and hand it to every slot on it"""
+        by_underlying = {}
+        for slot in slots:
+            by_underlying.setdefault(slot.underlying, []).append(slot)
+
+        for underlying, underlying_slots in by_underlying.items():
+            security_id = INDEX_SECURITY_IDS.get(underlying)
+            try:
+                bars = await asyncio.to_thread(self.load, 'IDX_I', security_id, 'INDEX', now)
+            except Exception as e:
+                logger.error("Warm-up failed for %s: %s", underlying, e)
+                continue
+            for slot in underlying_slots:
+                ready = slot.strategy.warm_up(bars)
+                logger.info("%s: %s after %s candles", slot.name, 'signal-ready' if ready else 'still warming up', len(bars))
+
+    async def record(self, segment, security_id, bar):
+        await asyncio.to_thread(self.store.write, segment, security_id, self.timeframe_minutes, [bar])
+
+    @staticmethod
+    def _fmt(ts):
+        return datetime.fromtimestamp(ts, IST).strftime('%Y-%m-%d %H:%M:%S')
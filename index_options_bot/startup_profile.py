@@ -0,0 +1,84 @@
+# index_options_bot/startup_profile.py
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BOT_DIR = Path(__file__).parent
+
+# Run in a fresh interpreter so nothing is already in sys.modules
+PROBE = """
+import sys, time, json
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+from utils.market_time import MarketTime
+MarketTime.is_market_open()
+checked = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1e3,
+    'market_check_ms': (checked - imported) * 1e3,
+    'modules': sorted(sys.modules),
+}))
+"""
+
+IMPORTTIME = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def measure_startup(python=sys.executable):
+    """Cold-start timings of `import main` and the first market-hours check, in a fresh interpreter"""
+    started = time.perf_counter()
+    result = subprocess.run([python, '-X', 'importtime', '-c', PROBE], cwd=BOT_DIR,
+                            capture_output=True, text=True, check=True)
+    wall_ms = (time.perf_counter() - started) * 1e3
+
+    modules = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append({
+                'module': name,
+                'self_ms': int(self_us) / 1e3,
+                'cumulative_ms': int(cumulative_us) / 1e3,
+                'depth': len(indent) // 2,
+            })
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report['process_ms'] = wall_ms
+    report['imports'] = modules
+    return report
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Profile bot cold start: per-module import time")
+    parser.add_argument('--top', type=int, default=20, help="Modules to list, by cumulative time")
+    parser.add_argument('--json', dest='json_path', help="Also write the full report to this file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    report = measure_startup()
+
+    print(f"[STARTUP] Process start to exit: {report['process_ms']:.1f} ms")
+    print(f"[STARTUP] import main:          {report['import_ms']:.1f} ms")
+    print(f"[STARTUP] Market-hours check:   {report['market_check_ms']:.1f} ms")
+    heavy = [name for name in ('pandas', 'numpy', 'dhanhq', 'pytz') if name in report['modules']]
+    print(f"[STARTUP] Heavy modules loaded: {', '.join(heavy) or 'none'}")
+
+    print(f"\n{'cumulative ms':>14} {'self ms':>9}  module")
+    for entry in sorted(report['imports'], key=lambda e: e['cumulative_ms'], reverse=True)[:args.top]:
+        print(f"{entry['cumulative_ms']:>14.1f} {entry['self_ms']:>9.1f}  {'  ' * entry['depth']}{entry['module']}")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2))
+        print(f"\n[STARTUP] Report written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -1,3 +1,11 @@
-from .supertrend import SuperTrendStrategy
+from utils.lazy import lazy_exports
 
-__all__ = ['SuperTrendStrategy']
\ No newline at end of file
+# Submodules load on first use of a name (see utils/lazy.py)
+_EXPORTS = {
+    'SuperTrendStrategy': 'supertrend',
+    'MultiTimeframeSuperTrend': 'multi_timeframe',
+    'MultiTimeframeSuperTrendStrategy': 'multi_timeframe',
+}
+
+__all__ = list(_EXPORTS)
+__getattr__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,143 @@
+import logging
+
+from indicators import IndicatorGraph, SuperTrend, ATR
+from runtime.candles import Bar, CandleBuilder
+
+logger = logging.getLogger(__name__)
+
+class MultiTimeframeSuperTrend:
+    """
+    SuperTrend on several timeframes of one instrument, fed only base bars.
+
+    Higher-timeframe bars are aggregated from the base stream as it
+    arrives; each timeframe has its own IndicatorGraph that updates once,
+    when its bar closes. A base bar therefore costs one OHLC merge per
+    timeframe plus one O(1) graph step for each timeframe that closed on
+    it. A higher-timeframe bar whose last base bar is missing closes when
+    the first base bar of a later period arrives, so a gap delays it but
+    never drops it. Other indicators can be added to graphs[i] and share
+    its series; base_graph= shares the base timeframe's graph with other
+    strategies.
+    """
+
+    def __init__(self, base_timeframe, timeframes, period=7, multiplier=4, base_graph=None):
+        self.base_timeframe = base_timeframe
+        self.timeframes = sorted(set([base_timeframe, *timeframes]))
+        for timeframe in self.timeframes:
+            if timeframe % base_timeframe:
+                raise ValueError(f"{timeframe}m is not a multiple of the {base_timeframe}m base timeframe")
+        self.base_index = self.timeframes.index(base_timeframe)
+        self.graphs = [IndicatorGraph() for _ in self.timeframes]
+        if base_graph is not None:
+            self.graphs[self.base_index] = base_graph
+        self.supertrends = [graph.add(SuperTrend(period, multiplier)) for graph in self.graphs]
+        self.atr = self.graphs[self.base_index].add(ATR(period))  # shared with the base SuperTrend
+        self._buckets = [CandleBuilder(timeframe) for timeframe in self.timeframes]
+        self._forming = [None] * len(self.timeframes)
+
+    def update(self, bar):
+        """Add a closed base bar; returns the indexes of timeframes that closed"""
+        closed = []
+        bar_end = bar.start + self.base_timeframe * 60
+        for i, bucket in enumerate(self._buckets):
+            start = bucket.bucket_start(bar.start)
+            forming = self._forming[i]
+            if forming is not None and forming.start != start:
+                # Its last base bar never came (feed gap, halt): close it as it stands
+                self.graphs[i].update(forming)
+                closed.append(i)
+                forming = None
+            if forming is None:
+                forming = Bar(start, bar.open, bar.high, bar.low, bar.close, bar.volume)
+            else:
+                forming = Bar(
+                    start, forming.open, max(forming.high, bar.high), min(forming.low, bar.low),
+                    bar.close, forming.volume + bar.volume
+                )
+
+            if bar_end >= start + bucket.timeframe:
+                self._forming[i] = None
+                self.graphs[i].update(forming)
+                if not closed or closed[-1] != i:
+                    closed.append(i)
+            else:
+                self._forming[i] = forming
+        return closed
+
+    def directions(self):
+        """Direction per timeframe (1 up, -1 down, None warming up), lowest first"""
+        return tuple(st.direction for st in self.supertrends)
+
+    def combined(self):
+        """1 or -1 when every timeframe agrees, else 0"""
+        directions = self.directions()
+        if directions[0] is not None and all(d == directions[0] for d in directions):
+            return directions[0]
+        return 0
+
+class MultiTimeframeSuperTrendStrategy:
+    """
+    SuperTrend entries on the base timeframe, confirmed by higher ones.
+
+    Drop-in for SuperTrendStrategy in a StrategySlot: a BUY/SELL signal
+    is raised when the base SuperTrend flips and every confirmation
+    timeframe already points the same way.
+    """
+
+    def __init__(self, period=7, multiplier=4, base_timeframe=1, confirm_timeframes=(5, 15), graph=None):
+        self.period = period
+        self.multiplier = multiplier
+        self.engine = MultiTimeframeSuperTrend(base_timeframe, confirm_timeframes, period, multiplier, base_graph=graph)
+        self.signals = []
+        self.current_trend = None
+        self._last = None
+
+    def add_price_data(self, timestamp, open_price, high, low, close, volume=0):
+        """Add new price candle (timestamp is the candle start)"""
+        start = timestamp.timestamp() if hasattr(timestamp, 'timestamp') else timestamp
+        self._last = (timestamp, close)
+        self.engine.update(Bar(start, open_price, high, low, close, volume))
+
+    def warm_up(self, bars):
+        """Seed every timeframe from history without emitting a signal"""
+        for bar in bars:
+            self.add_price_data(bar.timestamp, bar.open, bar.high, bar.low, bar.close, bar.volume)
+        self.current_trend = self.engine.supertrends[self.engine.base_index].direction
+        if self.current_trend is not None:
+            logger.info("Warmed up on %s candles: %s, %s", len(bars), self.get_current_trend(), self.engine.directions())
+        return self.current_trend is not None
+
+    def generate_signal(self):
+        base = self.engine.supertrends[self.engine.base_index]
+        direction = base.direction
+        if direction is None:
+            return None
+
+        signal = None
+        if self.current_trend is None:
+            logger.info("Initial trend set: %s", 'UPTREND' if direction == 1 else 'DOWNTREND')
+        elif self.current_trend != direction:
+            directions = self.engine.directions()
+            if self.engine.combined() == direction:
+                timestamp, close = self._last
+                signal = {
+                    'type': 'BUY' if direction == 1 else 'SELL',
+                    'timestamp': timestamp,
+                    'price': close,
+                    'supertrend': base.value,
+                    'atr': self.engine.atr.value,
+                    'directions': dict(zip(self.engine.timeframes, directions)),
+                    'reason': f"SuperTrend changed to {'UPTREND' if direction == 1 else 'DOWNTREND'} "
+                              f"on {self.engine.timeframes}m"
+                }
+                self.signals.append(signal)
+                logger.info("%s %s SIGNAL confirmed on all timeframes at %s", '🟢' if direction == 1 else '🔴', signal['type'], close)
+            else:
+                logger.info("Trend flip to %s not confirmed: %s", direction, directions)
+        self.current_trend = direction
+        return signal
+
+    def get_current_trend(self):
+        if self.current_trend is None:
+            return "UNKNOWN"
+        return "UPTREND" if self.current_trend == 1 else "DOWNTREND"
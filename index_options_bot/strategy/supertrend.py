@@ -1,23 +1,32 @@
-import pandas as pd
-import numpy as np
 import logging
-from datetime import datetime, timedelta
-from config.settings import config
+from indicators import IndicatorGraph, SuperTrend, ATR
+from runtime.candles import Bar
 
 logger = logging.getLogger(__name__)
 
 class SuperTrendStrategy:
-    """SuperTrend-based trading strategy for options"""
+    """
+    SuperTrend-based trading strategy for options.
+
+    Each closed candle is one O(1) step of a streaming IndicatorGraph.
+    Pass graph= to share one graph (True Range, ATR and any other series)
+    between the strategies of one underlying.
+    """
     
-    def __init__(self, period=7, multiplier=4):
+    def __init__(self, period=7, multiplier=4, graph=None):
         self.period = period
         self.multiplier = multiplier
+        self.graph = graph if graph is not None else IndicatorGraph()
+        self.supertrend = self.graph.add(SuperTrend(period, multiplier))
+        self.atr = self.graph.add(ATR(period))  # the SuperTrend's own ATR series
         self.price_data = []
         self.signals = []
         self.current_trend = None
         
     def add_price_data(self, timestamp, open_price, high, low, close, volume=0):
-        """Add new price candle to the dataset"""
+        """Add new price candle (timestamp is the candle start)"""
+        start = timestamp.timestamp() if hasattr(timestamp, 'timestamp') else timestamp
+        self.graph.update(Bar(start, open_price, high, low, close, volume))
         self.price_data.append({
             'timestamp': timestamp,
             'open': open_price,
@@ -27,75 +36,43 @@ class SuperTrendStrategy:
             'volume': volume
         })
         
-        # Keep only last 100 candles for efficiency
+        # Keep only the last 100 candles; the indicators do not read them
         if len(self.price_data) > 100:
             self.price_data = self.price_data[-100:]
     
+    def warm_up(self, bars):
+        """
+        Seed candles and trend from history without emitting a signal,
+        so the next live candle can already produce one.
+        """
+        for bar in bars:
+            self.add_price_data(
+                timestamp=bar.timestamp,
+                open_price=bar.open,
+                high=bar.high,
+                low=bar.low,
+                close=bar.close,
+                volume=bar.volume
+            )
+        if self.supertrend.direction is not None:
+            self.current_trend = self.supertrend.direction
+            logger.info("Warmed up on %s candles: %s", len(bars), self.get_current_trend())
+        return self.current_trend is not None
+    
     def calculate_supertrend(self):
-        """Calculate SuperTrend indicator"""
-        if len(self.price_data) < self.period:
-            logger.warning(f"Not enough data for SuperTrend calculation. Need {self.period}, have {len(self.price_data)}")
+        """Latest SuperTrend values, or None while it is warming up"""
+        if self.supertrend.direction is None:
+            logger.warning("Not enough data for SuperTrend calculation. Need %s, have %s", self.period + 1, self.supertrend.bars)
             return None
         
-        try:
-            # Convert to DataFrame
-            df = pd.DataFrame(self.price_data)
-            
-            # Calculate True Range (TR)
-            df['h-l'] = df['high'] - df['low']
-            df['h-pc'] = abs(df['high'] - df['close'].shift(1))
-            df['l-pc'] = abs(df['low'] - df['close'].shift(1))
-            df['tr'] = df[['h-l', 'h-pc', 'l-pc']].max(axis=1)
-            
-            # Calculate ATR (Average True Range)
-            df['atr'] = df['tr'].rolling(window=self.period).mean()
-            
-            # Calculate basic bands
-            df['basic_ub'] = (df['high'] + df['low']) / 2 + (self.multiplier * df['atr'])
-            df['basic_lb'] = (df['high'] + df['low']) / 2 - (self.multiplier * df['atr'])
-            
-            # Calculate final bands
-            df['final_ub'] = 0.0
-            df['final_lb'] = 0.0
-            
-            for i in range(self.period, len(df)):
-                # Upper Band
-                if df['basic_ub'].iloc[i] < df['final_ub'].iloc[i-1] or df['close'].iloc[i-1] > df['final_ub'].iloc[i-1]:
-                    df.loc[df.index[i], 'final_ub'] = df['basic_ub'].iloc[i]
-                else:
-                    df.loc[df.index[i], 'final_ub'] = df['final_ub'].iloc[i-1]
-                
-                # Lower Band
-                if df['basic_lb'].iloc[i] > df['final_lb'].iloc[i-1] or df['close'].iloc[i-1] < df['final_lb'].iloc[i-1]:
-                    df.loc[df.index[i], 'final_lb'] = df['basic_lb'].iloc[i]
-                else:
-                    df.loc[df.index[i], 'final_lb'] = df['final_lb'].iloc[i-1]
-            
-            # Calculate SuperTrend
-            df['supertrend'] = 0.0
-            df['direction'] = 0
-            
-            for i in range(self.period, len(df)):
-                if df['close'].iloc[i] <= df['final_ub'].iloc[i]:
-                    df.loc[df.index[i], 'supertrend'] = df['final_ub'].iloc[i]
-                    df.loc[df.index[i], 'direction'] = -1  # Downtrend
-                else:
-                    df.loc[df.index[i], 'supertrend'] = df['final_lb'].iloc[i]
-                    df.loc[df.index[i], 'direction'] = 1  # Uptrend
-            
-            # Get the latest values
-            latest = df.iloc[-1]
-            
-            return {
-                'supertrend': latest['supertrend'],
-                'direction': latest['direction'],
-                'close': latest['close'],
-                'timestamp': latest['timestamp']
-            }
-                
-        except Exception as e:
-            logger.error(f"Error calculating SuperTrend: {str(e)}")
-            return None
+        latest = self.price_data[-1]
+        return {
+            'supertrend': self.supertrend.value,
+            'direction': self.supertrend.direction,
+            'atr': self.atr.value,
+            'close': latest['close'],
+            'timestamp': latest['timestamp']
+        }
     
     def generate_signal(self):
         """Generate trading signal based on SuperTrend"""
@@ -113,7 +90,7 @@ class SuperTrendStrategy:
         # Check for trend change
         if self.current_trend is None:
             self.current_trend = direction
-            logger.info(f"Initial trend set: {'UPTREND' if direction == 1 else 'DOWNTREND'}")
+            logger.info("Initial trend set: %s", 'UPTREND' if direction == 1 else 'DOWNTREND')
         
         elif self.current_trend != direction:
             # Trend changed
@@ -124,9 +101,10 @@ class SuperTrendStrategy:
                     'timestamp': st_data['timestamp'],
                     'price': close,
                     'supertrend': supertrend,
+                    'atr': st_data['atr'],
                     'reason': 'SuperTrend changed to UPTREND'
                 }
-                logger.info(f"🟢 BUY SIGNAL: Price crossed above SuperTrend at {close}")
+                logger.info("🟢 BUY SIGNAL: Price crossed above SuperTrend at %s", close)
             else:
                 # Changed to downtrend - SELL signal
                 signal = {
@@ -134,9 +112,10 @@ class SuperTrendStrategy:
                     'timestamp': st_data['timestamp'],
                     'price': close,
                     'supertrend': supertrend,
+                    'atr': st_data['atr'],
                     'reason': 'SuperTrend changed to DOWNTREND'
                 }
-                logger.info(f"🔴 SELL SIGNAL: Price crossed below SuperTrend at {close}")
+                logger.info("🔴 SELL SIGNAL: Price crossed below SuperTrend at %s", close)
             
             self.current_trend = direction
             self.signals.append(signal)
@@ -150,7 +129,10 @@ class SuperTrendStrategy:
         return "UPTREND" if self.current_trend == 1 else "DOWNTREND"
     
     def reset(self):
-        """Reset strategy state"""
+        """Reset strategy state, on a fresh graph of its own"""
+        self.graph = IndicatorGraph()
+        self.supertrend = self.graph.add(SuperTrend(self.period, self.multiplier))
+        self.atr = self.graph.add(ATR(self.period))
         self.price_data = []
         self.signals = []
         self.current_trend = None
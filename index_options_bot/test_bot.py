@@ -10,7 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from config.settings import config
 from utils.market_time import MarketTime
-from strategy.supertrend import SuperTrendStrategy
+import asyncio
 import random
 from datetime import datetime
 
@@ -51,6 +51,8 @@ def test_supertrend():
     print("Testing SuperTrend Strategy...")
     print("="*60)
     try:
+        from strategy.supertrend import SuperTrendStrategy
+
         strategy = SuperTrendStrategy(period=7, multiplier=4)
         print(f"✓ Strategy initialized (Period={strategy.period}, Multiplier={strategy.multiplier})")
         
@@ -96,6 +98,293 @@ def test_supertrend():
         traceback.print_exc()
         return False
 
+def test_multi_timeframe():
+    print("\n" + "="*60)
+    print("Testing Multi-Timeframe SuperTrend...")
+    print("="*60)
+    try:
+        from strategy import MultiTimeframeSuperTrend, SuperTrendStrategy
+        from runtime.candles import Bar
+
+        reference = SuperTrendStrategy(period=7, multiplier=2)
+        engine = MultiTimeframeSuperTrend(1, [5, 15], period=7, multiplier=2)
+        start = 1767239100  # 09:15 IST, aligned to 15m
+        price = 150.0
+        five_minute = []
+        for i in range(90):
+            open_price = price
+            price += random.uniform(-3, 3)
+            high = max(open_price, price) + random.uniform(0, 1)
+            low = min(open_price, price) - random.uniform(0, 1)
+            reference.add_price_data(datetime.now(), open_price, high, low, price)
+            closed = engine.update(Bar(start + i * 60, open_price, high, low, price, 0))
+
+            # Incremental base timeframe matches the DataFrame implementation
+            expected = reference.calculate_supertrend()
+            if expected is not None and expected['direction'] != 0:
+                assert engine.directions()[0] == expected['direction']
+                assert abs(engine.supertrends[0].value - expected['supertrend']) < 1e-9
+            if 1 in closed:
+                five_minute.append(i)
+
+        print(f"  - Directions (1m, 5m, 15m): {engine.directions()}, combined {engine.combined()}")
+        assert five_minute == list(range(4, 90, 5))
+        assert engine.supertrends[1].bars == 18 and engine.supertrends[2].bars == 6
+        print("✓ Incremental SuperTrend matches; 5m/15m built from 1m bars")
+        return True
+    except Exception as e:
+        print(f"✗ Multi-timeframe error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+class _FakeMarket:
+    """Market that is open now and closes after a fixed number of seconds"""
+    def __init__(self, session_seconds):
+        self.closes_at = datetime.now().timestamp() + session_seconds
+    def seconds_until_open(self):
+        return 0.0
+    def seconds_until_close(self):
+        return max(self.closes_at - datetime.now().timestamp(), 0.0)
+
+class _FakeFeed:
+    """Indices fixed at 23010; option prices follow a script, then hold"""
+    def __init__(self, option_prices):
+        self.option_prices = list(option_prices)
+        self.calls = []
+    def get_ltp_batch(self, instruments):
+        self.calls.append(list(instruments))
+        prices = {}
+        for segment, security_id in instruments:
+            if segment == 'IDX_I':
+                prices[(segment, security_id)] = 23010.0
+            elif len(self.option_prices) > 1:
+                prices[(segment, security_id)] = self.option_prices.pop(0)
+            else:
+                prices[(segment, security_id)] = self.option_prices[0]
+        return prices
+
+class _FakeInstruments:
+    def get_nearest_expiry(self, underlying=None):
+        return '2026-01-01'
+    def get_atm_strike(self, index_ltp, underlying=None):
+        return round(index_ltp / 50) * 50
+    def get_option_security_id(self, expiry, strike, option_type='CE', underlying=None):
+        return 100000 + strike
+
+class _FakeExecutor:
+    def __init__(self):
+        self.orders = []
+    def place_order(self, security_id, symbol, price, quantity, order_type='BUY'):
+        self.orders.append((order_type, symbol, price, quantity))
+        return {'status': 'success'}
+
+def test_market_data_bus():
+    print("\n" + "="*60)
+    print("Testing Market Data Bus...")
+    print("="*60)
+    try:
+        from runtime import MarketDataBus
+
+        feed = _FakeFeed([100])
+        bus = MarketDataBus(feed, timeframe_minutes=1)
+        bars = {'a': [], 'b': []}
+
+        async def on_bar_a(bar):
+            bars['a'].append(bar)
+        async def on_bar_b(bar):
+            bars['b'].append(bar)
+
+        async def session():
+            # Two strategies on one index and one option position
+            sub_a = bus.subscribe('IDX_I', 13, on_bar=on_bar_a)
+            bus.subscribe('IDX_I', 13, on_bar=on_bar_b)
+            option = bus.subscribe('NSE_FNO', 123, on_tick=lambda ltp: asyncio.sleep(0))
+            await bus.poll()
+            await bus.close_due(bus.next_close(0) + 10**10)
+            bus.unsubscribe(option)
+            bus.unsubscribe(sub_a)
+            await bus.poll()
+
+        asyncio.run(session())
+        print(f"  - Broker calls: {[len(call) for call in feed.calls]}")
+
+        assert feed.calls == [[('IDX_I', 13), ('NSE_FNO', 123)], [('IDX_I', 13)]]
+        assert len(bars['a']) == 1 and bars['a'][0] is bars['b'][0]
+        assert bars['a'][0].close == 23010.0
+        print("✓ One batched poll per interval, one shared bar per instrument")
+        return True
+    except Exception as e:
+        print(f"✗ Market data bus error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def test_strike_ladder():
+    print("\n" + "="*60)
+    print("Testing Strike Ladder...")
+    print("="*60)
+    try:
+        import pandas as pd
+        from runtime import MarketDataBus, StrikeLadder
+
+        class Instruments(_FakeInstruments):
+            def get_strike_interval(self, underlying=None):
+                return 50
+            def filter_options(self, underlying='NIFTY'):
+                return pd.DataFrame([
+                    {'expiry': '2026-01-01', 'strike': strike, 'option_type': option_type,
+                     'security_id': 100000 + strike + (option_type == 'PE')}
+                    for strike in range(22500, 23550, 50) for option_type in ('CE', 'PE')
+                ])
+
+        bus = MarketDataBus(_FakeFeed([100]), timeframe_minutes=1)
+        ladder = StrikeLadder(bus, Instruments(), 'NIFTY', 13, strikes_each_side=2)
+        assert ladder.start()
+        asyncio.run(bus.poll())  # index 23010 -> ATM 23000, then quotes for the window
+        asyncio.run(bus.poll())
+
+        strike, security_id, ltp = ladder.select('CE')
+        assert (strike, security_id, ltp) == (23000, 123000, 100)
+        assert len(ladder.subscribed()) == 10
+        print(f"  - ATM {strike:g}, {len(ladder.subscribed())} options subscribed")
+
+        # Noise around the 23025 midpoint does not move ATM
+        for index_ltp in (23030, 23020, 23036, 23014):
+            assert not ladder.update(index_ltp)
+        assert ladder.update(23040) and ladder.atm == 23050
+        assert ladder.select('PE')[1] == 123051
+        assert ('NSE_FNO', 122900) not in ladder.subscribed()
+        assert ('NSE_FNO', 123150) in ladder.subscribed()
+        assert ladder.update(22600) and ladder.atm == 22600 and ladder.shifts == 2
+        assert len(ladder.subscribed()) == 10
+
+        ladder.stop()
+        assert bus.instruments() == []
+        print("✓ Ladder shifts with hysteresis and resubscribes incrementally")
+        return True
+    except Exception as e:
+        print(f"✗ Strike ladder error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def test_runtime():
+    print("\n" + "="*60)
+    print("Testing Trading Runtime...")
+    print("="*60)
+    try:
+        from runtime import TradingRuntime, StrategySlot
+        from risk.risk_manager import RiskManager
+        from strategy.supertrend import SuperTrendStrategy
+        from positions.position_manager import PositionManager
+
+        executor = _FakeExecutor()
+        risk_manager = RiskManager(max_trades_per_day=5, max_loss_per_day=10000, cooldown_minutes=0)
+        slot = StrategySlot('NIFTY', SuperTrendStrategy(period=7, multiplier=4))
+        # Entry at 100, rally to 120 trails the SL to 110, drop to 105 stops out
+        runtime = TradingRuntime(
+            price_source=_FakeFeed([100, 100, 110, 120, 105, 105]),
+            instruments=_FakeInstruments(),
+            executor=executor,
+            slots=[slot],
+            risk_manager=risk_manager,
+            position_manager=PositionManager(trail_percent=10),
+            quantity=50,
+            poll_interval=0.01,
+            market_time=_FakeMarket(session_seconds=0.6),
+            ladder_strikes=0
+        )
+
+        async def session():
+            task = asyncio.create_task(runtime.run())
+            while runtime.index_ltp('NIFTY') is None:
+                await asyncio.sleep(0.01)
+            first = await runtime.enter_position(slot, 'CE')
+            while first.is_open:
+                await asyncio.sleep(0.01)
+            second = await runtime.enter_position(slot, 'PE')
+            await task
+            return first, second
+
+        first, second = asyncio.run(session())
+        print(f"  - First trade: {first.exit_reason} @ {first.exit_price} (PnL {first.pnl})")
+        print(f"  - Second trade: {second.exit_reason} @ {second.exit_price}")
+
+        assert first.exit_reason == 'TRAILING_SL' and first.pnl == 250
+        assert second.exit_reason == 'SESSION_END'
+        assert [o[0] for o in executor.orders] == ['BUY', 'SELL', 'BUY', 'SELL']
+        assert risk_manager.trades_taken == 2
+        assert runtime.state == 'stopped'
+        print("✓ Session ran, trailed, stopped out and flattened at close")
+        return True
+    except Exception as e:
+        print(f"✗ Runtime error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def test_kill_switch():
+    print("\n" + "="*60)
+    print("Testing Kill Switch...")
+    print("="*60)
+    try:
+        import tempfile
+        from pathlib import Path
+        from execution import KillSwitch
+        from runtime import TradingRuntime, StrategySlot
+        from risk.risk_manager import RiskManager
+        from strategy.supertrend import SuperTrendStrategy
+        from positions.position_manager import PositionManager
+
+        path = Path(tempfile.mkdtemp()) / 'kill_switch'
+        executor = _FakeExecutor()
+        slots = [StrategySlot('NIFTY', SuperTrendStrategy(period=7, multiplier=4)),
+                 StrategySlot('BANKNIFTY', SuperTrendStrategy(period=7, multiplier=4))]
+        runtime = TradingRuntime(
+            price_source=_FakeFeed([100]),
+            instruments=_FakeInstruments(),
+            executor=executor,
+            slots=slots,
+            risk_manager=RiskManager(max_trades_per_day=5, max_loss_per_day=10000, cooldown_minutes=0),
+            position_manager=PositionManager(trail_percent=10),
+            quantity=50,
+            poll_interval=0.01,
+            market_time=_FakeMarket(session_seconds=30),
+            ladder_strikes=0,
+            kill_switch=KillSwitch(path)
+        )
+        # Another process (the API server, another bot) maps the same file
+        other = KillSwitch(path)
+
+        async def session():
+            task = asyncio.create_task(runtime.run())
+            while runtime.index_ltp('BANKNIFTY') is None:
+                await asyncio.sleep(0.01)
+            positions = [await runtime.enter_position(slot, 'CE') for slot in slots]
+            other.engage('test')
+            await asyncio.wait_for(task, 5)
+            return positions
+
+        positions = asyncio.run(session())
+        stats = runtime.kill_stats
+        print(f"  - {stats}")
+
+        assert all(p.exit_reason == 'KILL_SWITCH' for p in positions)
+        assert [o[0] for o in executor.orders] == ['BUY', 'BUY', 'SELL', 'SELL']
+        assert stats['reason'] == 'test' and stats['flattened_positions'] == 2
+        assert stats['trigger_to_flat_ms'] < 1000
+        assert runtime.state == 'stopped'
+        other.release()
+        assert not runtime.kill_switch.engaged
+        print(f"✓ Flat {stats['trigger_to_flat_ms']} ms after another process engaged the switch")
+        return True
+    except Exception as e:
+        print(f"✗ Kill switch error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
 def main():
     print("\n" + "="*60)
     print("INDEX OPTIONS TRADING BOT - COMPONENT TEST")
@@ -105,6 +394,11 @@ def main():
     results.append(("Configuration", test_config()))
     results.append(("Market Time", test_market_time()))
     results.append(("SuperTrend Strategy", test_supertrend()))
+    results.append(("Multi-Timeframe SuperTrend", test_multi_timeframe()))
+    results.append(("Market Data Bus", test_market_data_bus()))
+    results.append(("Strike Ladder", test_strike_ladder()))
+    results.append(("Trading Runtime", test_runtime()))
+    results.append(("Kill Switch", test_kill_switch()))
     
     print("\n" + "="*60)
     print("TEST SUMMARY")
@@ -1,5 +1,17 @@
-from .dhan_client import DhanClient
-from .instruments import InstrumentManager
-from .market_time import MarketTime
+from .lazy import lazy_exports
 
-__all__ = ['DhanClient', 'InstrumentManager', 'MarketTime']
\ No newline at end of file
+# Submodules load on first use of a name (see utils/lazy.py)
+_EXPORTS = {
+    'DhanClient': 'dhan_client',
+    'InstrumentManager': 'instruments',
+    'MarketTime': 'market_time',
+    'MarketCalendar': 'market_calendar',
+    'BotChannel': 'ipc',
+    'CandleStore': 'candle_store',
+    'HistoryDownloader': 'history_downloader',
+    'setup_logging': 'log_pipeline',
+    'shutdown_logging': 'log_pipeline',
+}
+
+__all__ = list(_EXPORTS)
+__getattr__ = lazy_exports(__name__, _EXPORTS)
\ No newline at end of file
@@ -0,0 +1,91 @@
+import csv
+import os
+from datetime import datetime
+
+from runtime.candles import Bar
+from utils.ist import IST
+
+FIELDS = ('start', 'open', 'high', 'low', 'close', 'volume')
+
+class CandleStore:
+    """
+    Local cache of closed candles.
+
+    One CSV per instrument, timeframe and IST trading day:
+    <root>/<segment>/<security_id>/<timeframe>m/<YYYY-MM-DD>.csv
+    Writes merge with what is already on disk (a bar's start is its key)
+    and replace the file atomically, so readers never see a partial day.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def _dir(self, segment, security_id, timeframe):
+        return self.root / segment / str(security_id) / f"{timeframe}m"
+
+    @staticmethod
+    def day_of(ts):
+        return datetime.fromtimestamp(ts, IST).strftime('%Y-%m-%d')
+
+    def days(self, segment, security_id, timeframe):
+        path = self._dir(segment, security_id, timeframe)
+        if not path.exists():
+            return []
+        return sorted(p.stem for p in path.glob('*.csv'))
+
+    def read_day(self, segment, security_id, timeframe, day):
+        path = self._dir(segment, security_id, timeframe) / f"{day}.csv"
+        try:
+            with open(path, 'r', newline='') as f:
+                return [
+                    Bar(float(row['start']), float(row['open']), float(row['high']),
+                        float(row['low']), float(row['close']), float(row['volume']))
+                    for row in csv.DictReader(f)
+                ]
+        except FileNotFoundError:
+            return []
+
+    def write(self, segment, security_id, timeframe, bars):
+        """Merge bars into their day files; returns the number of bars written"""
+        by_day = {}
+        for bar in bars:
+            by_day.setdefault(self.day_of(bar.start), []).append(bar)
+
+        directory = self._dir(segment, security_id, timeframe)
+        directory.mkdir(parents=True, exist_ok=True)
+        for day, new_bars in by_day.items():
+            merged = {bar.start: bar for bar in self.read_day(segment, security_id, timeframe, day)}
+            merged.update((bar.start, bar) for bar in new_bars)
+
+            path = directory / f"{day}.csv"
+            tmp = path.with_suffix('.csv.tmp')
+            with open(tmp, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(FIELDS)
+                writer.writerows(merged[start] for start in sorted(merged))
+            os.replace(tmp, path)
+        return sum(len(b) for b in by_day.values())
+
+    def tail(self, segment, security_id, timeframe, count, until=None):
+        """Last `count` bars starting at or before `until`, oldest first"""
+        bars = []
+        for day in reversed(self.days(segment, security_id, timeframe)):
+            day_bars = self.read_day(segment, security_id, timeframe, day)
+            if until is not None:
+                day_bars = [bar for bar in day_bars if bar.start <= until]
+            bars = day_bars + bars
+            if len(bars) >= count:
+                break
+        return bars[-count:] if count else []
+
+    def range(self, segment, security_id, timeframe, from_ts, to_ts):
+        """Bars with from_ts <= start <= to_ts, oldest first"""
+        first, last = self.day_of(from_ts), self.day_of(to_ts)
+        bars = []
+        for day in self.days(segment, security_id, timeframe):
+            if first <= day <= last:
+                bars.extend(
+                    bar for bar in self.read_day(segment, security_id, timeframe, day)
+                    if from_ts <= bar.start <= to_ts
+                )
+        return bars
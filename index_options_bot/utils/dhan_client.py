@@ -1,6 +1,6 @@
 import logging
-from dhanhq import dhanhq
 from config.settings import config
+from runtime.candles import Bar
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +15,7 @@ class DhanClient:
         """Authenticate with Dhan API"""
         try:
             logger.info("Authenticating with Dhan API...")
+            from dhanhq import dhanhq  # heavy (pandas, requests); only needed once we talk to Dhan
             self.client = dhanhq(config.DHAN_CLIENT_ID, config.DHAN_ACCESS_TOKEN)
             
             # Validate connection by fetching fund limits
@@ -24,17 +25,17 @@ class DhanClient:
                 if funds['status'] == 'success':
                     self.authenticated = True
                     logger.info("✓ Authentication successful")
-                    logger.info(f"Available Balance: ₹{funds.get('data', {}).get('availabelBalance', 'N/A')}")
+                    logger.info("Available Balance: ₹%s", funds.get('data', {}).get('availabelBalance', 'N/A'))
                     return True
                 else:
-                    logger.error(f"Authentication failed: {funds.get('remarks', 'Unknown error')}")
+                    logger.error("Authentication failed: %s", funds.get('remarks', 'Unknown error'))
                     return False
             else:
                 logger.error("Authentication failed: Invalid response from Dhan API")
                 return False
                 
         except Exception as e:
-            logger.error(f"Authentication error: {str(e)}")
+            logger.error("Authentication error: %s", e)
             self.authenticated = False
             return False
     
@@ -46,17 +47,40 @@ class DhanClient:
     
     def get_ltp(self, security_id, exchange_segment):
         """Get Last Traded Price for a security"""
+        return self.get_ltp_batch([(exchange_segment, security_id)]).get((exchange_segment, security_id))
+    
+    def get_ltp_batch(self, instruments):
+        """
+        Get Last Traded Prices for many securities in one request.
+        
+        instruments: iterable of (exchange_segment, security_id)
+        Returns {(exchange_segment, security_id): ltp} for those quoted
+        """
         if not self.authenticated:
             raise Exception("Not authenticated. Call authenticate() first.")
         
+        instruments = list(instruments)
+        securities = {}
+        for exchange_segment, security_id in instruments:
+            securities.setdefault(exchange_segment, []).append(int(security_id))
+        
         try:
-            response = self.client.get_ltp_data(exchange_segment, str(security_id))
-            if response and response.get('status') == 'success':
-                return response.get('data', {}).get('LTP')
-            return None
+            response = self.client.ticker_data(securities)
+            if not response or response.get('status') != 'success':
+                logger.error("Error fetching LTP batch: %s", response.get('remarks') if response else 'no response')
+                return {}
+            
+            payload = response.get('data') or {}
+            quotes = payload.get('data', payload)
+            prices = {}
+            for exchange_segment, security_id in instruments:
+                quote = quotes.get(exchange_segment, {}).get(str(int(security_id)))
+                if quote and quote.get('last_price') is not None:
+                    prices[(exchange_segment, security_id)] = quote['last_price']
+            return prices
         except Exception as e:
-            logger.error(f"Error fetching LTP for security {security_id}: {str(e)}")
-            return None
+            logger.error("Error fetching LTP batch (%s securities): %s", len(instruments), e)
+            return {}
     
     def get_historical_data(self, security_id, exchange_segment, instrument_type, from_date, to_date):
         """Get historical candle data"""
@@ -73,7 +97,40 @@ class DhanClient:
             )
             return response
         except Exception as e:
-            logger.error(f"Error fetching historical data: {str(e)}")
+            logger.error("Error fetching historical data: %s", e)
+            return None
+    
+    def get_intraday_data(self, security_id, exchange_segment, instrument_type, from_date, to_date, interval=1):
+        """
+        Get intraday candles as a list of Bar (oldest first).
+        
+        from_date/to_date: 'YYYY-MM-DD HH:MM:SS' (IST); interval in minutes
+        """
+        if not self.authenticated:
+            raise Exception("Not authenticated. Call authenticate() first.")
+        
+        try:
+            response = self.client.intraday_minute_data(
+                security_id=str(security_id),
+                exchange_segment=exchange_segment,
+                instrument_type=instrument_type,
+                from_date=from_date,
+                to_date=to_date,
+                interval=interval
+            )
+            if not response or response.get('status') != 'success':
+                logger.error("Error fetching intraday data for %s: %s", security_id, response.get('remarks') if response else 'no response')
+                return None
+            
+            data = response.get('data') or {}
+            timestamps = data.get('timestamp') or []
+            volume = data.get('volume') or [0] * len(timestamps)  # indices have no volume
+            return [
+                Bar(*row) for row in zip(timestamps, data.get('open', []), data.get('high', []),
+                                         data.get('low', []), data.get('close', []), volume)
+            ]
+        except Exception as e:
+            logger.error("Error fetching intraday data: %s", e)
             return None
     
     def place_order(self, security_id, exchange_segment, transaction_type, quantity, 
@@ -94,7 +151,7 @@ class DhanClient:
             )
             return response
         except Exception as e:
-            logger.error(f"Error placing order: {str(e)}")
+            logger.error("Error placing order: %s", e)
             return None
     
     def get_order_status(self, order_id):
@@ -106,5 +163,27 @@ class DhanClient:
             response = self.client.get_order_by_id(order_id)
             return response
         except Exception as e:
-            logger.error(f"Error fetching order status: {str(e)}")
-            return None
\ No newline at end of file
+            logger.error("Error fetching order status: %s", e)
+            return None
+    
+    def get_order_list(self):
+        """Get all of today's orders with their latest status"""
+        if not self.authenticated:
+            raise Exception("Not authenticated. Call authenticate() first.")
+        
+        try:
+            return self.client.get_order_list()
+        except Exception as e:
+            logger.error("Error fetching order list: %s", e)
+            return None
+    
+    def cancel_order(self, order_id):
+        """Cancel an open order"""
+        if not self.authenticated:
+            raise Exception("Not authenticated. Call authenticate() first.")
+        
+        try:
+            return self.client.cancel_order(order_id)
+        except Exception as e:
+            logger.error("Error cancelling order: %s", e)
+            return None
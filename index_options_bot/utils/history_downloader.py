@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across all tasks"""
+
+    def __init__(self, rate_per_second):
+        self.interval = 1.0 / rate_per_second
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+class HistoryDownloader:
+    """
+    Downloads intraday candles for many instruments into a CandleStore.
+
+    A date range is split into chunks of at most max_chunk_days (the
+    broker's per-request limit), and every (instrument, chunk) job runs
+    concurrently: at most `concurrency` requests in flight and no more
+    than rate_per_second started per second. Failed chunks are retried
+    with exponential backoff; each finished chunk is written straight to
+    the store.
+    """
+
+    def __init__(self, broker, store, interval=1, max_chunk_days=90, concurrency=4,
+                 rate_per_second=5, retries=3, backoff=1.0, on_progress=None):
+        self.broker = broker
+        self.store = store
+        self.interval = interval
+        self.max_chunk_days = max_chunk_days
+        self.concurrency = concurrency
+        self.rate_per_second = rate_per_second
+        self.retries = retries
+        self.backoff = backoff
+        self.on_progress = on_progress
+
+    def chunks(self, from_date, to_date):
+        """[(from, to)] 'YYYY-MM-DD HH:MM:SS' ranges covering the dates, inclusive"""
+        start = datetime.strptime(from_date, '%Y-%m-%d')
+        end = datetime.strptime(to_date, '%Y-%m-%d')
+        ranges = []
+        while start <= end:
+            chunk_end = min(start + timedelta(days=self.max_chunk_days - 1), end)
+            ranges.append((
+                start.strftime('%Y-%m-%d 09:15:00'),
+                chunk_end.strftime('%Y-%m-%d 15:30:00')
+            ))
+            start = chunk_end + timedelta(days=1)
+        return ranges
+
+    async def download(self, instruments, from_date, to_date):
+        """
+        instruments: iterable of (exchange_segment, security_id, instrument_type)
+        Returns a report with job, candle and throughput counts.
+        """
+        jobs = [
+            (instrument, chunk)
+            for instrument in instruments
+            for chunk in self.chunks(from_date, to_date)
+        ]
+        limiter = RateLimiter(self.rate_per_second)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        report = {'jobs': len(jobs), 'done': 0, 'failed': [], 'candles': 0, 'requests': 0}
+        started = time.perf_counter()
+
+        async def run(instrument, chunk):
+            async with semaphore:
+                bars = await self._fetch(instrument, chunk, limiter, report)
+            if bars is None:
+                report['failed'].append((instrument, chunk))
+            elif bars:
+                segment, security_id, _ = instrument
+                await asyncio.to_thread(self.store.write, segment, security_id, self.interval, bars)
+                report['candles'] += len(bars)
+            report['done'] += 1
+            if self.on_progress:
+                self.on_progress(report['done'], report['jobs'], report['candles'])
+
+        await asyncio.gather(*(run(instrument, chunk) for instrument, chunk in jobs))
+
+        elapsed = time.perf_counter() - started
+        report['seconds'] = round(elapsed, 3)
+        report['candles_per_second'] = round(report['candles'] / elapsed, 1) if elapsed else 0
+        logger.info(
+            "Downloaded %s candles in %s chunks (%s/s), %s failed",
+            report['candles'], report['done'], report['candles_per_second'], len(report['failed'])
+        )
+        return report
+
+    async def _fetch(self, instrument, chunk, limiter, report):
+        segment, security_id, instrument_type = instrument
+        for attempt in range(self.retries + 1):
+            await limiter.wait()
+            report['requests'] += 1
+            try:
+                bars = await asyncio.to_thread(
+                    self.broker.get_intraday_data,
+                    security_id, segment, instrument_type, chunk[0], chunk[1], self.interval
+                )
+            except Exception as e:
+                logger.warning("%s:%s %s..%s failed: %s", segment, security_id, chunk[0][:10], chunk[1][:10], e)
+                bars = None
+            if bars is not None:
+                return bars
+            if attempt < self.retries:
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+        logger.error("Giving up on %s:%s %s..%s", segment, security_id, chunk[0][:10], chunk[1][:10])
+        return None
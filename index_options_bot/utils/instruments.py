@@ -1,4 +1,3 @@
-import pandas as pd
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -6,6 +5,20 @@ from config.settings import config
 
 logger = logging.getLogger(__name__)
 
+# Dhan security IDs of the underlying indices (IDX_I segment)
+INDEX_SECURITY_IDS = {
+    'NIFTY': 13,
+    'BANKNIFTY': 25,
+    'FINNIFTY': 27,
+}
+
+# Listed strike spacing per underlying; STRIKE_INTERVAL overrides INDEX_NAME's
+STRIKE_INTERVALS = {
+    'NIFTY': 50,
+    'BANKNIFTY': 100,
+    'FINNIFTY': 50,
+}
+
 class InstrumentManager:
     """Manage instrument data for options trading"""
     
@@ -19,6 +32,7 @@ class InstrumentManager:
     
     def download_instruments(self):
         """Download NFO instrument master from Dhan API"""
+        import pandas as pd  # deferred: pandas costs ~250 ms to import
         try:
             logger.info("Downloading NFO instruments...")
             
@@ -35,27 +49,28 @@ class InstrumentManager:
             
             # Save to CSV
             self.instruments_df.to_csv(self.instruments_file, index=False)
-            logger.info(f"✓ Instruments saved to {self.instruments_file}")
+            logger.info("✓ Instruments saved to %s", self.instruments_file)
             
             return True
             
         except Exception as e:
-            logger.error(f"Error downloading instruments: {str(e)}")
+            logger.error("Error downloading instruments: %s", e)
             return False
     
     def load_instruments(self):
         """Load instruments from local CSV"""
+        import pandas as pd
         try:
             if self.instruments_file.exists():
-                logger.info(f"Loading instruments from {self.instruments_file}")
+                logger.info("Loading instruments from %s", self.instruments_file)
                 self.instruments_df = pd.read_csv(self.instruments_file)
-                logger.info(f"✓ Loaded {len(self.instruments_df)} instruments")
+                logger.info("✓ Loaded %s instruments", len(self.instruments_df))
                 return True
             else:
                 logger.warning("Instrument file not found. Downloading...")
                 return self.download_instruments()
         except Exception as e:
-            logger.error(f"Error loading instruments: {str(e)}")
+            logger.error("Error loading instruments: %s", e)
             return False
     
     def filter_options(self, underlying='NIFTY'):
@@ -68,17 +83,21 @@ class InstrumentManager:
             (self.instruments_df['instrument_type'] == 'OPTIDX')
         ]
         
-        logger.info(f"Filtered {len(filtered)} {underlying} options")
+        logger.info("Filtered %s %s options", len(filtered), underlying)
         return filtered
     
-    def get_nearest_expiry(self):
+    def get_nearest_expiry(self, underlying=None):
         """Get nearest valid weekly expiry"""
+        import pandas as pd
         try:
             if self.instruments_df is None:
                 self.load_instruments()
             
             # Get unique expiries and convert to datetime
-            expiries = pd.to_datetime(self.instruments_df['expiry'].unique())
+            df = self.instruments_df
+            if underlying is not None:
+                df = df[df['underlying'] == underlying]
+            expiries = pd.to_datetime(df['expiry'].unique())
             today = datetime.now().date()
             
             # Filter future expiries
@@ -90,48 +109,55 @@ class InstrumentManager:
             
             # Sort and get nearest
             nearest = future_expiries.min()
-            logger.info(f"Nearest expiry: {nearest.strftime('%Y-%m-%d')}")
+            logger.info("Nearest expiry: %s", nearest.strftime('%Y-%m-%d'))
             return nearest.strftime('%Y-%m-%d')
             
         except Exception as e:
-            logger.error(f"Error getting nearest expiry: {str(e)}")
+            logger.error("Error getting nearest expiry: %s", e)
             return None
     
-    def get_atm_strike(self, index_ltp):
+    def get_atm_strike(self, index_ltp, underlying=None):
         """Calculate ATM strike based on index LTP"""
-        strike_interval = config.STRIKE_INTERVAL
+        strike_interval = self.get_strike_interval(underlying)
         atm_strike = round(index_ltp / strike_interval) * strike_interval
-        logger.info(f"Index LTP: {index_ltp}, ATM Strike: {atm_strike}")
+        logger.info("Index LTP: %s, ATM Strike: %s", index_ltp, atm_strike)
         return atm_strike
     
-    def get_option_security_id(self, expiry, strike, option_type='CE'):
+    def get_strike_interval(self, underlying=None):
+        """Strike spacing for an underlying (default: INDEX_NAME)"""
+        if underlying is None or underlying == config.INDEX_NAME:
+            return config.STRIKE_INTERVAL
+        return STRIKE_INTERVALS.get(underlying, config.STRIKE_INTERVAL)
+    
+    def get_option_security_id(self, expiry, strike, option_type='CE', underlying=None):
         """Get security ID for specific option"""
         if self.instruments_df is None:
             self.load_instruments()
         
+        underlying = underlying or config.INDEX_NAME
         try:
             option = self.instruments_df[
                 (self.instruments_df['expiry'] == expiry) &
                 (self.instruments_df['strike'] == strike) &
                 (self.instruments_df['option_type'] == option_type) &
-                (self.instruments_df['underlying'] == config.INDEX_NAME)
+                (self.instruments_df['underlying'] == underlying)
             ]
             
             if len(option) > 0:
                 security_id = option.iloc[0]['security_id']
-                logger.info(f"Found {option_type} {strike} (Expiry: {expiry}) - Security ID: {security_id}")
+                logger.info("Found %s %s (Expiry: %s) - Security ID: %s", option_type, strike, expiry, security_id)
                 return security_id
             else:
-                logger.warning(f"No option found for {option_type} {strike} expiring {expiry}")
+                logger.warning("No option found for %s %s expiring %s", option_type, strike, expiry)
                 return None
                 
         except Exception as e:
-            logger.error(f"Error getting security ID: {str(e)}")
+            logger.error("Error getting security ID: %s", e)
             return None
     
     def _create_sample_instruments(self):
         """Create sample instrument data for testing"""
-        # Generate sample data for NIFTY options
+        # Generate sample data for NIFTY, BANKNIFTY and FINNIFTY options
         data = []
         
         # Get next 4 weekly expiries (Thursdays)
@@ -152,36 +178,29 @@ class InstrumentManager:
             next_thursday = today + timedelta(days=days_until_thursday)
             expiries.append(next_thursday.strftime('%Y-%m-%d'))
         
-        # Generate strikes around current NIFTY level (assume 23000-24000 range)
-        strikes = list(range(22500, 24500, 50))
+        # Generate strikes around assumed current index levels
+        sample_ranges = {
+            'NIFTY': (22500, 24500),
+            'BANKNIFTY': (48000, 52000),
+            'FINNIFTY': (22000, 24000),
+        }
         
         security_id = 100000
-        for expiry in expiries:
-            for strike in strikes:
-                # CE option
-                data.append({
-                    'security_id': security_id,
-                    'trading_symbol': f'NIFTY {expiry} {strike} CE',
-                    'underlying': 'NIFTY',
-                    'expiry': expiry,
-                    'strike': strike,
-                    'option_type': 'CE',
-                    'instrument_type': 'OPTIDX',
-                    'exchange': 'NSE'
-                })
-                security_id += 1
-                
-                # PE option
-                data.append({
-                    'security_id': security_id,
-                    'trading_symbol': f'NIFTY {expiry} {strike} PE',
-                    'underlying': 'NIFTY',
-                    'expiry': expiry,
-                    'strike': strike,
-                    'option_type': 'PE',
-                    'instrument_type': 'OPTIDX',
-                    'exchange': 'NSE'
-                })
-                security_id += 1
+        for underlying, (low, high) in sample_ranges.items():
+            strikes = list(range(low, high, STRIKE_INTERVALS[underlying]))
+            for expiry in expiries:
+                for strike in strikes:
+                    for option_type in ('CE', 'PE'):
+                        data.append({
+                            'security_id': security_id,
+                            'trading_symbol': f'{underlying} {expiry} {strike} {option_type}',
+                            'underlying': underlying,
+                            'expiry': expiry,
+                            'strike': strike,
+                            'option_type': option_type,
+                            'instrument_type': 'OPTIDX',
+                            'exchange': 'NSE'
+                        })
+                        security_id += 1
         
         return data
\ No newline at end of file
@@ -0,0 +1,136 @@
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from config.settings import config
+
+logger = logging.getLogger(__name__)
+
+class BotChannel:
+    """
+    Local IPC channel between the bot and the API server.
+
+    Uses Unix datagram sockets: the API server listens on RUN_DIR/api.sock
+    for state published by the bot, and the bot listens on RUN_DIR/bot.sock
+    for commands. Datagrams are atomic, so each message is one JSON object.
+    Publishing never blocks - if the server is not listening or its buffer
+    is full, the message is dropped and superseded by the next one.
+    """
+
+    MAX_DATAGRAM = 64 * 1024
+
+    def __init__(self, run_dir=None, heartbeat_interval=1.0):
+        run_dir = run_dir or config.RUN_DIR
+        self.server_path = str(run_dir / 'api.sock')
+        self.bot_path = str(run_dir / 'bot.sock')
+        self.heartbeat_interval = heartbeat_interval
+        self.handlers = {}
+        self.heartbeat_fields = {}
+        self.started_at = time.time()
+        self.dropped = 0
+
+        run_dir.mkdir(parents=True, exist_ok=True)
+        self._pub_sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._pub_sock.setblocking(False)
+        self._cmd_sock = None
+        self._thread = None
+        self._running = False
+
+    def on_command(self, command, handler):
+        """Register handler(args) for a command sent by the API server"""
+        self.handlers[command] = handler
+
+    def start(self):
+        """Bind the command socket and start the listener/heartbeat thread"""
+        if os.path.exists(self.bot_path):
+            os.unlink(self.bot_path)
+
+        self._cmd_sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._cmd_sock.bind(self.bot_path)
+        self._cmd_sock.settimeout(self.heartbeat_interval)
+
+        self._running = True
+        self._thread = threading.Thread(target=self._listen, name='bot-channel', daemon=True)
+        self._thread.start()
+        logger.info("IPC channel listening on %s", self.bot_path)
+
+    def close(self):
+        """Stop listening and remove the command socket"""
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=self.heartbeat_interval * 2)
+        if self._cmd_sock:
+            self._cmd_sock.close()
+            self._cmd_sock = None
+        if os.path.exists(self.bot_path):
+            os.unlink(self.bot_path)
+        self._pub_sock.close()
+
+    def publish(self, kind, data=None):
+        """Send a state message to the API server without blocking"""
+        message = {'type': kind, 'ts': time.time(), 'pid': os.getpid(), 'data': data}
+        try:
+            self._pub_sock.sendto(json.dumps(message, default=str).encode(), self.server_path)
+            return True
+        except (BlockingIOError, FileNotFoundError, ConnectionRefusedError):
+            self.dropped += 1
+            return False
+        except OSError as e:
+            self.dropped += 1
+            logger.debug("IPC publish failed: %s", e)
+            return False
+
+    def set_heartbeat(self, **fields):
+        """Merge fields into every subsequent heartbeat"""
+        self.heartbeat_fields.update(fields)
+
+    def heartbeat(self):
+        return self.publish('heartbeat', {
+            'uptime': round(time.time() - self.started_at, 3),
+            'dropped': self.dropped,
+            **self.heartbeat_fields
+        })
+
+    def _listen(self):
+        next_heartbeat = 0
+        while self._running:
+            now = time.monotonic()
+            if now >= next_heartbeat:
+                self.heartbeat()
+                next_heartbeat = now + self.heartbeat_interval
+
+            try:
+                data = self._cmd_sock.recv(self.MAX_DATAGRAM)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            self._dispatch(data)
+
+    def _dispatch(self, data):
+        try:
+            message = json.loads(data)
+        except ValueError:
+            logger.warning("Ignoring malformed IPC command")
+            return
+
+        command = message.get('command')
+        handler = self.handlers.get(command)
+        ack = {'id': message.get('id'), 'command': command, 'ok': handler is not None}
+
+        if handler is None:
+            ack['error'] = f"Unknown command: {command}"
+        else:
+            try:
+                result = handler(message.get('args') or {})
+                if result is not None:
+                    ack['result'] = result
+            except Exception as e:
+                logger.error("IPC command %s failed: %s", command, e)
+                ack['ok'] = False
+                ack['error'] = str(e)
+
+        self.publish('ack', ack)
@@ -0,0 +1,5 @@
+from datetime import timedelta, timezone
+
+# India has no DST, so IST is a fixed offset (and needs no pytz)
+IST_OFFSET = 5 * 3600 + 30 * 60  # seconds east of UTC; candle buckets and trading days align to it
+IST = timezone(timedelta(seconds=IST_OFFSET), 'IST')
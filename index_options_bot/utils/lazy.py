@@ -0,0 +1,26 @@
+import importlib
+import sys
+
+def lazy_exports(package, exports):
+    """
+    Module-level __getattr__ for a package's re-exports.
+
+    exports maps each public name to the submodule that defines it (None
+    for a submodule exported under its own name). Nothing is imported
+    until a name is first used, so importing the package, or any one of
+    its submodules, does not pull in every other submodule and its
+    dependencies (pandas, numpy, dhanhq). The resolved value is then
+    stored on the package, so later lookups are plain attribute reads.
+    """
+    def __getattr__(name):
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        submodule = exports[name]
+        if submodule is None:
+            value = importlib.import_module(f"{package}.{name}")
+        else:
+            value = getattr(importlib.import_module(f"{package}.{submodule}"), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    return __getattr__
@@ -0,0 +1,177 @@
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime, time as dtime, timedelta
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from pathlib import Path
+
+from config.settings import config
+from utils.ist import IST
+
+CONSOLE_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Attributes every LogRecord has; anything else came in through extra=
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: ts, time (IST), level, logger, msg, any
+    extra= fields, and exc for exceptions.
+    """
+
+    def format(self, record):
+        entry = {
+            'ts': record.created,
+            'time': datetime.fromtimestamp(record.created, IST).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per logger name: rate records per second, bursts of up
+    to burst. Warnings and errors always pass. The next record let
+    through carries the number dropped before it as `suppressed`.
+    Runs in the logging thread, so buckets are updated under a lock.
+    """
+
+    def __init__(self, rate, burst, clock=time.monotonic):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self._buckets = {}  # logger name -> [tokens, last refill, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if self.rate <= 0 or record.levelno >= logging.WARNING:
+            return True
+        with self._lock:
+            now = self.clock()
+            bucket = self._buckets.get(record.name)
+            if bucket is None:
+                bucket = self._buckets[record.name] = [self.burst, now, 0]
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                bucket[2] += 1
+                return False
+            bucket[0] = tokens - 1
+            if bucket[2]:
+                record.suppressed = bucket[2]
+                bucket[2] = 0
+        return True
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Puts the record on the queue as it is. The stock QueueHandler formats
+    the message in the calling thread; here getMessage() and JSON
+    encoding run on the writer thread, so logging a tick costs a record
+    and a queue put. Log arguments should be values (numbers, strings),
+    not objects that change after the call.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def _gzip_rotate(source, dest):
+    if not os.path.exists(source):  # nothing logged since the last rollover
+        return
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+class DailyJsonFileHandler(TimedRotatingFileHandler):
+    """
+    <name>.jsonl, rotated at IST midnight to <name>.jsonl.YYYY-MM-DD.gz
+    (the IST trading day it holds), whatever the server's time zone.
+    """
+
+    def __init__(self, path, backup_days):
+        # utc=True keeps the stdlib from applying local DST shifts
+        super().__init__(path, when='midnight', backupCount=backup_days, encoding='utf-8', delay=True, utc=True)
+        self.namer = lambda name: f"{name}.gz"
+        self.rotator = _gzip_rotate
+        self.setFormatter(JsonFormatter())
+
+    def computeRollover(self, currentTime):
+        """Next IST midnight after currentTime"""
+        day = datetime.fromtimestamp(currentTime, IST).date() + timedelta(days=1)
+        return int(datetime.combine(day, dtime(), IST).timestamp())
+
+    def rotation_filename(self, default_name):
+        # The stdlib dates the file in UTC; use the IST day that ends at rolloverAt
+        day = datetime.fromtimestamp(self.rolloverAt - 1, IST).strftime(self.suffix)
+        return super().rotation_filename(f"{self.baseFilename}.{day}")
+
+
+def setup_logging(name, level=None, logs_dir=None, console=True):
+    """
+    Route all logging through one queue to a background writer thread:
+    JSON lines in logs_dir/<name>.jsonl (daily, gzipped) and, if console,
+    the usual text format on stderr. Callers only pay for building the
+    record and a queue put; formatting, disk writes and compression
+    happen on the writer. Safe to call more than once.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    logs_dir = Path(logs_dir or config.LOGS_DIR)
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    handlers = [DailyJsonFileHandler(logs_dir / f"{name}.jsonl", config.LOG_BACKUP_DAYS)]
+    if console:
+        stream = logging.StreamHandler()
+        stream.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        handlers.append(stream)
+
+    log_queue = queue.SimpleQueue()
+    handler = DeferredQueueHandler(log_queue)
+    handler.addFilter(RateLimitFilter(config.LOG_RATE_LIMIT, config.LOG_RATE_BURST))
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level or config.LOG_LEVEL)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging():
+    """Drain the queue, stop the writer thread and close the log files"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, DeferredQueueHandler):
+            root.removeHandler(handler)
+    _listener = None
@@ -0,0 +1,136 @@
+import csv
+import logging
+import time as _time
+from datetime import date, datetime, time, timedelta
+
+from utils.ist import IST
+
+logger = logging.getLogger(__name__)
+
+NS = 1_000_000_000
+
+def load_calendar(path):
+    """({date: (open, close)} special sessions, {date} holidays) from a calendar CSV"""
+    sessions, holidays = {}, set()
+    with open(path, newline='') as f:
+        rows = csv.DictReader(line for line in f if not line.startswith('#'))
+        for row in rows:
+            day = date.fromisoformat(row['date'].strip())
+            if row.get('open') and row.get('close'):
+                sessions[day] = (time.fromisoformat(row['open'].strip()), time.fromisoformat(row['close'].strip()))
+            else:
+                holidays.add(day)
+    return sessions, holidays
+
+class MarketCalendar:
+    """
+    NSE trading sessions: weekdays open_time-close_time, minus holidays,
+    with special sessions (Muhurat trading, weekend budget days) replacing
+    a day's hours.
+
+    The table is read once. Session boundaries for the current day (its
+    open, close, the next session's open and the end of the day) are
+    worked out on the first check of each day and kept as monotonic
+    nanosecond timestamps, so is_open() and the seconds-until checks are
+    one clock read and integer comparisons, with no datetime or timezone
+    work until the day rolls over.
+
+    years lists the years the holiday table covers (from_file: every year
+    with a row). A day in any other year logs an error, once per year:
+    its holidays would be traded through as regular sessions.
+    """
+
+    def __init__(self, holidays=(), sessions=None, open_time=time(9, 15), close_time=time(15, 30),
+                 clock=_time.time_ns, monotonic=_time.monotonic_ns, years=None):
+        self.holidays = set(holidays)
+        self.sessions = dict(sessions or {})
+        self.years = set(years) if years is not None else None
+        self._reported_years = set()
+        self.open_time = open_time
+        self.close_time = close_time
+        self.clock = clock
+        self.monotonic = monotonic
+        self._day_end = -1  # forces a roll on the first check
+        self._open = self._close = self._next_open = 0
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        sessions, holidays = load_calendar(path)
+        kwargs.setdefault('years', {day.year for day in holidays | set(sessions)})
+        return cls(holidays=holidays, sessions=sessions, **kwargs)
+
+    # Calendar
+
+    def session(self, day):
+        """(open, close) times for a date, or None if the market is shut"""
+        special = self.sessions.get(day)
+        if special is not None:
+            return special
+        if day.weekday() >= 5 or day in self.holidays:
+            return None
+        return self.open_time, self.close_time
+
+    def is_trading_day(self, day):
+        return self.session(day) is not None
+
+    def covers(self, day):
+        """False if the holiday table has no entries for day's year"""
+        return self.years is None or day.year in self.years
+
+    def next_session(self, day):
+        """(date, open, close) of the first session after day"""
+        for offset in range(1, 31):
+            following = day + timedelta(days=offset)
+            session = self.session(following)
+            if session is not None:
+                return following, *session
+        raise ValueError(f"No trading session within 30 days of {day}")
+
+    # Cheap checks
+
+    def _roll(self, mono):
+        """Recompute today's boundaries as monotonic timestamps"""
+        wall = self.clock()
+        now = datetime.fromtimestamp(wall / NS, IST)
+        today = now.date()
+        if not self.covers(today) and today.year not in self._reported_years:
+            self._reported_years.add(today.year)
+            logger.error("Market calendar has no holidays for %s; add them from the NSE holiday circular", today.year)
+
+        def mono_at(day, at):
+            return mono + int(datetime.combine(day, at, IST).timestamp() * NS) - wall
+
+        session = self.session(today)
+        if session is not None:
+            self._open, self._close = mono_at(today, session[0]), mono_at(today, session[1])
+        else:
+            self._open = self._close = mono_at(today, time(0))
+        day, open_at, _ = self.next_session(today)
+        self._next_open = mono_at(day, open_at)
+        self._day_end = mono_at(today + timedelta(days=1), time(0))
+
+    def _now(self):
+        mono = self.monotonic()
+        if mono >= self._day_end:
+            self._roll(mono)
+        return mono
+
+    def is_open(self):
+        now = self._now()
+        return self._open <= now < self._close
+
+    def seconds_until_close(self):
+        """Seconds until the current session closes (0 if the market is not open)"""
+        now = self._now()
+        if self._open <= now < self._close:
+            return (self._close - now) / NS
+        return 0.0
+
+    def seconds_until_open(self):
+        """Seconds until the next session opens (0 if the market is open now)"""
+        now = self._now()
+        if now < self._open:
+            return (self._open - now) / NS
+        if now < self._close:
+            return 0.0
+        return (self._next_open - now) / NS
@@ -1,65 +1,64 @@
 import logging
 from datetime import datetime, time
-import pytz
+
+from config.settings import config
+from utils.market_calendar import IST, MarketCalendar
 
 logger = logging.getLogger(__name__)
 
 class MarketTime:
-    """Utilities for market timing"""
+    """
+    Utilities for market timing.
+
+    Backed by one MarketCalendar loaded from config.MARKET_CALENDAR_FILE
+    on first use, so every check respects NSE holidays and special
+    sessions and costs a clock read and a few integer comparisons.
+    """
     
-    IST = pytz.timezone('Asia/Kolkata')
+    IST = IST
     MARKET_OPEN = time(9, 15)
     MARKET_CLOSE = time(15, 30)
+    calendar = None
+    
+    @classmethod
+    def get_calendar(cls):
+        if cls.calendar is None:
+            try:
+                cls.calendar = MarketCalendar.from_file(
+                    config.MARKET_CALENDAR_FILE, open_time=cls.MARKET_OPEN, close_time=cls.MARKET_CLOSE
+                )
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning("Market calendar unavailable (%s); holidays will not be skipped", e)
+                cls.calendar = MarketCalendar(open_time=cls.MARKET_OPEN, close_time=cls.MARKET_CLOSE)
+        return cls.calendar
     
     @classmethod
     def is_market_open(cls):
         """Check if market is currently open"""
-        now = datetime.now(cls.IST)
-        current_time = now.time()
-        
-        # Check if weekday (Monday=0, Sunday=6)
-        if now.weekday() >= 5:  # Saturday or Sunday
-            return False
-        
-        # Check if within market hours
-        if cls.MARKET_OPEN <= current_time <= cls.MARKET_CLOSE:
-            return True
-        
-        return False
+        return cls.get_calendar().is_open()
     
     @classmethod
     def get_current_time(cls):
         """Get current IST time"""
         return datetime.now(cls.IST)
     
+    @classmethod
+    def seconds_until_open(cls):
+        """Seconds until the next market open (0 if the market is open now)"""
+        return cls.get_calendar().seconds_until_open()
+    
+    @classmethod
+    def seconds_until_close(cls):
+        """Seconds until today's market close (0 if the market is not open)"""
+        return cls.get_calendar().seconds_until_close()
+    
     @classmethod
     def time_to_market_open(cls):
         """Get time remaining until market opens"""
-        now = datetime.now(cls.IST)
-        
-        if cls.is_market_open():
+        wait = cls.seconds_until_open()
+        if not wait:
             return "Market is currently open"
         
-        # Calculate next market open
-        market_open_today = now.replace(
-            hour=cls.MARKET_OPEN.hour,
-            minute=cls.MARKET_OPEN.minute,
-            second=0,
-            microsecond=0
-        )
-        
-        if now.time() > cls.MARKET_CLOSE:
-            # Market closed for today, check tomorrow
-            from datetime import timedelta
-            market_open_today += timedelta(days=1)
-        
-        # Skip weekends
-        while market_open_today.weekday() >= 5:
-            from datetime import timedelta
-            market_open_today += timedelta(days=1)
-        
-        time_diff = market_open_today - now
-        hours = int(time_diff.total_seconds() // 3600)
-        minutes = int((time_diff.total_seconds() % 3600) // 60)
-        
-        return f"{hours}h {minutes}m until market opens"
\ No newline at end of file
+        hours = int(wait // 3600)
+        minutes = int((wait % 3600) // 60)
+        return f"{hours}h {minutes}m until market opens"
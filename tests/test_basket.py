@@ -0,0 +1,68 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "index_options_bot"))
+
+from execution import Basket, BasketLeg, OrderPipeline, PaperTrading
+from utils.history_downloader import RateLimiter
+
+ROUND_TRIP = 0.1
+
+
+class SlowPaper(PaperTrading):
+    """Paper fills behind a broker round trip; some securities always reject"""
+
+    def __init__(self, rejects=()):
+        super().__init__(save_trades=False)
+        self.rejects = set(rejects)
+
+    def place_order(self, security_id, symbol, price, quantity, order_type='BUY'):
+        time.sleep(ROUND_TRIP)
+        if security_id in self.rejects and order_type == 'BUY':
+            return {'status': 'failure', 'remarks': 'Margin shortfall'}
+        return super().place_order(security_id, symbol, price, quantity, order_type)
+
+
+def _iron_condor():
+    return [
+        BasketLeg(101, 'NIFTY 23000 CE', 'SELL', 75, 120.0),
+        BasketLeg(102, 'NIFTY 23000 PE', 'SELL', 75, 110.0),
+        BasketLeg(103, 'NIFTY 23300 CE', 'BUY', 75, 35.0),
+        BasketLeg(104, 'NIFTY 22700 PE', 'BUY', 75, 30.0),
+    ]
+
+
+def test_four_legs_fill_in_about_one_round_trip():
+    paper = SlowPaper()
+    pipeline = OrderPipeline(paper, limiter=RateLimiter(100))
+    basket = asyncio.run(Basket(_iron_condor()).execute(pipeline))
+
+    assert basket.filled and basket.status == 'FILLED'
+    assert {sid: p.net_qty for sid, p in paper.get_positions().items()} == {101: -75, 102: -75, 103: 75, 104: 75}
+    print(f"4-leg basket: {basket.submit_ms} ms for {ROUND_TRIP * 1000:.0f} ms round trips")
+    assert basket.submit_ms < ROUND_TRIP * 1000 * 2
+
+
+def test_failed_leg_rolls_back_the_others():
+    paper = SlowPaper(rejects={104})
+    basket = asyncio.run(Basket(_iron_condor()).execute(OrderPipeline(paper)))
+
+    assert basket.status == 'ROLLED_BACK'
+    assert len(basket.unwinds) == 3 and all(t.is_filled for t in basket.unwinds)
+    assert paper.get_positions() == {}
+    assert 'Margin shortfall' in basket.errors[0]
+
+
+def test_invalid_legs_are_rejected_before_sending():
+    paper = SlowPaper()
+    legs = _iron_condor() + [
+        BasketLeg(101, 'NIFTY 23000 CE', 'SELL', 75, 120.0),
+        BasketLeg(None, 'BAD', 'HOLD', 0, 0),
+    ]
+    basket = asyncio.run(Basket(legs).execute(OrderPipeline(paper)))
+
+    assert basket.status == 'REJECTED'
+    assert len(basket.errors) == 5  # duplicate + four problems with the last leg
+    assert paper.get_trades() == []
@@ -0,0 +1,63 @@
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+sys.path.insert(0, str(ROOT / "index_options_bot"))
+
+from bot_channel import BotChannelServer
+from utils.ipc import BotChannel
+
+
+def test_state_and_commands_round_trip(tmp_path):
+    async def scenario():
+        received = []
+        server = BotChannelServer(tmp_path, on_message=lambda kind, data: received.append(kind))
+        await server.start()
+
+        bot = BotChannel(run_dir=tmp_path, heartbeat_interval=0.05)
+        controls = {"paused": False}
+
+        def pause(args):
+            controls["paused"] = True
+            return dict(controls)
+
+        bot.on_command("pause", pause)
+        bot.start()
+        try:
+            bot.publish("risk", {"trades_taken": 2})
+            for _ in range(100):
+                if server.connected and "risk" in server.state:
+                    break
+                await asyncio.sleep(0.01)
+
+            summary = server.summary()
+            assert summary["connected"]
+            assert summary["risk"] == {"trades_taken": 2}
+            assert "heartbeat" in received
+
+            ack = await server.send_command("pause")
+            assert ack["ok"]
+            assert ack["result"] == {"paused": True}
+            assert controls["paused"]
+            assert ack["latency_ms"] < 100
+
+            unknown = await server.send_command("launch_rockets")
+            assert not unknown["ok"]
+        finally:
+            bot.close()
+            server.close()
+
+        assert (await server.send_command("pause"))["error"] == "Bot channel not connected"
+
+    asyncio.run(scenario())
+
+
+def test_publish_without_server_does_not_block(tmp_path):
+    bot = BotChannel(run_dir=tmp_path)
+    try:
+        assert not bot.publish("heartbeat", {})
+        assert bot.dropped == 1
+    finally:
+        bot.close()
@@ -0,0 +1,87 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "index_options_bot"))
+
+from execution import FillModel, PaperTrading, TickVolatility
+
+
+def test_spread_slippage_and_lot_rounding():
+    model = FillModel(latency_ms=250, spread_pct=0.2, slippage_factor=1.0, lot_size=25)
+
+    # 0.1% half spread of 100 = 0.10, no slippage without volatility
+    assert model.fill('BUY', 100.0, 0.0, 60) == (100.1, 50)
+    assert model.fill('SELL', 100.0, 0.0, 60) == (99.9, 50)
+    # Tiny premiums still pay at least half a tick, rounded against the trader
+    assert model.fill('BUY', 1.0, 0.0, 25) == (1.05, 25)
+    assert model.fill('SELL', 1.0, 0.0, 25) == (0.95, 25)
+    assert model.fill('BUY', 100.0, 0.0, 24)[1] == 0
+
+    # 2 points/sqrt(s) over 0.25 s = 1 point of slippage
+    assert model.fill('BUY', 100.0, 2.0, 25) == (101.1, 25)
+    assert model.fill('SELL', 100.0, 2.0, 25) == (98.9, 25)
+
+
+def test_batch_matches_streaming_fills():
+    rng = np.random.default_rng(7)
+    n = 2000
+    model = FillModel(latency_ms=120, spread_pct=0.3, slippage_factor=0.8, lot_size=25)
+    side = rng.choice([1, -1], n)
+    mid = rng.uniform(0.5, 400, n).round(2)
+    volatility = rng.uniform(0, 3, n)
+    quantity = rng.integers(1, 300, n)
+
+    price, filled, _ = model.batch(side, mid, volatility, quantity)
+    for i in range(n):
+        expected = model.fill('BUY' if side[i] > 0 else 'SELL', mid[i], volatility[i], quantity[i])
+        assert (price[i], filled[i]) == expected
+
+
+def test_latency_picks_the_mid_at_fill_time():
+    model = FillModel(latency_ms=500)
+    times = np.array([0.0, 1.0, 2.0, 3.0])
+    prices = np.array([100.0, 101.0, 102.0, 103.0])
+    mid = model.mid_at(times, prices, [0.2, 0.6, 2.4, 10.0])
+    assert mid.tolist() == [100.0, 101.0, 102.0, 103.0]
+    _, _, fill_time = model.batch([1, 1, 1, 1], mid, 0.0, 1, order_time=[0.2, 0.6, 2.4, 10.0])
+    assert np.allclose(fill_time, [0.7, 1.1, 2.9, 10.5])
+
+
+def test_batch_throughput():
+    n = 1_000_000
+    rng = np.random.default_rng(1)
+    model = FillModel(lot_size=25)
+    side = rng.choice([1, -1], n)
+    mid = rng.uniform(1, 500, n)
+    volatility = rng.uniform(0, 2, n)
+    quantity = rng.integers(25, 500, n)
+
+    started = time.perf_counter()
+    price, filled, _ = model.batch(side, mid, volatility, quantity)
+    elapsed = time.perf_counter() - started
+    print(f"{n / elapsed / 1e6 * 60:.0f}M orders/minute")
+    assert len(price) == n and (filled % 25 == 0).all()
+    assert elapsed < 6  # comfortably above a million orders per minute
+
+
+def test_paper_trading_fills_through_the_model():
+    paper = PaperTrading(save_trades=False, fill_model=FillModel(latency_ms=0, spread_pct=0.2, lot_size=25))
+    paper.update_price(101, 100.0)
+    response = paper.place_order(101, 'OPT', 95.0, 60, 'BUY')
+    # Fills off the latest mark, not the price the order carried, in whole lots
+    assert response['data']['price'] == 100.1 and response['data']['quantity'] == 50
+
+    rejected = paper.place_order(101, 'OPT', 100.0, 10, 'SELL')
+    assert rejected['status'] == 'failure'
+    assert paper.get_positions()[101].net_qty == 50
+
+
+def test_tick_volatility_tracks_price_noise():
+    calm, noisy = TickVolatility(alpha=0.2), TickVolatility(alpha=0.2)
+    for i in range(50):
+        calm.update('x', 100 + 0.05 * (i % 2), ts=float(i))
+        noisy.update('x', 100 + 2.0 * (i % 2), ts=float(i))
+    assert abs(calm.get('x') - 0.05) < 1e-6 and abs(noisy.get('x') - 2.0) < 1e-6
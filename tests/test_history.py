@@ -0,0 +1,126 @@
+import asyncio
+import csv
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from history import HistoryStore
+
+
+TRADE_HEADER = ["date", "time", "symbol", "qty", "entry_price", "exit_price", "pnl", "exit_reason"]
+
+
+def _bot_dir(tmp_path):
+    (tmp_path / "logs").mkdir()
+    (tmp_path / "data" / "trades").mkdir(parents=True)
+    with open(tmp_path / "logs" / "trades.csv", "w", newline="") as f:
+        csv.writer(f).writerow(TRADE_HEADER)
+    return tmp_path
+
+
+def _log_trades(bot_dir, rows):
+    with open(bot_dir / "logs" / "trades.csv", "a", newline="") as f:
+        csv.writer(f).writerows(rows)
+
+
+def _store(bot_dir):
+    db = mongomock_motor.AsyncMongoMockClient()["trading"]
+    return HistoryStore(db, bot_dir)
+
+
+def test_ingest_is_incremental_and_idempotent(tmp_path):
+    async def scenario():
+        bot_dir = _bot_dir(tmp_path)
+        store = _store(bot_dir)
+        await store.ensure_indexes()
+
+        _log_trades(bot_dir, [
+            ["2026-01-05", "09:30:00", "NIFTY 23000 CE", 50, 100, 120, 1000, "TRAILING_SL"],
+            ["2026-01-05", "10:30:00", "NIFTY 23000 PE", 50, 100, 90, -500, "TRAILING_SL"],
+        ])
+        (bot_dir / "data" / "trades" / "trades_2026-01-05.json").write_text(json.dumps([
+            {"order_id": "PAPER_1", "symbol": "NIFTY 23000 CE", "order_type": "BUY"},
+            {"order_id": "PAPER_1", "symbol": "NIFTY 23000 CE", "order_type": "SELL"},
+        ]))
+        (bot_dir / "logs" / "daily_pnl.csv").write_text("date,realized_pnl\n2026-01-05,500\n")
+        store.add_signal({"type": "BUY", "timestamp": "2026-01-05T09:29:00", "price": 23001})
+
+        counts = await store.ingest()
+        assert counts == {"trades": 2, "orders": 2, "daily_summaries": 1, "signals": 1}
+        assert await store.ingest() == {"trades": 0, "orders": 0, "daily_summaries": 0, "signals": 0}
+
+        _log_trades(bot_dir, [["2026-02-10", "11:00:00", "NIFTY 23100 CE", 50, 80, 100, 1000, "TARGET"]])
+        assert (await store.ingest())["trades"] == 1
+        assert await store.trades.count_documents({}) == 3
+
+        # A restarted server resumes from the saved state
+        assert await HistoryStore(store.db, bot_dir).ingest() == {
+            "trades": 0, "orders": 0, "daily_summaries": 0, "signals": 0
+        }
+
+        # Lost ingest state must not duplicate rows
+        await store.ingest_state.delete_many({})
+        await HistoryStore(store.db, bot_dir).ingest()
+        assert await store.trades.count_documents({}) == 3
+        assert await store.orders.count_documents({}) == 2
+
+    asyncio.run(scenario())
+
+
+def test_analytics_over_date_range(tmp_path):
+    async def scenario():
+        bot_dir = _bot_dir(tmp_path)
+        store = _store(bot_dir)
+        _log_trades(bot_dir, [
+            ["2026-01-05", "09:30:00", "A", 50, 100, 120, 1000, "TRAILING_SL"],
+            ["2026-01-05", "10:30:00", "B", 50, 100, 90, -500, "TRAILING_SL"],
+            ["2026-01-06", "09:45:00", "A", 50, 100, 110, 500, "TARGET"],
+            ["2026-03-01", "09:45:00", "A", 50, 100, 80, -1000, "TRAILING_SL"],
+        ])
+        await store.ingest()
+
+        perf = await store.performance("2026-01-01", "2026-01-31")
+        assert perf == {
+            "total_trades": 3, "wins": 2, "losses": 1, "win_rate": 66.67,
+            "total_pnl": 1000.0, "avg_win": 750.0, "avg_loss": -500.0
+        }
+        assert (await store.performance(symbol="A"))["total_trades"] == 3
+
+        daily = await store.daily("2026-01-01", "2026-12-31")
+        assert [(d["date"], d["trades"], d["pnl"]) for d in daily] == [
+            ("2026-01-05", 2, 500.0), ("2026-01-06", 1, 500.0), ("2026-03-01", 1, -1000.0)
+        ]
+
+        reasons = {r["exit_reason"]: r["trades"] for r in await store.exit_reasons()}
+        assert reasons == {"TRAILING_SL": 3, "TARGET": 1}
+
+        recent = await store.find_trades(limit=2)
+        assert [t["date"] for t in recent] == ["2026-03-01", "2026-01-06"]
+
+    asyncio.run(scenario())
+
+
+def test_symbol_filter_selects_an_underlying(tmp_path):
+    async def scenario():
+        bot_dir = _bot_dir(tmp_path)
+        store = _store(bot_dir)
+        _log_trades(bot_dir, [
+            ["2026-01-05", "09:30:00", "NIFTY 23000 CE", 50, 100, 120, 1000, "TRAILING_SL"],
+            ["2026-01-05", "10:30:00", "NIFTY-Jan2026-23000-PE", 50, 100, 90, -500, "TRAILING_SL"],
+            ["2026-01-05", "11:30:00", "BANKNIFTY 50000 CE", 15, 200, 210, 150, "TARGET"],
+            ["2026-01-05", "12:30:00", "NIFTYNXT50 70000 CE", 10, 100, 110, 100, "TARGET"],
+        ])
+        await store.ingest()
+
+        assert (await store.performance(symbol="NIFTY"))["total_trades"] == 2
+        assert [t["symbol"] for t in await store.find_trades(symbol="BANKNIFTY")] == ["BANKNIFTY 50000 CE"]
+        assert [d["trades"] for d in await store.daily(symbol="NIFTY 23000 CE")] == [1]
+        assert [t["symbol"] for t in await store.find_trades(symbol="NIFTY 23000")] == ["NIFTY 23000 CE"]
+
+    asyncio.run(scenario())
@@ -0,0 +1,97 @@
+import asyncio
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "index_options_bot"))
+
+from runtime.candles import Bar, IST
+from utils.candle_store import CandleStore
+from utils.history_downloader import HistoryDownloader
+
+
+class FakeBroker:
+    """One 09:15 candle per day in the range; first call per chunk fails"""
+
+    def __init__(self, delay=0.05, fail_first=True):
+        self.delay = delay
+        self.fail_first = fail_first
+        self.seen = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def get_intraday_data(self, security_id, exchange_segment, instrument_type, from_date, to_date, interval=1):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            key = (security_id, from_date)
+            if self.fail_first and key not in self.seen:
+                self.seen.add(key)
+                return None
+            start = datetime.strptime(from_date, "%Y-%m-%d %H:%M:%S").replace(tzinfo=IST).timestamp()
+            end = datetime.strptime(to_date, "%Y-%m-%d %H:%M:%S").replace(tzinfo=IST).timestamp()
+            days = int((end - start) // 86400) + 1
+            return [Bar(start + d * 86400, 1, 2, 0.5, 1.5, 10) for d in range(days)]
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def test_chunks_respect_broker_limit(tmp_path):
+    downloader = HistoryDownloader(FakeBroker(), CandleStore(tmp_path), max_chunk_days=90)
+    chunks = downloader.chunks("2025-01-01", "2025-06-30")
+    assert chunks == [
+        ("2025-01-01 09:15:00", "2025-03-31 15:30:00"),
+        ("2025-04-01 09:15:00", "2025-06-29 15:30:00"),
+        ("2025-06-30 09:15:00", "2025-06-30 15:30:00"),
+    ]
+
+
+def test_parallel_download_retries_and_stores(tmp_path):
+    broker = FakeBroker()
+    store = CandleStore(tmp_path)
+    progress = []
+    downloader = HistoryDownloader(
+        broker, store, max_chunk_days=10, concurrency=4, rate_per_second=1000,
+        backoff=0.01, on_progress=lambda done, total, candles: progress.append(done)
+    )
+    instruments = [("IDX_I", 13, "INDEX"), ("IDX_I", 25, "INDEX"), ("NSE_FNO", 100123, "OPTIDX")]
+
+    started = time.perf_counter()
+    report = asyncio.run(downloader.download(instruments, "2025-01-01", "2025-01-30"))
+    elapsed = time.perf_counter() - started
+
+    assert report["jobs"] == 9 and report["done"] == 9
+    assert report["failed"] == []
+    assert report["requests"] == 18  # every chunk failed once, then succeeded
+    assert report["candles"] == 90
+    assert progress == list(range(1, 10))
+    assert len(store.days("NSE_FNO", 100123, 1)) == 30
+
+    # 18 calls of 50ms ran 4 at a time, not one after another
+    assert broker.max_in_flight == 4
+    assert elapsed < 18 * broker.delay
+
+
+def test_rate_limit_and_give_up(tmp_path):
+    class AlwaysFails(FakeBroker):
+        def get_intraday_data(self, *args, **kwargs):
+            super().get_intraday_data(*args, **kwargs)
+            return None
+
+    downloader = HistoryDownloader(
+        AlwaysFails(delay=0), CandleStore(tmp_path), concurrency=8,
+        rate_per_second=50, retries=2, backoff=0
+    )
+    started = time.perf_counter()
+    report = asyncio.run(downloader.download([("IDX_I", 13, "INDEX")] * 2, "2025-01-01", "2025-01-01"))
+    elapsed = time.perf_counter() - started
+
+    assert len(report["failed"]) == 2
+    assert report["requests"] == 6
+    assert elapsed >= 5 / 50  # six requests spaced 20ms apart
@@ -0,0 +1,121 @@
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "index_options_bot"))
+
+from indicators import IndicatorGraph, TrueRange, ATR, SuperTrend, EMA, VWAP, RSI
+from runtime.candles import Bar
+
+
+def _bars(n=300, seed=7):
+    rng = random.Random(seed)
+    start = 1767239100  # 2026-01-01 09:15 IST
+    price = 23000.0
+    bars = []
+    for i in range(n):
+        open_price = price
+        price += rng.uniform(-20, 20)
+        high = max(open_price, price) + rng.uniform(0, 5)
+        low = min(open_price, price) - rng.uniform(0, 5)
+        # Cross a session boundary halfway through for VWAP
+        ts = start + i * 60 + (86400 if i >= n // 2 else 0)
+        bars.append(Bar(ts, open_price, high, low, price, rng.randint(0, 1000)))
+    return bars
+
+
+def _graph():
+    graph = IndicatorGraph()
+    nodes = [
+        graph.add(SuperTrend(7, 4)),
+        graph.add(SuperTrend(10, 3)),
+        graph.add(ATR(7)),
+        graph.add(ATR(14, "wilder")),
+        graph.add(ATR(14, "ema")),
+        graph.add(EMA(20)),
+        graph.add(VWAP()),
+        graph.add(RSI(14)),
+    ]
+    return graph, nodes
+
+
+def test_shared_series_are_computed_once():
+    graph, nodes = _graph()
+    assert nodes[2] is nodes[0].deps[0]  # ATR(7) shared by SuperTrend(7, 4)
+    assert sum(isinstance(node, TrueRange) for node in graph.nodes.values()) == 1
+    assert all(dep is graph[TrueRange.key] for node in (nodes[2], nodes[3], nodes[4]) for dep in node.deps)
+
+    calls = []
+    tr = graph[TrueRange.key]
+    original = tr.update
+    tr.update = lambda bar: (calls.append(bar), original(bar))
+    for bar in _bars(20):
+        graph.update(bar)
+    assert len(calls) == 20
+
+
+def test_streaming_matches_batch():
+    bars = _bars()
+    graph, nodes = _graph()
+    streamed = {node.key: [] for node in nodes}
+    directions = {node.key: [] for node in nodes if isinstance(node, SuperTrend)}
+    for bar in bars:
+        graph.update(bar)
+        for node in nodes:
+            streamed[node.key].append(np.nan if node.value is None else node.value)
+            if node.key in directions:
+                directions[node.key].append(node.direction or 0)
+
+    batch_graph, _ = _graph()
+    series = batch_graph.batch(
+        high=[b.high for b in bars], low=[b.low for b in bars], close=[b.close for b in bars],
+        open=[b.open for b in bars], volume=[b.volume for b in bars], start=[b.start for b in bars]
+    )
+    for node in nodes:
+        expected = series[node.key]
+        if isinstance(node, SuperTrend):
+            line, direction = expected
+            np.testing.assert_array_equal(direction, directions[node.key])
+            expected = np.where(direction == 0, np.nan, line)
+        np.testing.assert_allclose(streamed[node.key], expected, rtol=1e-9, equal_nan=True)
+
+
+def test_vwap_resets_each_session_and_handles_zero_volume():
+    bars = [Bar(b.start, b.open, b.high, b.low, b.close, 0) for b in _bars(10)]
+    graph = IndicatorGraph()
+    vwap = graph.add(VWAP())
+    for bar in bars:
+        graph.update(bar)
+    typical = [(b.high + b.low + b.close) / 3 for b in bars[5:]]
+    assert abs(vwap.value - sum(typical) / len(typical)) < 1e-9
+
+
+def test_rsi_bounds():
+    graph = IndicatorGraph()
+    rsi = graph.add(RSI(14))
+    for i in range(30):
+        graph.update(Bar(i * 60, 100 + i, 101 + i, 99 + i, 100 + i, 0))
+    assert rsi.value == 100.0
+
+
+def test_strategies_on_one_underlying_share_a_graph():
+    from strategy import SuperTrendStrategy
+
+    graph = IndicatorGraph()
+    shared = [SuperTrendStrategy(7, 4, graph=graph), SuperTrendStrategy(10, 3, graph=graph)]
+    private = [SuperTrendStrategy(7, 4), SuperTrendStrategy(10, 3)]
+
+    calls = []
+    tr = graph[TrueRange.key]
+    original = tr.update
+    tr.update = lambda bar: (calls.append(bar), original(bar))
+    bars = _bars(50)
+    for bar in bars:
+        for strategy in shared + private:
+            strategy.add_price_data(bar.timestamp, bar.open, bar.high, bar.low, bar.close, bar.volume)
+    assert len(calls) == len(bars)  # each bar applied once, however many strategies feed it
+
+    for mine, theirs in zip(shared, private):
+        assert mine.calculate_supertrend() == theirs.calculate_supertrend()
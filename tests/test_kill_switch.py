@@ -0,0 +1,154 @@
+import asyncio
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+sys.path.insert(0, str(ROOT / "index_options_bot"))
+
+from kill_switch import KillSwitchFile
+from execution import KillSwitch, OrderPipeline
+
+
+def test_switch_is_shared_across_processes(tmp_path):
+    switch = KillSwitch(tmp_path / "kill_switch")
+    api = KillSwitchFile(tmp_path)
+    assert not switch.engaged and not api.engaged
+
+    # Another process engages it through the API server's writer
+    subprocess.run([
+        sys.executable, "-c",
+        "import sys; from pathlib import Path; sys.path.insert(0, sys.argv[1]);"
+        "from kill_switch import KillSwitchFile; KillSwitchFile(Path(sys.argv[2])).engage('api stop')",
+        str(ROOT / "backend"), str(tmp_path),
+    ], check=True)
+    assert switch.engaged and api.engaged
+    state = switch.state()
+    assert state["reason"] == "api stop"
+    assert 0 < time.time() - state["triggered_at"] < 30
+    assert not switch.engage("again")  # latched, first trigger kept
+    assert switch.state()["reason"] == "api stop"
+
+    api.release()
+    assert not switch.engaged
+    assert switch.state()["released_at"] is not None
+
+
+def test_check_is_near_free():
+    switch = KillSwitch()
+    checks = 1_000_000
+    started = time.perf_counter()
+    for _ in range(checks):
+        switch.engaged
+    per_check_ns = (time.perf_counter() - started) / checks * 1e9
+    assert per_check_ns < 2000
+
+
+class CancellableBroker:
+    """Acks orders and leaves them open until cancelled"""
+
+    def __init__(self):
+        self.orders = {}
+        self.cancelled = []
+
+    def place_order(self, security_id, symbol, price, quantity, order_type='BUY'):
+        order_id = str(len(self.orders) + 1)
+        self.orders[order_id] = 'PENDING'
+        return {'status': 'success', 'data': {'orderId': order_id, 'orderStatus': 'PENDING'}}
+
+    def cancel_order(self, order_id):
+        self.cancelled.append(order_id)
+        self.orders[order_id] = 'CANCELLED'
+        return {'status': 'success'}
+
+    def get_order_book(self):
+        return [{'orderId': order_id, 'orderStatus': status, 'filledQty': 0}
+                for order_id, status in self.orders.items()]
+
+
+def test_engaged_switch_blocks_opening_orders_and_cancels_open_ones():
+    switch = KillSwitch()
+    broker = CancellableBroker()
+    pipeline = OrderPipeline(broker, poll_interval=10, kill_switch=switch)
+
+    async def scenario():
+        open_orders = [await pipeline.submit(100 + i, f"OPT{i}", 100.0, 50) for i in range(3)]
+        switch.engage()
+        blocked = await pipeline.submit(200, "OPT", 100.0, 50)
+        exit_ticket = await pipeline.submit(100, "OPT0", 100.0, 50, 'SELL', reduce_only=True)
+        # Cancellations resolve without waiting for the next (10 s) poll
+        cancelled = await asyncio.wait_for(pipeline.cancel_all(), 1)
+        await pipeline.close()
+        return open_orders, blocked, exit_ticket, cancelled
+
+    open_orders, blocked, exit_ticket, cancelled = asyncio.run(scenario())
+    assert blocked.status == 'REJECTED' and blocked.error == 'Kill switch engaged'
+    # Exits go out while engaged and are not cancelled
+    assert exit_ticket.order_id == '4' and exit_ticket.status == 'TIMEOUT'
+    assert sorted(broker.cancelled) == ['1', '2', '3']
+    assert len(cancelled) == 3 and all(t.status == 'CANCELLED' for t in cancelled)
+    assert all(t.status == 'CANCELLED' for t in open_orders)
+    assert len(broker.orders) == 4
+
+
+class AcceptingDhan:
+    def __init__(self):
+        self.orders = []
+
+    def place_order(self, security_id, transaction_type, quantity, **kwargs):
+        self.orders.append((transaction_type, security_id, quantity))
+        return {'status': 'success', 'data': {'orderId': str(len(self.orders))}}
+
+
+def test_live_executor_checks_the_switch_itself():
+    from execution import LiveTrading
+
+    dhan, switch = AcceptingDhan(), KillSwitch()
+    live = LiveTrading(dhan, kill_switch=switch)
+    live.enable_live_trading()
+    assert live.place_order(1, "OPT", 100.0, 75, 'BUY')['status'] == 'success'
+    live.on_order_done(1, 'BUY', 75, 75)
+    # Acked but never filled, then cancelled: no position behind it
+    assert live.place_order(3, "OPT", 100.0, 75, 'BUY')['status'] == 'success'
+    live.on_order_done(3, 'BUY', 75, 0)
+
+    switch.engage('test')
+    # Direct calls bypassing the pipeline: no opening, adding or flipping
+    assert live.place_order(1, "OPT", 100.0, 75, 'BUY')['error'] == 'Kill switch engaged'
+    assert live.place_order(2, "OPT", 100.0, 75, 'SELL')['error'] == 'Kill switch engaged'
+    assert live.place_order(1, "OPT", 100.0, 150, 'SELL')['error'] == 'Kill switch engaged'
+    assert live.place_order(3, "OPT", 100.0, 75, 'SELL')['error'] == 'Kill switch engaged'
+    # Exits still go out, but working exits together never exceed the fill
+    assert live.place_order(1, "OPT", 100.0, 50, 'SELL')['status'] == 'success'
+    assert live.place_order(1, "OPT", 100.0, 50, 'SELL')['error'] == 'Kill switch engaged'
+    assert live.place_order(1, "OPT", 100.0, 25, 'SELL')['status'] == 'success'
+    assert dhan.orders == [('BUY', 1, 75), ('BUY', 3, 75), ('SELL', 1, 50), ('SELL', 1, 25)]
+
+    # A rejected exit frees its quantity for the retry
+    live.on_order_done(1, 'SELL', 50, 0)
+    assert live.place_order(1, "OPT", 100.0, 50, 'SELL')['status'] == 'success'
+
+
+def test_pipeline_reports_fills_to_the_executor():
+    class Executor(CancellableBroker):
+        def __init__(self):
+            super().__init__()
+            self.done = []
+
+        def on_order_done(self, security_id, side, quantity, filled_qty):
+            self.done.append((security_id, side, quantity, filled_qty))
+
+    broker = Executor()
+    pipeline = OrderPipeline(broker, poll_interval=10, kill_switch=KillSwitch())
+
+    async def scenario():
+        await pipeline.submit(1, "OPT", 100.0, 50)
+        pipeline.kill_switch.engage()
+        await pipeline.submit(2, "OPT", 100.0, 50)  # never reaches the executor
+        await asyncio.wait_for(pipeline.cancel_all(), 1)
+        await pipeline.close()
+
+    asyncio.run(scenario())
+    assert broker.done == [(1, 'BUY', 50, 0)]
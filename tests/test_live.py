@@ -0,0 +1,120 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from live import LiveHub, StatusWatcher, TradeWatcher, LogWatcher
+from readers import TradeFileCache, LogTail
+
+
+class CountingWatcher(StatusWatcher):
+    def __init__(self, status_fn):
+        super().__init__(status_fn)
+        self.polls = 0
+
+    def poll(self):
+        self.polls += 1
+        return super().poll()
+
+
+def _drain(queue):
+    messages = []
+    while not queue.empty():
+        messages.append(queue.get_nowait())
+    return messages
+
+
+def test_hub_polls_once_per_interval_for_all_clients():
+    async def scenario():
+        state = {"running": False}
+        watcher = CountingWatcher(lambda: dict(state))
+        hub = LiveHub(poll_interval=3600)
+        hub.add_source(watcher)
+
+        queues = [hub.subscribe() for _ in range(5)]
+        for queue in queues:
+            assert _drain(queue) == [{"type": "status", "data": {"running": False}}]
+
+        polls = watcher.polls
+        state["running"] = True
+        hub.poll()
+        assert watcher.polls == polls + 1
+        for queue in queues:
+            assert _drain(queue) == [{"type": "status", "data": {"running": True}}]
+
+        await hub.stop()
+
+    asyncio.run(scenario())
+
+
+def test_snapshot_and_diffs_do_not_overlap(tmp_path):
+    async def scenario():
+        trades_file = tmp_path / "trades.json"
+        log_file = tmp_path / "bot.log"
+        trades_file.write_text(json.dumps([{"order_type": "BUY"}]))
+        log_file.write_text("one\n")
+
+        hub = LiveHub(poll_interval=3600)
+        hub.add_source(TradeWatcher(TradeFileCache(), lambda: trades_file))
+        hub.add_source(LogWatcher(LogTail(), lambda: log_file))
+        first = hub.subscribe()
+        _drain(first)
+
+        trades_file.write_text(json.dumps([{"order_type": "BUY"}, {"order_type": "SELL", "pnl": 7}]))
+        with open(log_file, "a") as f:
+            f.write("two\n")
+        second = hub.subscribe()
+
+        first_messages = {m["type"]: m["data"] for m in _drain(first)}
+        assert first_messages["trades"] == {"trades": [{"order_type": "SELL", "pnl": 7}], "reset": False}
+        assert first_messages["logs"]["logs"] == ["two\n"]
+
+        second_messages = {m["type"]: m["data"] for m in _drain(second)}
+        assert len(second_messages["trades"]["trades"]) == 2
+        assert second_messages["logs"]["logs"] == ["one\n", "two\n"]
+        assert second_messages["pnl"]["total_pnl"] == 7
+
+        hub.poll()
+        assert _drain(first) == []
+        assert _drain(second) == []
+        await hub.stop()
+
+    asyncio.run(scenario())
+
+
+def test_slow_client_is_dropped():
+    async def scenario():
+        state = {"n": 0}
+        hub = LiveHub(poll_interval=3600, queue_size=2)
+        hub.add_source(StatusWatcher(lambda: dict(state)))
+        queue = hub.subscribe()
+
+        for n in range(1, 4):
+            state["n"] = n
+            hub.poll()
+
+        assert hub.client_count == 0
+        assert queue.get_nowait() is None
+        await hub.stop()
+
+    asyncio.run(scenario())
+
+
+def test_log_watcher_restarts_on_a_new_days_file(tmp_path):
+    files = {"path": tmp_path / "bot_20261019.log"}
+    files["path"].write_text("".join(f"day one {i}\n" for i in range(10)))
+    watcher = LogWatcher(LogTail(), lambda: files["path"], lines=3)
+    watcher.poll()
+
+    with open(files["path"], "a") as f:
+        f.write("".join(f"burst {i}\n" for i in range(5)))
+    (event, data), = watcher.poll()
+    assert data["logs"] == [f"burst {i}\n" for i in range(5)] and not data["reset"]
+
+    # The next day's file is already larger than yesterday's cursor
+    files["path"] = tmp_path / "bot_20261020.log"
+    files["path"].write_text("".join(f"day two {i}\n" for i in range(50)))
+    (event, data), = watcher.poll()
+    assert data["reset"] and data["logs"] == ["day two 47\n", "day two 48\n", "day two 49\n"]
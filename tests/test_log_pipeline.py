@@ -0,0 +1,113 @@
+import gzip
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "index_options_bot"))
+
+from utils.log_pipeline import DailyJsonFileHandler, RateLimitFilter, setup_logging, shutdown_logging
+
+
+def _read(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_json_lines_written_off_thread(tmp_path):
+    setup_logging('test', logs_dir=tmp_path, console=False)
+    try:
+        logger = logging.getLogger('tests.pipeline')
+        logger.info("Filled %s x %s", 'NIFTY 25000 CE', 75, extra={'event': 'fill', 'price': 101.5})
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Order failed")
+    finally:
+        shutdown_logging()
+
+    fill, error = _read(tmp_path / 'test.jsonl')
+    assert fill['msg'] == "Filled NIFTY 25000 CE x 75"
+    assert fill['logger'] == 'tests.pipeline' and fill['level'] == 'INFO'
+    assert fill['event'] == 'fill' and fill['price'] == 101.5
+    assert fill['time'].endswith('+05:30')
+    assert error['level'] == 'ERROR' and 'ValueError: boom' in error['exc']
+
+
+def test_rate_limit_is_per_logger_and_reports_drops():
+    now = [0.0]
+    limiter = RateLimitFilter(rate=10, burst=5, clock=lambda: now[0])
+
+    def record(name, level=logging.INFO):
+        return logging.makeLogRecord({'name': name, 'levelno': level, 'msg': 'tick'})
+
+    assert sum(limiter.filter(record('ticks')) for _ in range(20)) == 5
+    assert limiter.filter(record('orders'))
+    assert limiter.filter(record('ticks', logging.WARNING))
+
+    now[0] += 0.1  # one token back
+    passed = record('ticks')
+    assert limiter.filter(passed)
+    assert passed.suppressed == 15
+    assert not limiter.filter(record('ticks'))
+
+
+def test_rotation_compresses(tmp_path):
+    handler = DailyJsonFileHandler(tmp_path / 'bot.jsonl', backup_days=2)
+    handler.emit(logging.makeLogRecord({'name': 'bot', 'levelname': 'INFO', 'msg': 'day one'}))
+    handler.doRollover()
+    handler.close()
+
+    rotated = list(tmp_path.glob('bot.jsonl.*.gz'))
+    assert len(rotated) == 1
+    with gzip.open(rotated[0], 'rt') as f:
+        assert json.loads(f.readline())['msg'] == 'day one'
+
+
+def test_tick_logging_costs_microseconds(tmp_path):
+    setup_logging('bench', logs_dir=tmp_path, console=False)
+    try:
+        logger = logging.getLogger('tests.ticks')
+        calls = 20_000
+        started = time.perf_counter()
+        for i in range(calls):
+            logger.info("%s LTP %s", 'NIFTY', 25000.0 + i)
+        per_call_us = (time.perf_counter() - started) / calls * 1e6
+    finally:
+        shutdown_logging()
+    # Mostly rate limited, but each call still builds and filters a record
+    assert per_call_us < 50
+
+
+def test_rate_limit_is_thread_safe():
+    import threading
+
+    limiter = RateLimitFilter(rate=1e-9, burst=1000, clock=lambda: 0.0)
+
+    def flood(passed):
+        for _ in range(500):
+            passed.append(limiter.filter(logging.makeLogRecord({'name': 'ticks', 'levelno': logging.INFO})))
+
+    results = [[] for _ in range(8)]
+    threads = [threading.Thread(target=flood, args=(passed,)) for passed in results]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(sum(passed) for passed in results) == 1000
+
+
+def test_rotates_at_ist_midnight(tmp_path):
+    from datetime import datetime
+    from utils.ist import IST
+
+    handler = DailyJsonFileHandler(tmp_path / 'bot.jsonl', backup_days=2)
+    handler.emit(logging.makeLogRecord({'name': 'bot', 'levelname': 'INFO', 'msg': 'late'}))
+    evening = datetime(2026, 1, 1, 23, 59, tzinfo=IST).timestamp()  # 18:29 UTC
+    handler.rolloverAt = handler.computeRollover(evening)
+    assert handler.rolloverAt == datetime(2026, 1, 2, tzinfo=IST).timestamp()
+
+    handler.doRollover()
+    handler.doRollover()  # nothing logged since: no file to rotate
+    handler.close()
+    assert [p.name for p in tmp_path.glob('bot.jsonl.*.gz')] == ['bot.jsonl.2026-01-01.gz']
@@ -0,0 +1,107 @@
+import sys
+import time
+from datetime import date, datetime, time as dtime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "index_options_bot"))
+
+from config.settings import config
+from utils.market_calendar import IST, NS, MarketCalendar, load_calendar
+
+
+class Clocks:
+    """Wall and monotonic clocks that advance together"""
+
+    def __init__(self, when):
+        self.wall = int(when.timestamp() * NS)
+        self.mono = 10 * NS
+
+    def advance(self, seconds):
+        self.wall += int(seconds * NS)
+        self.mono += int(seconds * NS)
+
+
+def _calendar(when, **kwargs):
+    clocks = Clocks(when)
+    calendar = MarketCalendar(clock=lambda: clocks.wall, monotonic=lambda: clocks.mono, **kwargs)
+    return calendar, clocks
+
+
+def test_regular_session_boundaries():
+    # Monday 2026-01-05, 09:00 IST
+    calendar, clocks = _calendar(datetime(2026, 1, 5, 9, 0, tzinfo=IST))
+    assert not calendar.is_open()
+    assert calendar.seconds_until_open() == pytest.approx(15 * 60)
+    assert calendar.seconds_until_close() == 0
+
+    clocks.advance(15 * 60)
+    assert calendar.is_open()
+    assert calendar.seconds_until_open() == 0
+    assert calendar.seconds_until_close() == pytest.approx(6.25 * 3600)
+
+    clocks.advance(6.25 * 3600)
+    assert not calendar.is_open()
+    assert calendar.seconds_until_open() == pytest.approx(24 * 3600 - 6.25 * 3600)
+
+    # The next morning is a new day: boundaries roll over on the first check
+    clocks.advance(24 * 3600 - 6.25 * 3600)
+    assert calendar.is_open()
+
+
+def test_holidays_and_weekends_are_skipped():
+    # Friday 2026-04-03 is Good Friday: next open is Monday 09:15
+    calendar, _ = _calendar(datetime(2026, 4, 2, 16, 0, tzinfo=IST), holidays={date(2026, 4, 3)})
+    assert not calendar.is_open()
+    monday = datetime(2026, 4, 6, 9, 15, tzinfo=IST)
+    thursday = datetime(2026, 4, 2, 16, 0, tzinfo=IST)
+    assert calendar.seconds_until_open() == pytest.approx((monday - thursday).total_seconds())
+    assert not calendar.is_trading_day(date(2026, 4, 4))
+
+
+def test_special_sessions_replace_the_day():
+    sessions = {
+        date(2025, 2, 1): (dtime(9, 15), dtime(15, 30)),    # Saturday budget session
+        date(2025, 10, 21): (dtime(13, 45), dtime(14, 45)),  # Muhurat trading
+    }
+    calendar, clocks = _calendar(datetime(2025, 2, 1, 10, 0, tzinfo=IST), sessions=sessions)
+    assert calendar.is_open()
+
+    calendar, clocks = _calendar(datetime(2025, 10, 21, 10, 0, tzinfo=IST), sessions=sessions)
+    assert not calendar.is_open()
+    assert calendar.seconds_until_open() == pytest.approx(3.75 * 3600)
+    clocks.advance(4 * 3600)
+    assert calendar.is_open()
+    assert calendar.seconds_until_close() == pytest.approx(45 * 60)
+
+
+def test_shipped_calendar_loads():
+    sessions, holidays = load_calendar(config.MARKET_CALENDAR_FILE)
+    assert date(2025, 12, 25) in holidays
+    assert sessions[date(2025, 10, 21)] == (dtime(13, 45), dtime(14, 45))
+    assert not holidays & set(sessions)
+    assert len([day for day in holidays if day.year == 2026]) == 15
+    assert all(day.weekday() < 5 for day in holidays)
+
+
+def test_uncovered_year_is_reported_once(caplog):
+    calendar, clocks = _calendar(datetime(2027, 1, 4, 9, 0, tzinfo=IST), years={2025, 2026})
+    assert not calendar.covers(date(2027, 1, 4)) and calendar.covers(date(2026, 12, 31))
+    with caplog.at_level("ERROR", logger="utils.market_calendar"):
+        calendar.is_open()
+        clocks.advance(24 * 3600)
+        calendar.is_open()
+    assert [r.getMessage() for r in caplog.records] == [
+        "Market calendar has no holidays for 2027; add them from the NSE holiday circular"
+    ]
+
+
+def test_checks_are_cheap():
+    calendar = MarketCalendar()
+    checks = 100_000
+    started = time.perf_counter()
+    for _ in range(checks):
+        calendar.is_open()
+    per_check_us = (time.perf_counter() - started) / checks * 1e6
+    assert per_check_us < 5
@@ -0,0 +1,39 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "index_options_bot"))
+
+from runtime.candles import Bar
+from strategy import MultiTimeframeSuperTrend
+
+OPEN = 1767239100  # 2026-01-01 09:15 IST, aligned to 15m
+
+
+def _bar(minute, price):
+    return Bar(OPEN + minute * 60, price, price + 1, price - 1, price, 10)
+
+
+def test_gap_closes_the_pending_bar_instead_of_dropping_it():
+    engine = MultiTimeframeSuperTrend(1, [5], period=7, multiplier=2)
+    five = engine.graphs[1]
+    for minute in range(4):  # 09:15-09:18; the 09:19 bar never arrives
+        assert engine.update(_bar(minute, 100 + minute)) == [0]
+
+    # First bar of the next 5m period closes the gapped one as it stands
+    assert engine.update(_bar(5, 110)) == [0, 1]
+    assert five.last_start == OPEN
+    assert engine.supertrends[1].bars == 1
+    assert engine.graphs[0].last_start == OPEN + 5 * 60
+
+    for minute in range(6, 10):
+        closed = engine.update(_bar(minute, 110))
+    assert closed == [0, 1] and engine.supertrends[1].bars == 2
+
+
+def test_gap_across_a_whole_period_closes_once():
+    engine = MultiTimeframeSuperTrend(1, [5], period=7, multiplier=2)
+    engine.update(_bar(0, 100))
+    # Nothing from 09:16 to 09:24; 09:25 both closes 09:15 and starts 09:25
+    assert engine.update(_bar(10, 105)) == [0, 1]
+    assert engine.supertrends[1].bars == 1
+    assert engine._forming[1].start == OPEN + 10 * 60
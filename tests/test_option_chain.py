@@ -0,0 +1,132 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "index_options_bot"))
+
+from options import OptionChain, black_scholes
+
+SPOT = 23010.0
+T = 5 / 365
+RATE = 0.07
+
+
+def _chain_arrays(n_strikes=50):
+    strikes = np.repeat((np.arange(n_strikes) - n_strikes // 2) * 50 + SPOT, 2).round(-1)
+    is_call = np.tile([True, False], n_strikes)
+    sigma = 0.12 + 0.0005 * np.abs(strikes - SPOT) / 50  # a smile
+    return strikes, is_call, sigma
+
+
+def test_put_call_parity_and_iv_round_trip():
+    strikes, is_call, sigma = _chain_arrays()
+    premium = black_scholes.price(SPOT, strikes, T, RATE, sigma, is_call)
+
+    calls, puts = premium[is_call], premium[~is_call]
+    k = strikes[is_call]
+    np.testing.assert_allclose(calls - puts, SPOT - k * np.exp(-RATE * T), atol=1e-4)
+
+    iv = black_scholes.implied_vol(premium, SPOT, strikes, T, RATE, is_call)
+    solvable = premium > 0.05  # far wings round to nothing
+    np.testing.assert_allclose(iv[solvable], sigma[solvable], atol=1e-4)
+
+
+def test_greeks_match_finite_differences():
+    strikes, is_call, sigma = _chain_arrays(10)
+    delta, gamma, theta, vega = black_scholes.greeks(SPOT, strikes, T, RATE, sigma, is_call)
+
+    h = 0.01
+    up = black_scholes.price(SPOT + h, strikes, T, RATE, sigma, is_call)
+    down = black_scholes.price(SPOT - h, strikes, T, RATE, sigma, is_call)
+    mid = black_scholes.price(SPOT, strikes, T, RATE, sigma, is_call)
+    np.testing.assert_allclose(delta, (up - down) / (2 * h), atol=1e-4)
+    np.testing.assert_allclose(gamma, (up - 2 * mid + down) / h ** 2, atol=1e-3)
+
+    vol_up = black_scholes.price(SPOT, strikes, T, RATE, sigma + 0.01, is_call)
+    vol_down = black_scholes.price(SPOT, strikes, T, RATE, sigma - 0.01, is_call)
+    np.testing.assert_allclose(vega, (vol_up - vol_down) / 2, rtol=5e-3)
+
+    day_later = black_scholes.price(SPOT, strikes, T - 1 / 365, RATE, sigma, is_call)
+    np.testing.assert_allclose(theta, day_later - mid, rtol=0.1, atol=0.5)
+
+
+def test_bounds_violations_give_nan():
+    iv = black_scholes.implied_vol(
+        np.array([0.0, 30000.0, 100.0]), SPOT, np.array([23000.0, 23000.0, 23000.0]), T, RATE,
+        np.array([True, True, True])
+    )
+    assert np.isnan(iv[0]) and np.isnan(iv[1]) and not np.isnan(iv[2])
+
+
+class FakeInstruments:
+    def __init__(self, expiry):
+        strikes = np.arange(22000, 24050, 50)
+        rows = [
+            {"security_id": 100000 + i * 2 + (t == "PE"), "underlying": "NIFTY", "expiry": expiry,
+             "strike": s, "option_type": t, "instrument_type": "OPTIDX"}
+            for i, s in enumerate(strikes) for t in ("CE", "PE")
+        ]
+        self.df = pd.DataFrame(rows)
+        self.expiry = expiry
+
+    def filter_options(self, underlying="NIFTY"):
+        return self.df[self.df["underlying"] == underlying]
+
+    def get_nearest_expiry(self, underlying=None):
+        return self.expiry
+
+
+class FakeQuotes:
+    def __init__(self, instruments, t):
+        self.calls = 0
+        df = instruments.df
+        is_call = (df["option_type"] == "CE").to_numpy()
+        premium = black_scholes.price(SPOT, df["strike"].to_numpy(float), t, RATE, 0.15, is_call)
+        self.prices = dict(zip(df["security_id"], premium))
+
+    def get_ltp_batch(self, instruments):
+        self.calls += 1
+        return {
+            (segment, sid): SPOT if segment == "IDX_I" else self.prices[sid]
+            for segment, sid in instruments
+        }
+
+
+def test_snapshot_selects_by_delta_and_premium():
+    now = time.time()
+    expiry = time.strftime("%Y-%m-%d", time.localtime(now + 7 * 86400))
+    instruments = FakeInstruments(expiry)
+    chain = OptionChain(instruments, None, "NIFTY", strikes_each_side=10, rate=RATE)
+    from options import years_to_expiry
+    chain.price_source = FakeQuotes(instruments, years_to_expiry(expiry, now))
+
+    snapshot = chain.snapshot(now=now)
+    assert chain.price_source.calls == 2  # index, then the whole chain in one request
+    assert len(snapshot) == 42  # 21 strikes x CE/PE
+    assert snapshot.strikes.min() == 22500 and snapshot.strikes.max() == 23500
+    np.testing.assert_allclose(snapshot.iv[snapshot.ltp > 0.05], 0.15, atol=1e-4)
+
+    call = snapshot.select_by_delta(0.3, "CE")
+    put = snapshot.select_by_delta(-0.3, "PE")
+    assert call["strike"] > SPOT > put["strike"]
+    assert abs(call["delta"] - 0.3) < 0.1 and abs(put["delta"] + 0.3) < 0.1
+
+    cheap = snapshot.select_by_premium(50, "CE")
+    assert abs(cheap["ltp"] - 50) < 40
+
+
+def test_hundred_option_chain_solves_in_milliseconds():
+    strikes, is_call, sigma = _chain_arrays(50)  # 100 options
+    premium = black_scholes.price(SPOT, strikes, T, RATE, sigma, is_call)
+
+    best = float("inf")
+    for _ in range(20):
+        started = time.perf_counter()
+        iv = black_scholes.implied_vol(premium, SPOT, strikes, T, RATE, is_call)
+        black_scholes.greeks(SPOT, strikes, T, RATE, iv, is_call)
+        best = min(best, time.perf_counter() - started)
+    print(f"100-option IV + Greeks: {best * 1000:.3f} ms")
+    assert best < 0.005
@@ -0,0 +1,123 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "index_options_bot"))
+
+from execution.order_pipeline import OrderPipeline
+from execution.latency import LatencyHistogram
+
+
+class ScriptedBroker:
+    """Acks with an order ID; each order-book poll advances every order one step"""
+
+    def __init__(self, steps):
+        self.steps = steps  # [(status, filled_qty, avg_price)] per poll
+        self.orders = {}
+        self.book_requests = 0
+
+    def place_order(self, security_id, symbol, price, quantity, order_type='BUY'):
+        if quantity <= 0:
+            return {'status': 'failure', 'remarks': 'Invalid quantity'}
+        order_id = str(len(self.orders) + 1)
+        self.orders[order_id] = 0
+        return {'status': 'success', 'data': {'orderId': order_id, 'orderStatus': 'TRANSIT'}}
+
+    def get_order_book(self):
+        self.book_requests += 1
+        book = []
+        for order_id, step in self.orders.items():
+            status, filled, price = self.steps[min(step, len(self.steps) - 1)]
+            self.orders[order_id] = step + 1
+            book.append({'orderId': order_id, 'orderStatus': status, 'filledQty': filled,
+                         'averageTradedPrice': price})
+        return book
+
+
+def test_partial_fills_resolve_with_average_price():
+    broker = ScriptedBroker([('PENDING', 0, 0), ('PART_TRADED', 25, 101.0), ('TRADED', 50, 101.5)])
+    pipeline = OrderPipeline(broker, poll_interval=0.01)
+
+    async def scenario():
+        tickets = [await pipeline.submit(1000 + i, f"OPT{i}", 100.0, 50, 'BUY') for i in range(3)]
+        assert all(t.status == 'TRANSIT' for t in tickets)
+        return await asyncio.gather(*(t.wait() for t in tickets))
+
+    tickets = asyncio.run(scenario())
+    assert all(t.status == 'TRADED' and t.filled_qty == 50 and t.avg_price == 101.5 for t in tickets)
+    # Every poll covers all open orders with one order-book request
+    assert broker.book_requests <= 4
+    stats = pipeline.stats()
+    assert stats['pending'] == 0
+    assert stats['submit_to_ack']['count'] == 3 and stats['submit_to_fill']['count'] == 3
+
+
+def test_rejections_and_timeouts_resolve_unfilled():
+    broker = ScriptedBroker([('PENDING', 0, 0)])
+    pipeline = OrderPipeline(broker, poll_interval=0.01, timeout=0.05)
+
+    async def scenario():
+        rejected = await pipeline.submit(1, "OPT", 100.0, 0)
+        stuck = await pipeline.submit(2, "OPT", 100.0, 50)
+        return await rejected.wait(), await stuck.wait()
+
+    rejected, stuck = asyncio.run(scenario())
+    assert rejected.status == 'REJECTED' and rejected.error == 'Invalid quantity'
+    assert stuck.status == 'TIMEOUT' and stuck.filled_qty == 0
+    assert pipeline.fill_latency.count == 0
+
+
+def test_untrackable_executor_fills_on_ack():
+    class Paper:
+        def place_order(self, security_id, symbol, price, quantity, order_type='BUY'):
+            return {'status': 'success', 'order_id': 'PAPER_1',
+                    'data': {'status': 'COMPLETED', 'price': price}}
+
+    async def scenario():
+        ticket = await OrderPipeline(Paper()).submit(1, "OPT", 99.5, 25)
+        return await ticket.wait()
+
+    ticket = asyncio.run(scenario())
+    assert ticket.is_filled and ticket.filled_qty == 25 and ticket.avg_price == 99.5
+
+
+def test_latency_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for ms in [0.5] * 50 + [15] * 40 + [700] * 9 + [45000]:
+        histogram.record(ms)
+    assert histogram.percentile(50) == 1
+    assert histogram.percentile(90) == 20
+    assert histogram.percentile(99) == 1000
+    assert histogram.percentile(100) == 45000
+    snapshot = histogram.snapshot()
+    assert snapshot['count'] == 100 and snapshot['buckets']['>30000'] == 1
+
+
+class StuckBroker(ScriptedBroker):
+    """Orders never fill on their own; the first cancel fails, and 10 fill before the second lands"""
+
+    def __init__(self):
+        super().__init__([('PENDING', 0, 0)])
+        self.cancels = []
+
+    def cancel_order(self, order_id):
+        self.cancels.append(order_id)
+        if len(self.cancels) == 1:
+            return {'status': 'failure', 'remarks': 'Exchange busy'}
+        self.steps = [('CANCELLED', 10, 99.5)]
+        return {'status': 'success'}
+
+
+def test_timed_out_orders_are_cancelled_before_resolving():
+    broker = StuckBroker()
+    pipeline = OrderPipeline(broker, poll_interval=0.01, timeout=0.05)
+
+    async def scenario():
+        ticket = await pipeline.submit(1, "OPT", 100.0, 50)
+        return await asyncio.wait_for(ticket.wait(), 1)
+
+    ticket = asyncio.run(scenario())
+    assert broker.cancels == ['1', '1']  # still tracked after the failed cancel, then retried
+    assert ticket.status == 'TIMEOUT'
+    assert ticket.filled_qty == 10 and ticket.avg_price == 99.5
+    assert not pipeline.pending
@@ -0,0 +1,64 @@
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "index_options_bot"))
+
+from execution import PaperTrading
+from execution.paper_book import PaperBook
+
+
+def test_netting_realizes_pnl_on_reductions_and_flips():
+    book = PaperBook()
+    book.fill('1', 101, 'OPT', 'BUY', 100.0, 50)
+    book.fill('2', 101, 'OPT', 'BUY', 110.0, 50)
+    position = book.position(101)
+    assert position.net_qty == 100 and position.avg_price == 105.0
+
+    book.fill('3', 101, 'OPT', 'SELL', 120.0, 40)
+    assert book.realized_pnl == 600.0 and position.net_qty == 60
+
+    book.update_price(101, 100.0)
+    assert book.unrealized_pnl == -300.0 == position.unrealized
+
+    # Sell 100 against 60 long: realize the 60, go 40 short at 90
+    flip = book.fill('4', 101, 'OPT', 'SELL', 90.0, 100)
+    assert flip.realized == -900.0 and book.realized_pnl == -300.0
+    assert position.net_qty == -40 and position.avg_price == 90.0
+    book.update_price(101, 80.0)
+    assert book.unrealized_pnl == 400.0
+
+    book.fill('5', 101, 'OPT', 'BUY', 80.0, 40)
+    assert not book.is_open(101) and book.open_positions() == {}
+    assert book.realized_pnl == 100.0 and book.unrealized_pnl == 0.0
+    assert book.order('4') is flip
+
+
+def test_paper_exit_closes_the_matching_entry():
+    paper = PaperTrading(save_trades=False)
+    entry = paper.place_order(101, 'NIFTY 23000 CE', 100.0, 50, 'BUY')
+    other = paper.place_order(102, 'NIFTY 23000 PE', 80.0, 50, 'BUY')
+    assert entry['order_id'] != other['order_id']
+    assert set(paper.get_positions()) == {101, 102}
+
+    exit_ = paper.place_order(101, 'NIFTY 23000 CE', 125.0, 50, 'SELL')
+    assert exit_['data']['pnl'] == 1250.0
+    assert set(paper.get_positions()) == {102}
+    assert paper.calculate_pnl() == 1250.0
+    assert len(paper.get_trades()) == 3
+
+
+def test_fill_records_stay_small():
+    book = PaperBook()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for i in range(20000):
+        book.fill(i, 100 + i // 2 % 20, 'OPT', 'BUY' if i % 2 == 0 else 'SELL', 100.0 + i % 7, 25, timestamp=1.0)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    grown = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    print(f"{grown / 20000:.0f} bytes per fill")
+    assert not hasattr(book.fills[0], '__dict__')
+    assert grown / 20000 < 300  # bytes per fill, including both indexes (a dict per trade is ~3x)
+    assert len(book.open_positions()) == 0
@@ -0,0 +1,85 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "index_options_bot"))
+
+from risk import PortfolioRisk
+
+
+def test_marks_to_market_and_realizes():
+    portfolio = PortfolioRisk(max_loss_per_day=10000)
+    portfolio.open(1, "NIFTY", 50, 100.0)
+    portfolio.open(1, "NIFTY", 50, 110.0)  # same contract, averaged at 105
+    portfolio.open(2, "NIFTY", 25, 80.0)
+    assert portfolio.margin_used == pytest.approx(12500)
+
+    portfolio.on_price(1, 108.0)
+    portfolio.on_price(2, 70.0)
+    assert portfolio.unrealized == pytest.approx(100 * 3 - 25 * 10)
+
+    assert portfolio.close(1, 40, 112.0) == pytest.approx(40 * 7)
+    assert portfolio.realized == pytest.approx(280)
+    assert portfolio.unrealized == pytest.approx(60 * 3 - 25 * 10)
+    assert portfolio.margin_used == pytest.approx(60 * 105 + 25 * 80)
+
+    portfolio.close(1, 60, 100.0)
+    portfolio.close(2, 25, 70.0)
+    assert not portfolio.holdings
+    assert portfolio.unrealized == pytest.approx(0)
+    assert portfolio.margin_used == pytest.approx(0)
+    assert portfolio.total_pnl == pytest.approx(280 - 300 - 250)
+
+
+def test_net_delta_follows_the_index_through_gamma():
+    portfolio = PortfolioRisk()
+    portfolio.on_index("NIFTY", 24000)
+    portfolio.open(1, "NIFTY", 50, 120.0, delta=0.5, gamma=0.001)
+    portfolio.open(2, "NIFTY", 50, 110.0, delta=-0.4, gamma=0.001)
+    assert portfolio.net_delta["NIFTY"] == pytest.approx(5)
+
+    portfolio.on_index("NIFTY", 24100)
+    assert portfolio.net_delta["NIFTY"] == pytest.approx(5 + 100 * 0.1)
+
+    # Closing removes the contract's delta as carried to the current index
+    portfolio.close(1, 50, 150.0)
+    assert portfolio.net_delta["NIFTY"] == pytest.approx(50 * (-0.4 + 0.1))
+    assert portfolio.net_gamma["NIFTY"] == pytest.approx(0.05)
+
+
+def test_combined_loss_stops_out_once():
+    calls = []
+    portfolio = PortfolioRisk(max_loss_per_day=2000, on_stop_out=calls.append)
+    portfolio.open(1, "NIFTY", 50, 100.0)
+    portfolio.close(1, 50, 80.0)  # -1000 realized
+    portfolio.open(2, "BANKNIFTY", 30, 200.0)
+    portfolio.on_price(2, 180.0)  # -600 open: -1600 total
+    assert not portfolio.stopped_out
+
+    portfolio.on_price(2, 165.0)  # -1050 open: -2050 total
+    assert portfolio.stopped_out
+    assert calls == [pytest.approx(-2050)]
+
+    portfolio.on_price(2, 150.0)
+    assert len(calls) == 1
+    assert portfolio.snapshot()["stopped_out"] is True
+
+
+def test_ticks_are_constant_time():
+    portfolio = PortfolioRisk(max_loss_per_day=1e12)
+    for security_id in range(200):
+        portfolio.open(security_id, "NIFTY", 50, 100.0, delta=0.5, gamma=0.001)
+    portfolio.on_index("NIFTY", 24000)
+
+    ticks = 100_000
+    started = time.perf_counter()
+    for i in range(ticks):
+        portfolio.on_price(i % 200, 100.0 + i % 7)
+        portfolio.on_index("NIFTY", 24000 + i % 11)
+    per_tick_us = (time.perf_counter() - started) / (2 * ticks) * 1e6
+
+    expected = sum((100.0 + i % 7 - 100.0) * 50 for i in range(ticks - 200, ticks))
+    assert portfolio.unrealized == pytest.approx(expected)
+    assert per_tick_us < 20
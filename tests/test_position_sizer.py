@@ -0,0 +1,99 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "index_options_bot"))
+
+from risk import PositionSizer, FundsCache
+
+
+class Broker:
+    def __init__(self, balance):
+        self.balance = balance
+        self.calls = 0
+
+    def get_fund_limits(self):
+        self.calls += 1
+        return {'status': 'success', 'data': {'availabelBalance': self.balance}}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _sizer(**kwargs):
+    limits = dict(capital=100000, lot_size=25, risk_per_trade_pct=1, max_loss_per_trade=1000,
+                  max_loss_per_day=3000, stop_loss_pct=30)
+    limits.update(kwargs)
+    return PositionSizer(**limits)
+
+
+def test_sizes_whole_lots_and_shrinks_with_atr():
+    sizer = _sizer()
+    # 30% stop on a 40 premium risks 12/unit, 300/lot: 1000 buys 3 lots
+    assert sizer.size(40.0) == 75
+    # A 40-point ATR at delta 0.5 risks 20/unit: 2 lots
+    assert sizer.size(40.0, delta=0.5, atr=40) == 50
+    # A quiet index does not loosen the stop-based size
+    assert sizer.size(40.0, delta=0.5, atr=5) == 75
+    assert sizer.size(40.0, delta=0.5, atr=float('nan')) == 75
+    assert _sizer(max_lots=1).size(40.0) == 25
+
+
+def test_daily_budget_and_funds_cap_size():
+    sizer = _sizer()
+    assert sizer.budget(day_pnl=500) == 1000
+    assert sizer.budget(day_pnl=-2500) == 500
+    assert sizer.size(40.0, day_pnl=-2500) == 25
+    assert sizer.size(40.0, day_pnl=-3000) == 0
+
+    broker, clock = Broker(2500.0), Clock()
+    funds = FundsCache(broker, ttl=30, clock=clock)
+    funded = _sizer(funds=funds)
+    assert funds.get() == 2500.0  # start-up fetch
+    # 2500 pays for 2 lots at 40 x 25
+    assert funded.size(40.0) == 50
+    broker.balance = 100000.0
+    clock.now = 31
+    # Sizing only reads the cache, even once it is stale
+    assert funded.size(40.0) == 50 and broker.calls == 1
+
+    async def refresh_in_background():
+        task = asyncio.create_task(funds.run(check_interval=0.01))
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+    asyncio.run(refresh_in_background())
+    assert broker.calls == 2  # fetched once on a worker thread, fresh again until the ttl
+    assert funded.size(40.0) == 75
+
+
+def test_what_if_sizes_a_ladder_in_one_call():
+    sizer = _sizer(max_loss_per_trade=5000, risk_per_trade_pct=5)
+    premiums = np.array([180.0, 120.0, 75.0, 42.0, 21.0])
+    deltas = np.array([0.72, 0.61, 0.5, 0.37, 0.22])
+    sized = sizer.what_if(premiums, deltas, atr=30)
+
+    scalar = [sizer.size(p, d, atr=30) for p, d in zip(premiums, deltas)]
+    assert sized['quantity'].tolist() == scalar
+    assert all(q % 25 == 0 for q in scalar)
+    assert (sized['risk'] <= 5000).all()
+
+    best, _ = sizer.best(premiums, deltas, atr=30)
+    assert best == int(np.argmax(sized['delta_exposure']))
+
+    ladder = 1000
+    premiums = np.linspace(300, 5, ladder)
+    deltas = np.linspace(0.9, 0.05, ladder)
+    started = time.perf_counter()
+    for _ in range(100):
+        sizer.what_if(premiums, deltas, atr=30)
+    per_call_ms = (time.perf_counter() - started) / 100 * 1000
+    assert per_call_ms < 5
@@ -0,0 +1,130 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from readers import TradeFileCache, LogTail
+
+
+def _write_trades(path, trades):
+    with open(path, 'w') as f:
+        json.dump(trades, f, indent=2)
+
+
+def _trade(i, order_type='BUY', pnl=None):
+    trade = {'order_id': f'PAPER_{i}', 'order_type': order_type, 'price': 100 + i}
+    if pnl is not None:
+        trade['pnl'] = pnl
+    return trade
+
+
+def test_trade_cache_reuses_parse_when_unchanged(tmp_path):
+    path = tmp_path / "trades.json"
+    _write_trades(path, [_trade(1), _trade(2, 'SELL', 50)])
+
+    cache = TradeFileCache()
+    first = cache.get(path)
+    version = cache.version
+
+    assert cache.get(path) is first
+    assert cache.version == version
+    assert cache.performance(path) is cache.performance(path)
+
+
+def test_trade_cache_parses_only_appended_records(tmp_path, monkeypatch):
+    path = tmp_path / "trades.json"
+    trades = [_trade(1), _trade(2, 'SELL', 50)]
+    _write_trades(path, trades)
+
+    cache = TradeFileCache()
+    cache.get(path)
+
+    trades += [_trade(3), _trade(4, 'SELL', -20)]
+    _write_trades(path, trades)
+
+    def fail_full_read(self, path):
+        raise AssertionError("full re-parse on append")
+    monkeypatch.setattr(TradeFileCache, "_read_full", fail_full_read)
+
+    assert cache.get(path) == trades
+    perf = cache.performance(path)
+    assert perf["total_trades"] == 2
+    assert perf["wins"] == 1
+    assert perf["losses"] == 1
+    assert perf["total_pnl"] == 30
+
+
+def test_trade_cache_reloads_on_rewrite(tmp_path):
+    path = tmp_path / "trades.json"
+    _write_trades(path, [_trade(1), _trade(2)])
+
+    cache = TradeFileCache()
+    cache.get(path)
+
+    rewritten = [_trade(9, 'SELL', 10), _trade(8), _trade(7)]
+    _write_trades(path, rewritten)
+    assert cache.get(path) == rewritten
+    assert cache.stats(path).total_pnl == 10
+
+
+def test_trade_cache_missing_file(tmp_path):
+    cache = TradeFileCache()
+    assert cache.get(tmp_path / "missing.json") == []
+    assert cache.performance(tmp_path / "missing.json")["total_trades"] == 0
+
+
+def test_log_tail_reads_last_lines_backwards(tmp_path):
+    path = tmp_path / "bot.log"
+    path.write_text("".join(f"line {i}\n" for i in range(1000)))
+
+    tail = LogTail(block_size=64)
+    lines, offset = tail.tail(path, 3)
+    assert lines == ["line 997\n", "line 998\n", "line 999\n"]
+    assert offset == path.stat().st_size
+
+    lines, _ = tail.tail(path, 2000)
+    assert len(lines) == 1000
+    assert lines[0] == "line 0\n"
+
+
+def test_log_tail_after_offset_returns_only_new_lines(tmp_path):
+    path = tmp_path / "bot.log"
+    path.write_text("old 1\nold 2\n")
+
+    tail = LogTail(block_size=4)
+    _, offset = tail.tail(path, 100)
+    assert tail.tail(path, 100, after_offset=offset) == ([], offset)
+
+    with open(path, 'a') as f:
+        f.write("new 1\nnew 2\npartial")
+    lines, next_offset = tail.tail(path, 100, after_offset=offset)
+    assert lines == ["new 1\n", "new 2\n"]
+    assert next_offset == path.stat().st_size - len("partial")
+
+    with open(path, 'a') as f:
+        f.write(" done\n")
+    assert tail.tail(path, 100, after_offset=next_offset)[0] == ["partial done\n"]
+
+
+def test_log_tail_resets_stale_cursor(tmp_path):
+    path = tmp_path / "bot.log"
+    path.write_text("a\nb\n")
+
+    tail = LogTail()
+    assert tail.tail(path, 10, after_offset=10_000)[0] == ["a\n", "b\n"]
+    assert tail.tail(tmp_path / "missing.log", 10) == ([], 0)
+
+
+def test_log_tail_cursor_returns_every_new_line(tmp_path):
+    path = tmp_path / "bot.log"
+    path.write_text("old\n")
+
+    tail = LogTail(block_size=16)
+    _, offset = tail.tail(path, 5)
+    with open(path, 'a') as f:
+        f.write("".join(f"burst {i}\n" for i in range(50)))
+    # A burst larger than `lines` is not cut short after a cursor
+    lines, offset = tail.tail(path, 5, after_offset=offset)
+    assert lines == [f"burst {i}\n" for i in range(50)]
+    assert offset == path.stat().st_size
@@ -0,0 +1,125 @@
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "index_options_bot"))
+
+from execution import OrderPipeline
+from risk import RiskEngine
+
+IST = timezone(timedelta(hours=5, minutes=30))
+MORNING = datetime(2026, 1, 5, 10, 0, tzinfo=IST).timestamp()
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _engine(clock=None, **limits):
+    return RiskEngine(capital=100000, clock=clock or Clock(MORNING), **limits)
+
+
+def test_rules_from_rules_py_are_enforced_with_reasons():
+    engine = _engine()
+    assert engine.max_risk_per_trade == 1000  # min(MAX_LOSS_PER_TRADE, 1% of capital)
+    assert engine.check(101, 'BUY', 50, 100.0, stop_loss=80.0)
+
+    decision = engine.check(101, 'BUY', 50, 100.0, stop_loss=70.0)
+    assert not decision and decision.reasons == ["Risk 1500.00 exceeds per-trade limit 1000.00"]
+
+    # Default stop is STOP_LOSS_PERCENT below the price
+    assert not engine.check(101, 'BUY', 50, 100.0)
+
+    engine.clock.now = datetime(2026, 1, 5, 9, 16, tzinfo=IST).timestamp()
+    assert engine.check(101, 'BUY', 10, 100.0).reasons == ["Outside the trading window"]
+    engine.clock.now = datetime(2026, 1, 5, 15, 15, tzinfo=IST).timestamp()
+    assert not engine.check(101, 'BUY', 10, 100.0)
+
+
+def test_losses_trigger_cooldown_streak_and_daily_stop():
+    clock = Clock(MORNING)
+    engine = _engine(clock, max_trades_per_day=10)
+
+    engine.register_exit(-500, 'TRAILING_SL')
+    decision = engine.check(101, 'BUY', 10, 100.0)
+    assert decision.reasons == ["Cool-off after loss (900s remaining)"]
+
+    clock.now += 15 * 60
+    assert engine.check(101, 'BUY', 10, 100.0)
+    engine.register_exit(-2600, 'TRAILING_SL')
+    clock.now += 15 * 60
+    reasons = engine.check(101, 'BUY', 10, 100.0).reasons
+    assert reasons == ["Max loss per day reached (-3100.00)", "2 consecutive losses"]
+    assert not engine.can_take_trade()
+
+    # A profit resets the streak but not the daily loss
+    engine.register_exit(200, 'TARGET')
+    assert engine.check(101, 'BUY', 10, 100.0).reasons == ["Max loss per day reached (-2900.00)"]
+
+
+def test_exposure_positions_and_margin_limits():
+    engine = _engine(max_open_positions=2, max_exposure=12000, available_margin=10000)
+    engine.on_fill(101, 'BUY', 50, 100.0)
+    assert engine.exposure == 5000 and engine.available_margin == 5000
+
+    reasons = engine.check(102, 'BUY', 50, 150.0, stop_loss=135.0).reasons
+    assert reasons == ["Exposure 12500.00 exceeds 12000.00", "Needs 7500.00 margin, 5000.00 available"]
+
+    engine.on_fill(102, 'BUY', 20, 100.0)
+    assert engine.check(103, 'BUY', 10, 10.0).reasons == ["Max open positions reached (2)"]
+
+    # Exits are never blocked, and release exposure and margin
+    engine.trades_taken = 99
+    assert engine.check(101, 'SELL', 50, 90.0)
+    engine.on_fill(101, 'SELL', 25, 90.0)
+    assert engine.exposure == 4500 and engine.positions[101] == (25, 2500.0)
+    engine.on_fill(101, 'SELL', 25, 90.0)
+    assert 101 not in engine.positions and engine.exposure == 2000
+
+
+def test_pipeline_checks_inline_and_reports_fills():
+    class Broker:
+        def __init__(self):
+            self.orders = []
+
+        def place_order(self, security_id, symbol, price, quantity, order_type='BUY'):
+            self.orders.append((security_id, order_type))
+            return {'status': 'success'}
+
+    broker = Broker()
+    engine = _engine()
+    pipeline = OrderPipeline(broker, risk=engine)
+
+    async def scenario():
+        ok = await pipeline.submit(101, 'OPT', 100.0, 50, 'BUY', stop_loss=85.0)
+        blocked = await pipeline.submit(102, 'OPT', 100.0, 500, 'BUY', stop_loss=85.0)
+        return await ok.wait(), await blocked.wait()
+
+    ok, blocked = asyncio.run(scenario())
+    assert ok.is_filled and engine.positions[101] == (50, 5000.0)
+    assert blocked.status == 'REJECTED' and 'per-trade limit' in blocked.error
+    assert broker.orders == [(101, 'BUY')]
+
+
+def test_check_stays_under_50_microseconds():
+    engine = _engine(max_open_positions=5, max_exposure=1e6, available_margin=1e6)
+    for sid in range(4):
+        engine.on_fill(sid, 'BUY', 25, 100.0)
+
+    samples = []
+    for i in range(20000):
+        started = time.perf_counter_ns()
+        engine.check(1000 + i % 7, 'BUY', 25, 100.0, stop_loss=80.0)
+        samples.append(time.perf_counter_ns() - started)
+    samples.sort()
+    median_us = samples[len(samples) // 2] / 1000
+    p99_us = samples[int(len(samples) * 0.99)] / 1000
+    mean_us = sum(samples) / len(samples) / 1000
+    print(f"risk check: median {median_us:.2f} us, p99 {p99_us:.2f} us, mean {mean_us:.2f} us")
+    assert median_us < 50 and mean_us < 50
@@ -0,0 +1,158 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "index_options_bot"))
+
+from execution.order_pipeline import OrderPipeline
+from positions.position_manager import PositionManager
+from risk.risk_manager import RiskManager
+from runtime import StrategySlot, TradingRuntime
+
+
+class Market:
+    def __init__(self, session_seconds):
+        self.closes_at = time.time() + session_seconds
+
+    def seconds_until_open(self):
+        return 0.0
+
+    def seconds_until_close(self):
+        return max(self.closes_at - time.time(), 0.0)
+
+
+class Feed:
+    """Index fixed; the option at `option_price`, which tests move"""
+
+    def __init__(self, option_price):
+        self.option_price = option_price
+        self.polls = 0
+
+    def get_ltp_batch(self, instruments):
+        self.polls += 1
+        return {
+            (segment, security_id): 23010.0 if segment == 'IDX_I' else self.option_price
+            for segment, security_id in instruments
+        }
+
+
+class Instruments:
+    def get_nearest_expiry(self, underlying=None):
+        return '2026-01-01'
+
+    def get_atm_strike(self, index_ltp, underlying=None):
+        return round(index_ltp / 50) * 50
+
+    def get_option_security_id(self, expiry, strike, option_type='CE', underlying=None):
+        return 100000 + strike
+
+
+class Broker:
+    """Buys fill on the next poll; sells follow `sell_fills`, one (status, filled) per order"""
+
+    def __init__(self, sell_fills=()):
+        self.sell_fills = list(sell_fills)
+        self.orders = {}
+        self.release = False
+
+    def place_order(self, security_id, symbol, price, quantity, order_type='BUY'):
+        order_id = str(len(self.orders) + 1)
+        if order_type == 'BUY':
+            fill = ('TRADED', quantity)
+        else:
+            fill = self.sell_fills.pop(0) if self.sell_fills else ('TRADED', quantity)
+        self.orders[order_id] = (fill, price)
+        return {'status': 'success', 'data': {'orderId': order_id, 'orderStatus': 'TRANSIT'}}
+
+    def get_order_book(self):
+        book = []
+        for order_id, ((status, filled), price) in self.orders.items():
+            if status == 'HOLD' and not self.release:
+                book.append({'orderId': order_id, 'orderStatus': 'PENDING', 'filledQty': 0})
+                continue
+            status = 'TRADED' if status == 'HOLD' else status
+            book.append({'orderId': order_id, 'orderStatus': status, 'filledQty': filled,
+                         'averageTradedPrice': price})
+        return book
+
+
+def _runtime(feed, broker, session_seconds=5):
+    from strategy.supertrend import SuperTrendStrategy
+
+    risk_manager = RiskManager(max_trades_per_day=5, max_loss_per_day=100000, cooldown_minutes=0)
+    slot = StrategySlot('NIFTY', SuperTrendStrategy(period=7, multiplier=4))
+    runtime = TradingRuntime(
+        price_source=feed, instruments=Instruments(), executor=broker, slots=[slot],
+        risk_manager=risk_manager, position_manager=PositionManager(trail_percent=10),
+        quantity=50, stop_loss_percent=10, poll_interval=0.01, market_time=Market(session_seconds),
+        ladder_strikes=0, orders=OrderPipeline(broker, poll_interval=0.01)
+    )
+    return runtime, slot
+
+
+async def _until(condition, timeout=2):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def test_stop_loss_exit_does_not_block_ticks():
+    feed, broker = Feed(100.0), Broker(sell_fills=[('HOLD', 50)])
+    runtime, slot = _runtime(feed, broker)
+
+    async def session():
+        task = asyncio.create_task(runtime.run())
+        await _until(lambda: runtime.index_ltp('NIFTY') is not None)
+        position = await runtime.enter_position(slot, 'CE')
+        feed.option_price = 85.0  # below the 90 stop
+        await _until(lambda: runtime._exits)
+
+        # The exit is waiting on the broker; the price loop keeps polling
+        polls = feed.polls
+        await asyncio.sleep(0.1)
+        assert feed.polls > polls + 3
+        assert position.is_open or id(position) in runtime._exits
+
+        broker.release = True
+        await _until(lambda: not position.is_open)
+        runtime.stop()
+        await task
+        return position
+
+    position = asyncio.run(session())
+    assert position.exit_reason == 'TRAILING_SL'
+    assert position.pnl == -750
+
+
+def test_partial_exit_keeps_the_rest_open_and_protected():
+    # First exit order fills 20 of 50 then is cancelled; the retry fills the rest
+    feed, broker = Feed(100.0), Broker(sell_fills=[('CANCELLED', 20), ('HOLD', 30)])
+    runtime, slot = _runtime(feed, broker)
+
+    async def session():
+        task = asyncio.create_task(runtime.run())
+        await _until(lambda: runtime.index_ltp('NIFTY') is not None)
+        position = await runtime.enter_position(slot, 'CE')
+        feed.option_price = 85.0
+        await _until(lambda: position.exited_qty == 20)
+
+        # Only the filled part is booked; the rest is still tracked and subscribed
+        assert position.is_open and position.qty == 30
+        assert position.realized_pnl == -300
+        assert runtime.position_manager.open_positions() == [position]
+        assert id(position) in runtime._position_subs
+        assert runtime.risk_manager.realized_pnl == 0
+        assert runtime.portfolio.holdings[position.security_id].qty == 30
+
+        broker.release = True
+        await _until(lambda: not position.is_open)
+        runtime.stop()
+        await task
+        return position
+
+    position = asyncio.run(session())
+    assert position.exited_qty == 50 and position.exit_price == 85.0
+    assert runtime.risk_manager.realized_pnl == -750
+    assert not runtime.position_manager.open_positions()
@@ -0,0 +1,149 @@
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+BOT_DIR = ROOT / "index_options_bot"
+sys.path.insert(0, str(BOT_DIR))
+
+import pytest
+
+from runtime.shared_feed import SharedQuoteTable, FeedPublisher, SharedFeedClient
+
+
+class FakeBroker:
+    def __init__(self):
+        self.calls = []
+        self.price = 23000.0
+
+    def get_ltp_batch(self, instruments):
+        self.calls.append(sorted(instruments))
+        return {key: self.price for key in instruments}
+
+
+def _table(tmp_path, capacity=8):
+    name = f"test_feed_{uuid.uuid4().hex[:8]}"
+    return SharedQuoteTable.create(name, capacity, tmp_path / "feed.lock")
+
+
+def test_readers_share_one_broker_poll(tmp_path):
+    owner = _table(tmp_path)
+    try:
+        broker = FakeBroker()
+        publisher = FeedPublisher(broker, owner)
+        readers = [
+            SharedFeedClient(SharedQuoteTable.attach(owner.shm.name, tmp_path / "feed.lock"), first_quote_timeout=0)
+            for _ in range(3)
+        ]
+
+        # Every process asks for the index; nothing is quoted until the owner polls
+        for reader in readers:
+            assert reader.get_ltp_batch([("IDX_I", 13)]) == {}
+        readers[0].get_ltp_batch([("NSE_FNO", 100123)])
+
+        publisher.publish_once()
+        assert broker.calls == [[("IDX_I", 13), ("NSE_FNO", 100123)]]
+        for reader in readers:
+            assert reader.get_ltp_batch([("IDX_I", 13)]) == {("IDX_I", 13): 23000.0}
+
+        for reader in readers:
+            reader.table.close()
+    finally:
+        owner.close()
+
+
+def test_expired_lease_stops_polling_and_frees_slot(tmp_path):
+    owner = _table(tmp_path, capacity=1)
+    try:
+        broker = FakeBroker()
+        publisher = FeedPublisher(broker, owner, lease_seconds=30)
+        reader = SharedFeedClient(owner, first_quote_timeout=0, lease_seconds=30)
+        reader.get_ltp_batch([("NSE_FNO", 1)])
+
+        owner.renew(0, 0.0)  # reader went away long ago
+        publisher.publish_once()
+        assert broker.calls == []
+
+        # The only slot is reusable by another instrument
+        reader.get_ltp_batch([("NSE_FNO", 2)])
+        assert owner.key(0) == ("NSE_FNO", 2)
+    finally:
+        owner.close()
+
+
+def test_reader_retries_while_slot_is_being_written(tmp_path):
+    owner = _table(tmp_path)
+    try:
+        with owner.locked():
+            owner.assign(0, ("IDX_I", 13), 0.0)
+            owner.write(0, 100.0, 1.0)
+        assert owner.read(0)[4] == 100.0
+
+        # Simulate a writer stopped halfway: odd sequence, reads give up
+        offset = owner._offset(0)
+        seq = int.from_bytes(owner.buf[offset:offset + 8], "little")
+        owner.buf[offset:offset + 8] = (seq + 1).to_bytes(8, "little")
+        assert owner.read(0, spins=10) is None
+    finally:
+        owner.close()
+
+
+def test_quotes_visible_from_another_process(tmp_path):
+    owner = _table(tmp_path)
+    try:
+        publisher = FeedPublisher(FakeBroker(), owner)
+        with owner.locked():
+            owner.assign(0, ("IDX_I", 13), 2e9)
+        publisher.publish_once()
+
+        script = textwrap.dedent(f"""
+            import sys
+            sys.path.insert(0, {str(BOT_DIR)!r})
+            from runtime.shared_feed import SharedQuoteTable, SharedFeedClient
+            table = SharedQuoteTable.attach({owner.shm.name!r}, {str(tmp_path / "feed.lock")!r})
+            print(SharedFeedClient(table).get_ltp(13, "IDX_I"))
+            table.close()
+        """)
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=30)
+        assert result.stdout.strip() == "23000.0", result.stderr
+    finally:
+        owner.close()
+
+
+def test_attach_waits_for_the_feed_to_start(tmp_path):
+    name = f"test_feed_{uuid.uuid4().hex[:8]}"
+    started = []
+
+    def start_feed():
+        time.sleep(0.3)  # feed.py authenticating
+        owner = SharedQuoteTable.create(name, 8, tmp_path / "feed.lock")
+        started.append(owner)
+        time.sleep(0.3)
+        FeedPublisher(FakeBroker(), owner).publish_once()
+
+    feed = threading.Thread(target=start_feed)
+    feed.start()
+    try:
+        table = SharedQuoteTable.attach(name, tmp_path / "feed.lock", timeout=5, max_age=5, poll=0.05)
+        assert table.heartbeat()[1] == 1  # attached only once the owner had polled
+        table.close()
+    finally:
+        feed.join()
+        for owner in started:
+            owner.close()
+
+
+def test_attach_gives_up_on_a_dead_feed(tmp_path):
+    owner = _table(tmp_path)
+    try:
+        owner.set_heartbeat(time.time() - 60, 10)  # owner stopped polling a minute ago
+        with pytest.raises(TimeoutError, match="heartbeat"):
+            SharedQuoteTable.attach(owner.shm.name, tmp_path / "feed.lock", timeout=0.2, max_age=5, poll=0.05)
+        with pytest.raises(TimeoutError, match="not created"):
+            SharedQuoteTable.attach(f"test_feed_{uuid.uuid4().hex[:8]}", tmp_path / "feed.lock", timeout=0)
+    finally:
+        owner.close()
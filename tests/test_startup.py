@@ -0,0 +1,23 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "index_options_bot"))
+
+from startup_profile import measure_startup
+
+# `import main` took ~470 ms when it pulled in pandas, dhanhq and pytz
+# up front; it is ~60 ms without them. The budget leaves room for slow
+# machines while still catching an eager heavy import creeping back.
+STARTUP_BUDGET_MS = 300
+
+
+def test_cold_start_within_budget():
+    report = measure_startup()
+    assert report['import_ms'] + report['market_check_ms'] < STARTUP_BUDGET_MS
+
+
+def test_heavy_dependencies_are_deferred():
+    report = measure_startup()
+    loaded = set(report['modules'])
+    assert not loaded & {'pandas', 'numpy', 'dhanhq', 'pytz'}
+    assert any(entry['module'] == 'main' for entry in report['imports'])
@@ -0,0 +1,88 @@
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "index_options_bot"))
+
+from runtime import HistoryWarmup, StrategySlot
+from runtime.candles import Bar
+from strategy import SuperTrendStrategy
+from utils.candle_store import CandleStore
+
+OPEN = 1767239100  # 2026-01-01 09:15 IST
+
+
+def _bars(count, start=OPEN, seed=3):
+    rng = random.Random(seed)
+    price = 23000.0
+    bars = []
+    for i in range(count):
+        open_price = price
+        price += rng.uniform(-15, 15)
+        bars.append(Bar(start + i * 60, open_price, max(open_price, price) + 2, min(open_price, price) - 2, price, 0))
+    return bars
+
+
+class FakeBroker:
+    def __init__(self, bars):
+        self.bars = bars
+        self.requests = []
+
+    def get_intraday_data(self, security_id, exchange_segment, instrument_type, from_date, to_date, interval=1):
+        self.requests.append((from_date, to_date))
+        return list(self.bars)
+
+
+def test_store_merges_and_tails_across_days(tmp_path):
+    store = CandleStore(tmp_path)
+    today = _bars(30)
+    yesterday = _bars(30, start=OPEN - 86400)
+    store.write("IDX_I", 13, 1, today[:20])
+    store.write("IDX_I", 13, 1, today[10:] + yesterday)
+
+    assert store.days("IDX_I", 13, 1) == ["2025-12-31", "2026-01-01"]
+    assert store.read_day("IDX_I", 13, 1, "2026-01-01") == today
+    assert store.tail("IDX_I", 13, 1, 40) == yesterday[-10:] + today
+    assert store.tail("IDX_I", 13, 1, 5, until=today[9].start) == today[5:10]
+
+
+def test_only_the_gap_is_fetched(tmp_path):
+    store = CandleStore(tmp_path)
+    history = _bars(60)
+    store.write("IDX_I", 13, 1, history[:45])
+    broker = FakeBroker(history)
+    warmup = HistoryWarmup(store, broker, timeframe_minutes=1, bars=50)
+
+    now = history[-1].start + 90  # mid-way through the candle after the last one
+    bars = warmup.load("IDX_I", 13, now=now)
+    assert bars == history[-50:]
+    assert broker.requests == [("2026-01-01 10:00:00", "2026-01-01 10:15:00")]
+    assert store.tail("IDX_I", 13, 1, 100) == history
+
+    # Fully cached: no broker call at all
+    warmup.load("IDX_I", 13, now=now)
+    assert len(broker.requests) == 1
+
+
+def test_strategy_is_signal_ready_after_warm_up(tmp_path):
+    store = CandleStore(tmp_path)
+    history = _bars(80)
+    store.write("IDX_I", 13, 1, history)
+    warmup = HistoryWarmup(store, broker=None, timeframe_minutes=1, bars=100)
+
+    slot = StrategySlot("NIFTY", SuperTrendStrategy(period=7, multiplier=1))
+    asyncio.run(warmup.warm_up([slot], now=history[-1].start + 61))
+
+    strategy = slot.strategy
+    assert len(strategy.price_data) == 80
+    assert strategy.current_trend in (1, -1)
+
+    # The first live candle against the trend is already a signal
+    last = history[-1]
+    move = -500 if strategy.current_trend == 1 else 500
+    strategy.add_price_data(Bar(last.start + 60, *last[1:]).timestamp, last.close, last.close + max(move, 0) + 1,
+                            last.close + min(move, 0) - 1, last.close + move)
+    signal = strategy.generate_signal()
+    assert signal is not None
+    assert signal["type"] == ("SELL" if move < 0 else "BUY")